@@ -0,0 +1,87 @@
+"""Measures how much memory the derived properties of the value types allocate,
+and the peak memory of the engine scenario, with `tracemalloc`.
+
+Every property is read for many random `Voicing`s, keeping all results alive,
+so that the memory that's left is what got allocated for them. Interned and memoized
+results don't add anything on a second pass over the same `Voicing`s.
+
+Run from the repository root with `python -m benchmarks.allocations`.
+"""
+
+import random
+import tracemalloc
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from benchmarks.engine import time_engine
+from src.voicing import Voicing
+
+
+def get_voicings(nr_of_voicings: int = 1000, seed: int = 0) -> list[Voicing]:
+    rng = random.Random(seed)
+    return [
+        Voicing.from_64bit_bitmask(sum(1 << rng.randrange(24, 48) for _ in range(4)))
+        for _ in range(nr_of_voicings)
+    ]
+
+
+def measure(
+    voicings: list[Voicing], derive: Callable[[Voicing], Any], nr_of_passes: int = 10
+) -> tuple[float, float]:
+    """Derives a property of every `Voicing` `nr_of_passes` times, first to time it,
+    then again under `tracemalloc`, keeping the results.
+
+    Returns
+    -------
+    tuple[float, float]
+        The number of bytes allocated per call, and the time per call in microseconds.
+    """
+    nr_of_calls = len(voicings) * nr_of_passes
+    start = perf_counter()
+    for _ in range(nr_of_passes):
+        for voicing in voicings:
+            derive(voicing)
+    duration = perf_counter() - start
+
+    results: list[Any] = [None] * nr_of_calls
+    tracemalloc.start()
+    i = 0
+    for _ in range(nr_of_passes):
+        for voicing in voicings:
+            results[i] = derive(voicing)
+            i += 1
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / nr_of_calls, duration / nr_of_calls * 1e6
+
+
+PROPERTIES: dict[str, Callable[[Voicing], Any]] = {
+    "Voicing.shape": lambda voicing: voicing.shape,
+    "Voicing.pc_count": lambda voicing: voicing.pc_count,
+    "Combination.pcs": lambda voicing: voicing.combination.pcs,
+    "Pattern.inner_intervals": lambda voicing: voicing.pattern.inner_intervals,
+    "Shape.intervals_from_root": lambda voicing: voicing.shape.intervals_from_root,
+    "Shape.cum_pattern": lambda voicing: voicing.shape.cum_pattern,
+    "CumPattern.intervals_from_root": lambda voicing: (
+        voicing.shape.cum_pattern.intervals_from_root
+    ),
+}
+
+
+def main() -> None:
+    voicings = get_voicings()
+    for name, derive in PROPERTIES.items():
+        allocated, microseconds = measure(voicings, derive)
+        print(f"{name}: {allocated:.1f} bytes, {microseconds:.3f} us per call")
+
+    time_engine()  # Warm up the caches.
+    tracemalloc.start()
+    time_engine()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"engine scenario: {peak / 1024:.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Times the engine scenario from the PERFORMANCE section of `sandbox.ipynb`,
+and some of the core value type operations it relies on.
+
+Run from the repository root with `python -m benchmarks.engine`.
+"""
+
+import random
+from time import perf_counter
+from timeit import timeit
+
+from src.combination import Combination
+from src.cum_pattern import MAJOR
+from src.distribution import Distribution
+from src.metrics.diatonic_local import DiatonicLocal
+from src.metrics.individual_steps import IndividualSteps
+from src.metrics.legal_patterns import LegalPatterns
+from src.metrics.legal_range import LegalRange
+from src.metrics.metric import Metric
+from src.metrics.no_combination_reps import NoCombinationReps
+from src.metrics.no_dup_notes import NoDupNotes
+from src.metrics.within_octave import WithinOctave
+from src.note import A3, C2, C3, C5, E3, F3, G3
+from src.pattern import MARY, MINNY
+from src.pitch_class import C, D
+from src.stochastic_distribution_engine import StochasticDistributionEngine
+from src.voicing import Voicing
+
+
+def time_engine(nr_of_runs: int = 10, nr_of_steps: int = 20, seed: int = 0) -> float:
+    """Generates `nr_of_runs` progressions of `nr_of_steps` `Distribution`s.
+
+    Returns
+    -------
+    float
+        The time it took, in seconds.
+    """
+    random.seed(seed)
+    gen_metric = IndividualSteps(0, 2, 1)
+    other_metrics: list[Metric] = [
+        LegalPatterns({MARY, MINNY}),
+        DiatonicLocal(3, 5),
+        WithinOctave(),
+        NoDupNotes(),
+        NoCombinationReps(3, 5),
+        LegalRange(C2, C5),
+    ]
+    start = Distribution([C3, F3, A3])
+    engine = StochasticDistributionEngine(gen_metric, other_metrics, start)
+
+    start_time = perf_counter()
+    for _ in range(nr_of_runs):
+        engine.reset(start)
+        for _ in range(nr_of_steps):
+            engine.get_next()
+    return perf_counter() - start_time
+
+
+def time_core_operations(number: int = 100_000) -> dict[str, float]:
+    """Times a few core value type operations.
+
+    Returns
+    -------
+    dict[str, float]
+        Per operation, the time per call in microseconds.
+    """
+    c_major = Combination.from_cum(C, MAJOR)
+    d_major = Combination.from_cum(D, MAJOR)
+    operations = {
+        "Note + int": lambda: C3 + 7,
+        "Note - Note": lambda: G3 - C3,
+        "Note.pc": lambda: E3.pc,
+        "Combination + Combination": lambda: c_major + d_major,
+        "hash(Combination)": lambda: hash(c_major),
+        "Voicing(notes)": lambda: Voicing([C3, E3, G3]),
+        "Distribution.combination": lambda: Distribution([C3, E3, G3]).combination,
+    }
+    return {
+        name: timeit(operation, number=number) / number * 1e6
+        for name, operation in operations.items()
+    }
+
+
+def main() -> None:
+    engine_times = [time_engine() for _ in range(5)]
+    print(f"engine scenario: {min(engine_times):.3f} seconds (best of 5)")
+    Distribution.enable_interning()
+    engine_times = [time_engine() for _ in range(5)]
+    Distribution.disable_interning()
+    print(
+        f"engine scenario, interning Distributions: {min(engine_times):.3f} seconds (best of 5)"
+    )
+    for name, microseconds in time_core_operations().items():
+        print(f"{name}: {microseconds:.3f} us per call")
+
+
+if __name__ == "__main__":
+    main()
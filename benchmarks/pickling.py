@@ -0,0 +1,59 @@
+"""Times pickling round trips of many `Distribution`s, as done when sending
+generated progressions between the processes of a `ProcessPoolExecutor`.
+
+Run from the repository root with `python -m benchmarks.pickling`.
+"""
+
+import pickle
+import random
+from time import perf_counter
+
+from src.distribution import Distribution
+from src.note import Note
+
+
+def get_distributions(
+    nr_of_distributions: int = 100_000, nr_of_voices: int = 4, seed: int = 0
+) -> list[Distribution]:
+    rng = random.Random(seed)
+    return [
+        Distribution([Note(rng.randrange(64)) for _ in range(nr_of_voices)])
+        for _ in range(nr_of_distributions)
+    ]
+
+
+def time_round_trip(distributions: list[Distribution]) -> tuple[float, float, int]:
+    """Pickles and unpickles `distributions` as a single list.
+
+    Returns
+    -------
+    tuple[float, float, int]
+        The time it took to pickle, the time it took to unpickle, both in seconds,
+        and the size of the pickle in bytes.
+    """
+    start_time = perf_counter()
+    pickled = pickle.dumps(distributions, protocol=pickle.HIGHEST_PROTOCOL)
+    dumps_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    unpickled = pickle.loads(pickled)
+    loads_time = perf_counter() - start_time
+
+    assert unpickled == distributions
+    return dumps_time, loads_time, len(pickled)
+
+
+def main() -> None:
+    distributions = get_distributions()
+    dumps_time, loads_time, size = min(
+        (time_round_trip(distributions) for _ in range(5)),
+        key=lambda times: times[0] + times[1],
+    )
+    print(f"{len(distributions)} distributions (best of 5)")
+    print(f"pickle: {dumps_time:.3f} seconds")
+    print(f"unpickle: {loads_time:.3f} seconds")
+    print(f"size: {size / len(distributions):.1f} bytes per distribution")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Measures the overhead of the `SamplingProfiler` on the engine scenario,
+and prints what it found.
+
+Run from the repository root with `python -m benchmarks.sampling`.
+"""
+
+from benchmarks.engine import time_engine
+from src.profiler import SamplingProfiler
+
+
+def time_engine_sampled(interval: float) -> tuple[float, SamplingProfiler]:
+    with SamplingProfiler(interval, lower_switch_interval=True) as profiler:
+        duration = time_engine()
+    return duration, profiler
+
+
+def main(nr_of_repeats: int = 10) -> None:
+    time_engine()  # Warm up the caches.
+    for interval in (0.01, 0.005):
+        # Interleaved, so that both suffer equally from noise on the machine.
+        plain_times: list[float] = []
+        sampled_results: list[tuple[float, SamplingProfiler]] = []
+        for _ in range(nr_of_repeats):
+            plain_times.append(time_engine())
+            sampled_results.append(time_engine_sampled(interval))
+        sampled_time, profiler = min(sampled_results, key=lambda result: result[0])
+        overhead = sampled_time / min(plain_times) - 1
+        print(
+            f"sampled every {interval * 1000:.0f} ms: {sampled_time:.3f} seconds, "
+            f"{min(plain_times):.3f} seconds unsampled (best of {nr_of_repeats}), "
+            f"overhead {overhead:.1%}, {profiler.nr_of_samples} samples"
+        )
+    profiler.report()
+
+
+if __name__ == "__main__":
+    main()
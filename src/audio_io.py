@@ -1,6 +1,5 @@
 import numpy as np
 from typing import cast
-import sounddevice as sd  # type: ignore
 
 from src.constants import SAMPLE_RATE
 from src.my_types import floatlist
@@ -31,6 +30,8 @@ def record(
     floatlist
         Audio, as a wave.
     """
+    import sounddevice as sd  # type: ignore
+
     recording = sd.rec(  # type: ignore
         (nr_of_seconds * sample_rate),
         samplerate=sample_rate,
@@ -1,7 +1,6 @@
+from functools import lru_cache
 from typing import cast
-import librosa
 import numpy as np
-from scipy.signal import find_peaks  # type: ignore
 
 from src.constants import SAMPLE_RATE
 from src.my_types import *
@@ -33,6 +32,8 @@ def extract_note_sequence(
     list[Note]
         A list of the detected notes, in order of occurence.
     """
+    import librosa
+
     if ranges_per_note is not None:
         assert len(ranges_per_note) == nr_of_notes
     else:
@@ -46,10 +47,12 @@ def extract_note_sequence(
     stft_abs: floatlist = np.abs(librosa.stft(recording, n_fft=n_fft, hop_length=512))  # type: ignore
 
     # Disregard frequencies outside of all notes ranges.
-    min_min = min([min(range) for range in ranges_per_note])
-    max_max = max([max(range) for range in ranges_per_note])
-    min_min_index = round(min_min.freq / freqs[1]) - 4
-    max_max_index = round(max_max.freq / freqs[1]) + 4
+    range_values = np.array(
+        [[note.value for note in range] for range in ranges_per_note]
+    )
+    lower_bins, upper_bins = get_note_bin_bounds(n_fft)
+    min_min_index = lower_bins[range_values.min()]
+    max_max_index = upper_bins[range_values.max()]
     stft_abs[:min_min_index] = 0
     stft_abs[max_max_index:] = 0
     stft_masked: floatlist = stft_abs * mask  # type: ignore
@@ -58,11 +61,40 @@ def extract_note_sequence(
     refined_freqs = find_refined_freqs(
         stft_abs, stft_masked, amp_peak_indices, freqs, ranges_per_note
     )
-    notes = [Note.from_freq(f) for f in refined_freqs]
+    note_values, _ = freqs_to_note_values(np.array(refined_freqs))
+    notes = [Note(value) for value in note_values.tolist()]
 
     return notes
 
 
+@lru_cache
+def get_note_bin_bounds(
+    n_fft: int, sample_rate: int = SAMPLE_RATE, margin: int = 4
+) -> tuple[intlist, intlist]:
+    """Finds the range of FFT bins to consider for every `Note`.
+
+    Parameters
+    ----------
+    n_fft : int
+        The FFT window size.
+    sample_rate : int, optional
+        The sample rate, by default `SAMPLE_RATE`.
+    margin : int, optional
+        The number of bins to include on either side of the bin of a `Note`, by default 4.
+
+    Returns
+    -------
+    tuple[intlist, intlist]
+        Per `Note` value, the first bin to include, and the first bin after that to exclude.
+    """
+    bins = np.rint(note_values_to_freqs(np.arange(64)) * n_fft / sample_rate)
+    lower_bins = bins.astype(np.int64) - margin
+    upper_bins = bins.astype(np.int64) + margin
+    lower_bins.flags.writeable = False
+    upper_bins.flags.writeable = False
+    return lower_bins, upper_bins
+
+
 def find_amp_peak_indices(
     stft_abs: floatlist, nr_of_notes: int, distance: int = 6
 ) -> list[int]:
@@ -82,6 +114,8 @@ def find_amp_peak_indices(
     list[int]
         Window indices in the spectrogram for each peak.
     """
+    from scipy.signal import find_peaks  # type: ignore
+
     envelope: floatlist = np.sum(stft_abs, axis=0)
     diff_envelope: floatlist = np.concat(([0], np.diff(envelope)))
     diff_peaks, _ = find_peaks(diff_envelope, distance=distance)  # type: ignore
@@ -139,6 +173,9 @@ def find_refined_freqs(
     list[float]
         A list of true frequencies per detected note.
     """
+    n_fft = 2 * (len(freqs) - 1)
+    lower_bins, upper_bins = get_note_bin_bounds(n_fft, round(freqs[1] * n_fft))
+
     freq_peak_indices: list[int] = []
     for i_amp, (min_note, max_note) in zip(amp_peak_indices, ranges_per_note):
         # From experimentation, it turns out that 4 windows after the peak in amplitude,
@@ -150,8 +187,8 @@ def find_refined_freqs(
             relevant_bit -= stft_masked[:, i_amp - 4]
 
         # Disregard the irrelevant frequencies.
-        min_note_index = round(min_note.freq / freqs[1]) - 4
-        max_note_index = round(max_note.freq / freqs[1]) + 4
+        min_note_index = lower_bins[min_note.value]
+        max_note_index = upper_bins[max_note.value]
         relevant_bit[:min_note_index] = 0
         relevant_bit[max_note_index:] = 0
         freq_peak_indices.append(round(np.argmax(relevant_bit)))
@@ -0,0 +1,289 @@
+import gc
+import sys
+from collections.abc import Callable
+from functools import lru_cache
+from types import FunctionType, ModuleType
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+class CacheInfo(NamedTuple):
+    """The state of a single cache, as reported by `report_caches`.
+
+    Attributes
+    ----------
+    name : str
+        The qualified name of the cache, like "src.util.get_root_match_table".
+    kind : str
+        "interned" for the prebuilt `_instances` tables of the core value types,
+        "lru_cache" for functions wrapped in `functools.lru_cache`,
+        and "per-object" for the cached attributes listed in `_cache_slots` of a class.
+    size : int
+        The number of entries (or filled attributes, for per-object caches).
+    maxsize : int | None
+        The maximum number of entries, None if unbounded.
+    hits : int | None
+        The number of lookups that were answered by the cache, None if not counted.
+    misses : int | None
+        The number of lookups that had to be computed, None if not counted.
+    evictions : int | None
+        The number of entries that were dropped to stay within `maxsize`, None if not counted.
+    nbytes : int
+        The approximate memory footprint of the entries, in bytes. Objects shared with
+        other caches are counted in each of them.
+    """
+
+    name: str
+    kind: str
+    size: int
+    maxsize: int | None
+    hits: int | None
+    misses: int | None
+    evictions: int | None
+    nbytes: int
+
+
+def _get_src_modules() -> list[ModuleType]:
+    return [
+        module
+        for name, module in list(sys.modules.items())
+        if (name == "src" or name.startswith("src.")) and module is not None
+    ]
+
+
+def _find_lru_caches() -> dict[str, Callable[..., Any]]:
+    lru_caches: dict[str, Callable[..., Any]] = {}
+    for module in _get_src_modules():
+        for value in vars(module).values():
+            if hasattr(value, "cache_info") and hasattr(value, "__wrapped__"):
+                name = f"{value.__module__}.{value.__qualname__}"
+                lru_caches.setdefault(name, value)
+    return lru_caches
+
+
+def _find_classes(attribute: str) -> dict[str, type]:
+    classes: dict[str, type] = {}
+    for module in _get_src_modules():
+        for value in vars(module).values():
+            if isinstance(value, type) and attribute in vars(value):
+                classes.setdefault(f"{value.__module__}.{value.__qualname__}", value)
+    return classes
+
+
+def get_approximate_size(obj: Any, seen: set[int] | None = None) -> int:
+    """Estimates the memory footprint of an object, including the objects it contains.
+
+    Descends into containers, numpy arrays and instances of classes, but not into
+    classes, modules and functions. Objects reachable in several ways are counted once.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to measure.
+    seen : set[int] | None, optional
+        The ids of the objects that were already counted, to share between calls.
+
+    Returns
+    -------
+    int
+        The approximate number of bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, ModuleType, FunctionType)):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, np.ndarray):
+            if current.base is not None:
+                stack.append(current.base)
+        elif isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif not isinstance(current, (int, float, str, bytes, bytearray)):
+            # Instances of classes, with or without slots, and lru_cache links.
+            stack.extend(gc.get_referents(current))
+    return size
+
+
+def _get_lru_cache_contents(function: Callable[..., Any]) -> list[Any]:
+    # The cache dict, and for an `lru_cache` with a `maxsize` also the keys and values
+    # in its linked list, as the dict refers to those through links without referents.
+    attributes = vars(function)
+    return [
+        referent
+        for referent in gc.get_referents(function)
+        if referent is not attributes
+    ]
+
+
+def _get_per_object_instances(classes: list[type]) -> dict[type, list[Any]]:
+    instances: dict[type, list[Any]] = {cls: [] for cls in classes}
+    for obj in gc.get_objects():
+        if type(obj) in instances:
+            instances[type(obj)].append(obj)
+    return instances
+
+
+def get_cache_report() -> list[CacheInfo]:
+    """Collects the state of all caches in the imported `src` modules.
+
+    Per-object caches are found by scanning all objects tracked by the garbage collector,
+    so this takes a while when there are many objects around.
+
+    Returns
+    -------
+    list[CacheInfo]
+        A `CacheInfo` per interned table, per `lru_cache`, and per cached attribute.
+    """
+    report: list[CacheInfo] = []
+
+    for name, cls in _find_classes("_instances").items():
+        instances = cls._instances  # type: ignore[attr-defined]
+        if instances is None:  # Optional interning that's turned off.
+            continue
+        values = instances.values() if isinstance(instances, dict) else instances
+        size = len(set(map(id, values)))
+        report.append(
+            CacheInfo(
+                f"{name}._instances",
+                "interned",
+                size,
+                size,
+                None,
+                None,
+                0,
+                get_approximate_size(instances),
+            )
+        )
+
+    for name, function in _find_lru_caches().items():
+        info = function.cache_info()  # type: ignore[attr-defined]
+        contents = _get_lru_cache_contents(function)
+        report.append(
+            CacheInfo(
+                name,
+                "lru_cache",
+                info.currsize,
+                info.maxsize,
+                info.hits,
+                info.misses,
+                # Every miss adds an entry, so the ones that aren't there were evicted.
+                info.misses - info.currsize,
+                get_approximate_size(contents) - sys.getsizeof(contents),
+            )
+        )
+
+    per_object_classes = _find_classes("_cache_slots")
+    instances_per_class = _get_per_object_instances(list(per_object_classes.values()))
+    for name, cls in per_object_classes.items():
+        instances = instances_per_class[cls]
+        for slot in cls._cache_slots:  # type: ignore[attr-defined]
+            values = [
+                value
+                for instance in instances
+                if (value := getattr(instance, slot, None)) is not None
+            ]
+            report.append(
+                CacheInfo(
+                    f"{name}.{slot}",
+                    "per-object",
+                    len(values),
+                    len(instances),
+                    None,
+                    None,
+                    None,
+                    get_approximate_size(values) - sys.getsizeof(values),
+                )
+            )
+
+    return report
+
+
+def report_caches() -> None:
+    """Prints the state of all caches, like `report_timings` does for timings.
+
+    Outputs
+    -------
+    - Per kind of cache, per cache: its size, hits, misses, evictions
+    and approximate memory footprint
+    - The total approximate memory footprint
+    """
+    report = get_cache_report()
+    print("\nCache Report:")
+    for kind in ("interned", "lru_cache", "per-object"):
+        print(f"{kind}:")
+        for info in sorted(report, key=lambda x: -x.nbytes):
+            if info.kind != kind:
+                continue
+            line = f"    {info.name}: {info.size} entries (max {info.maxsize})"
+            if info.hits is not None:
+                line += f", {info.hits} hits, {info.misses} misses"
+            if info.evictions is not None:
+                line += f", {info.evictions} evictions"
+            print(f"{line}, ~{info.nbytes / 1024:.1f} KiB")
+    total = sum(info.nbytes for info in report)
+    print(f"Total: ~{total / 1024 / 1024:.2f} MiB")
+
+
+def clear_caches(names: list[str] | None = None) -> None:
+    """Empties `lru_cache`s and per-object caches, which then refill on demand.
+
+    The interned tables can't be cleared, as all instances are expected to be in them.
+
+    Parameters
+    ----------
+    names : list[str] | None, optional
+        The names of the caches to clear, as in `CacheInfo.name`, by default all of them.
+    """
+    for name, function in _find_lru_caches().items():
+        if names is None or name in names:
+            function.cache_clear()  # type: ignore[attr-defined]
+
+    per_object_classes = _find_classes("_cache_slots")
+    slots_per_class = {
+        cls: [
+            slot
+            for slot in cls._cache_slots  # type: ignore[attr-defined]
+            if names is None or f"{name}.{slot}" in names
+        ]
+        for name, cls in per_object_classes.items()
+    }
+    instances_per_class = _get_per_object_instances(list(slots_per_class))
+    for cls, slots in slots_per_class.items():
+        for instance in instances_per_class[cls] if slots else ():
+            for slot in slots:
+                setattr(instance, slot, None)
+
+
+def cap_cache(name: str, maxsize: int | None) -> None:
+    """Replaces an `lru_cache` by an empty one with a different `maxsize`.
+
+    The new cache takes the place of the old one in every imported `src` module,
+    so also where the function was imported with `from ... import ...`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the cache, as in `CacheInfo.name`.
+    maxsize : int | None
+        The new maximum number of entries, None for unbounded.
+
+    Raises
+    ------
+    KeyError
+        If there's no `lru_cache` with that name.
+    """
+    old = _find_lru_caches()[name]
+    new = lru_cache(maxsize=maxsize)(old.__wrapped__)  # type: ignore[attr-defined]
+    for module in _get_src_modules():
+        for attribute, value in list(vars(module).items()):
+            if value is old:
+                setattr(module, attribute, new)
@@ -0,0 +1,157 @@
+from functools import cache
+from typing import NamedTuple
+
+import numpy as np
+
+from src.combination import Combination
+from src.cum_pattern import CUM_PATTERN_NAMES, CumPattern
+from src.my_types import int64list
+from src.pitch_class import PitchClass
+from src.util import (
+    get_lowest_set_bits_64bit_bitmasks,
+    get_set_bit_indices,
+    rotate_12bit_bitmask_left,
+    voicing_bitmasks_to_combination_bitmasks,
+)
+from src.voicing import Voicing
+
+
+class Interpretation(NamedTuple):
+    """A way to read a `Combination`: a named `CumPattern`, built from a root.
+
+    Examples
+    --------
+    >>> str(Interpretation(C, M7))
+    'C maj7'
+    """
+
+    root: PitchClass
+    cum_pattern: CumPattern
+
+    def __str__(self) -> str:
+        return f"{self.root} {CUM_PATTERN_NAMES[self.cum_pattern]}"
+
+
+class Identification(NamedTuple):
+    """A way to read a `Voicing`: an `Interpretation` of its `Combination`,
+    together with the `PitchClass` in the bass.
+
+    `inversion` is the index of the bass among the intervals from root of the `CumPattern`,
+    so 0 for root position.
+
+    Examples
+    --------
+    >>> str(Identification(Interpretation(C, M7), B, 3))
+    'C maj7 / 3rd inversion'
+    """
+
+    interpretation: Interpretation
+    bass: PitchClass
+    inversion: int
+
+    def __str__(self) -> str:
+        if not self.inversion:
+            return str(self.interpretation)
+        return f"{self.interpretation} / {get_ordinal(self.inversion)} inversion"
+
+
+def get_ordinal(n: int) -> str:
+    if n % 100 in (11, 12, 13):
+        return f"{n}th"
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+@cache
+def get_interpretation_table() -> tuple[tuple[Interpretation, ...], ...]:
+    """Builds the reverse index from `Combination` bitmasks to their `Interpretation`s, once.
+
+    Returns
+    -------
+    tuple[tuple[Interpretation, ...], ...]
+        Per 12-bit bitmask, all of the ways to build it from a root and a `CumPattern`
+        in `CUM_PATTERN_NAMES`, in the order of `CUM_PATTERN_NAMES`, then by root.
+    """
+    table: list[list[Interpretation]] = [[] for _ in range(4096)]
+    for cum_pattern in CUM_PATTERN_NAMES:
+        for root in range(12):
+            bitmask = rotate_12bit_bitmask_left(cum_pattern.bitmask, root)
+            table[bitmask].append(Interpretation(PitchClass(root), cum_pattern))
+    return tuple(tuple(interpretations) for interpretations in table)
+
+
+def interpret(combination: Combination) -> tuple[Interpretation, ...]:
+    """Finds all of the named chords and scales a `Combination` is.
+
+    Parameters
+    ----------
+    combination : Combination
+        The `Combination` to interpret.
+
+    Returns
+    -------
+    tuple[Interpretation, ...]
+        All `Interpretation`s, empty if the `Combination` has no name.
+    """
+    return get_interpretation_table()[combination.bitmask]
+
+
+@cache
+def _get_identifications(
+    combination_bitmask: int, bass_value: int
+) -> tuple[Identification, ...]:
+    identifications: list[Identification] = []
+    for interpretation in get_interpretation_table()[combination_bitmask]:
+        interval = (bass_value - interpretation.root.value) % 12
+        intervals_from_root = get_set_bit_indices(interpretation.cum_pattern.bitmask)
+        inversion = intervals_from_root.index(interval)
+        identifications.append(
+            Identification(interpretation, PitchClass(bass_value), inversion)
+        )
+    return tuple(identifications)
+
+
+def identify_voicing(voicing: Voicing) -> tuple[Identification, ...]:
+    """Finds all of the named chords and scales a `Voicing` is, and their inversions.
+
+    Parameters
+    ----------
+    voicing : Voicing
+        The `Voicing` to identify.
+
+    Returns
+    -------
+    tuple[Identification, ...]
+        All `Identification`s, empty if the `Combination` of the `Voicing` has no name.
+    """
+    if not voicing.bitmask:
+        return ()
+    bass_value = (voicing.bitmask & -voicing.bitmask).bit_length() - 1
+    return _get_identifications(voicing.combination.bitmask, bass_value % 12)
+
+
+def identify(voicing_bitmasks: int64list) -> list[tuple[Identification, ...]]:
+    """Bulk version of `identify_voicing`, for labelling many generated chords at once.
+
+    Each distinct (`Combination`, bass) pair only gets identified once.
+
+    Parameters
+    ----------
+    voicing_bitmasks : int64list
+        The bitmasks of the `Voicing`s to identify, as an array of unsigned 64-bit integers.
+
+    Returns
+    -------
+    list[tuple[Identification, ...]]
+        Per `Voicing`, what `identify_voicing` would give.
+    """
+    voicing_bitmasks = np.asarray(voicing_bitmasks, dtype=np.uint64)
+    combination_bitmasks = voicing_bitmasks_to_combination_bitmasks(voicing_bitmasks)
+    bass_values = get_lowest_set_bits_64bit_bitmasks(voicing_bitmasks) % 12
+    keys = combination_bitmasks.astype(np.int64) * 12 + bass_values
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+    identifications = [
+        _get_identifications(*divmod(key, 12)) for key in unique_keys.tolist()
+    ]
+    return [identifications[i] for i in inverse.tolist()]
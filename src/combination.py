@@ -2,11 +2,11 @@ from typing import Iterable, overload
 
 from src.profiler import TimingMeta
 from src.cum_pattern import CumPattern
-from src.my_types import int16, int64
 from src.pitch_class import PitchClass
 from src.pattern import Pattern
 from src.util import (
     get_all_12bit_bitmask_rotations,
+    get_root_match_table,
     get_set_bit_indices,
     is_12bit,
     rotate_12bit_bitmask_left,
@@ -17,31 +17,31 @@ from src.util import (
 class Combination(metaclass=TimingMeta):
     """Represents a set of `PitchClass`es. The concept of C major can be expressed
     by a `Combination`, if the way the chord is voiced is not relevant.
+
+    All 4096 `Combination`s are created once, at import, so that getting one never mutates
+    shared state, and there's only ever one instance per `Combination`, also across threads.
     """
 
-    __slots__ = ("bitmask",)
+    __slots__ = ("_pcs", "bitmask")
+
+    # The slots that only cache derived values, see `src.caches`.
+    _cache_slots = ("_pcs",)
 
-    bitmask: int16
+    bitmask: int
+    _pcs: frozenset[PitchClass] | None
 
-    _instances: dict[int16, "Combination"] = {}
+    _instances: tuple["Combination", ...]
 
     def __new__(cls, pcs: Iterable[PitchClass]) -> "Combination":
-        bitmask = int16(0)
+        bitmask = 0
         for pc in pcs:
             bitmask |= pc.bitmask
-        return cls._get_or_create(bitmask)
+        return cls._get_instance(bitmask)
 
     @classmethod
-    def _get_or_create(cls, bitmask: int16) -> "Combination":
+    def _get_instance(cls, bitmask: int) -> "Combination":
         assert is_12bit(bitmask), f"{bitmask = }"
-        if bitmask in cls._instances:
-            return cls._instances[bitmask]
-
-        instance = super().__new__(cls)
-        instance.bitmask = bitmask
-        cls._instances[bitmask] = instance
-
-        return instance
+        return cls._instances[bitmask]
 
     @classmethod
     def from_cum(cls, root: PitchClass, cum_pattern: CumPattern) -> "Combination":
@@ -55,23 +55,23 @@ class Combination(metaclass=TimingMeta):
             The `CumPattern` from which to create a `Combination`.
         """
         bitmask = rotate_12bit_bitmask_left(cum_pattern.bitmask, root.value)
-        return cls._get_or_create(bitmask)
+        return cls._get_instance(bitmask)
 
     @classmethod
-    def from_voicing_bitmask(cls, voicing_bitmask: int64) -> "Combination":
+    def from_voicing_bitmask(cls, voicing_bitmask: int) -> "Combination":
         bitmask = voicing_bitmask_to_combination_bitmask(voicing_bitmask)
-        return cls._get_or_create(bitmask)
+        return cls._get_instance(bitmask)
 
     @classmethod
     def all_from_pattern(cls, pattern: Pattern) -> "list[Combination]":
         all_bitmask_rotations = get_all_12bit_bitmask_rotations(pattern.bitmask)
-        return [cls._get_or_create(rotation) for rotation in all_bitmask_rotations]
+        return [cls._get_instance(rotation) for rotation in all_bitmask_rotations]
 
     def __iter__(self):
         return iter(self.pcs)
 
     def __str__(self):
-        return f"Combination(PCs: {self.pcs})"
+        return f"Combination(PCs: {set(self.pcs)})"
 
     def __repr__(self):
         return str(self)
@@ -80,7 +80,11 @@ class Combination(metaclass=TimingMeta):
         return isinstance(other, Combination) and self.bitmask == other.bitmask
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        # Re-interns on unpickling.
+        return (Combination._get_instance, (self.bitmask,))
 
     def __len__(self) -> int:
         return self.bitmask.bit_count()
@@ -89,7 +93,7 @@ class Combination(metaclass=TimingMeta):
         if isinstance(other, Combination):
             return other.bitmask & self.bitmask == other.bitmask
         else:  # PitchClass
-            return bool((int16(1) << int16(other.value)) & self.bitmask)
+            return bool((1 << other.value) & self.bitmask)
 
     @overload
     def __add__(self, other: "Combination") -> "Combination":
@@ -106,7 +110,7 @@ class Combination(metaclass=TimingMeta):
 
     def __add__(self, other: "Combination | PitchClass") -> "Combination":
         bitmask = self.bitmask | other.bitmask
-        return Combination._get_or_create(bitmask)
+        return Combination._get_instance(bitmask)
 
     def match(self, cum: CumPattern) -> set[PitchClass]:
         """Finds all of the roots from which `cum` could be built using the notes in `self`.
@@ -121,21 +125,32 @@ class Combination(metaclass=TimingMeta):
         list[PitchClass]
             All of the roots from which `cum` could be built using the notes in `self`.
         """
-        roots_for_matches: set[PitchClass] = set()
-        for pc in self.pcs:
-            rotated = rotate_12bit_bitmask_left(cum.bitmask, pc.value)
-            if rotated & self.bitmask == rotated:
-                roots_for_matches.add(pc)
-        return roots_for_matches
+        roots_bitmask = get_root_match_table(cum.bitmask)[self.bitmask]
+        return {PitchClass(index) for index in get_set_bit_indices(roots_bitmask)}
 
     def fits(self, pattern: Pattern) -> bool:
-        return self.pattern in pattern
+        return pattern.contains_12bit_bitmask(self.bitmask)
 
     @property
-    def pcs(self) -> set[PitchClass]:
-        set_bit_indices = get_set_bit_indices(self.bitmask)
-        return {PitchClass(index) for index in set_bit_indices}
+    def pcs(self) -> frozenset[PitchClass]:
+        if self._pcs is None:
+            set_bit_indices = get_set_bit_indices(self.bitmask)
+            self._pcs = frozenset(PitchClass(index) for index in set_bit_indices)
+        return self._pcs
 
     @property
     def pattern(self) -> Pattern:
         return Pattern.from_12bit_bitmask(self.bitmask)
+
+
+def _create_all_combinations() -> tuple[Combination, ...]:
+    instances: list[Combination] = []
+    for bitmask in range(4096):
+        instance = object.__new__(Combination)
+        instance.bitmask = bitmask
+        instance._pcs = None
+        instances.append(instance)
+    return tuple(instances)
+
+
+Combination._instances = _create_all_combinations()
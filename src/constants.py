@@ -1,7 +1,5 @@
-from src.my_types import int16
-
 INF = 10**100
 FREQ_ROOT = 32.7032
 SAMPLE_RATE = 44100
 
-MASK_12BIT = int16(0xFFF)
+MASK_12BIT = 0xFFF
@@ -1,10 +1,10 @@
 from typing import Iterable
 
 from src.pattern import Pattern
-from src.my_types import int16, int64
 from src.profiler import TimingMeta
 from src.util import (
     get_all_12bit_bitmask_rotations,
+    get_set_bit_indices,
     intervals_from_root_to_cum_pattern_bitmask,
     is_12bit,
     rotate_12bit_bitmask_right,
@@ -19,18 +19,28 @@ class CumPattern(metaclass=TimingMeta):
     In contrast to a `Pattern`, a `CumPattern` distinguishes between ionian and lydian for example,
     i.e. there's a fixed starting point. If we want to express a major triad as a `CumPattern`,
     we could do so in three different ways.
+
+    All 4096 `CumPattern`s are created once, at import, so that getting one never mutates
+    shared state, and there's only ever one instance per `CumPattern`, also across threads.
     """
 
-    __slots__ = ("bitmask",)
+    __slots__ = ("_intervals_from_root", "bitmask")
+
+    # The slots that only cache derived values, see `src.caches`.
+    _cache_slots = ("_intervals_from_root",)
+
+    bitmask: int
+    _intervals_from_root: tuple[int, ...] | None
 
-    bitmask: int16
+    _instances: tuple["CumPattern", ...]
 
-    def __init__(self, intervals_from_root: Iterable[int]):
+    def __new__(cls, intervals_from_root: Iterable[int]):
         intervals_mod_12 = set(interval % 12 for interval in intervals_from_root)
-        self.bitmask = intervals_from_root_to_cum_pattern_bitmask(intervals_mod_12)
+        bitmask = intervals_from_root_to_cum_pattern_bitmask(intervals_mod_12)
+        return cls._instances[bitmask]
 
     @classmethod
-    def _from_12bit_bitmask(cls, bitmask: int16) -> "CumPattern":
+    def _from_12bit_bitmask(cls, bitmask: int) -> "CumPattern":
         """Creates a `CumPattern` from a 12-bit bitmask.
 
         This bitmask does not need to be in normal form, but it needs
@@ -38,7 +48,7 @@ class CumPattern(metaclass=TimingMeta):
 
         Parameters
         ----------
-        bitmask : int16
+        bitmask : int
             A 12-bit bitmask representing the cumulative pattern.
 
         Returns
@@ -47,14 +57,11 @@ class CumPattern(metaclass=TimingMeta):
             The resulting `CumPattern`.
         """
         assert is_12bit(bitmask), f"{bitmask = }"
-
-        instance = cls.__new__(cls)
-        instance.bitmask = bitmask
-        return instance
+        return cls._instances[bitmask]
 
     @classmethod
     def from_shape_bitmask_and_offset(
-        cls, shape_bitmask: int64, offset: int = 0
+        cls, shape_bitmask: int, offset: int = 0
     ) -> "CumPattern":
         bitmask = shape_bitmask_and_offset_to_cum_pattern_bitmask(shape_bitmask, offset)
         return CumPattern._from_12bit_bitmask(bitmask)
@@ -68,7 +75,7 @@ class CumPattern(metaclass=TimingMeta):
         ]
 
     @property
-    def intervals_from_root(self) -> list[int]:
+    def intervals_from_root(self) -> tuple[int, ...]:
         """Get the intervals from root as a sorted tuple.
 
         Returns
@@ -76,7 +83,9 @@ class CumPattern(metaclass=TimingMeta):
         tuple[int, ...]
             A sorted tuple of intervals from the root.
         """
-        return [i for i in range(12) if self.bitmask & (int16(1) << int16(i))]
+        if self._intervals_from_root is None:
+            self._intervals_from_root = tuple(get_set_bit_indices(self.bitmask))
+        return self._intervals_from_root
 
     @property
     def pattern(self) -> Pattern:
@@ -98,7 +107,7 @@ class CumPattern(metaclass=TimingMeta):
             The resulting `CumPattern`.
         """
         if isinstance(other, int):
-            new_bitmask = self.bitmask | (int16(1) << int16(other % 12))
+            new_bitmask = self.bitmask | (1 << (other % 12))
             return CumPattern._from_12bit_bitmask(new_bitmask)
         else:  # CumPattern
             new_bitmask = self.bitmask | other.bitmask
@@ -127,9 +136,24 @@ class CumPattern(metaclass=TimingMeta):
         return isinstance(other, CumPattern) and self.bitmask == other.bitmask
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        return (CumPattern._from_12bit_bitmask, (self.bitmask,))
 
 
+def _create_all_cum_patterns() -> tuple[CumPattern, ...]:
+    instances: list[CumPattern] = []
+    for bitmask in range(4096):
+        instance = object.__new__(CumPattern)
+        instance.bitmask = bitmask
+        instance._intervals_from_root = None
+        instances.append(instance)
+    return tuple(instances)
+
+
+CumPattern._instances = _create_all_cum_patterns()
+
 MAJOR = CumPattern([0, 4, 7])
 MINOR = CumPattern([0, 3, 7])
 SUS2 = CumPattern([0, 2, 7])
@@ -183,3 +207,47 @@ LYDIAN = IONIAN << 5
 MIXOLYDIAN = IONIAN << 7
 AEOLIAN = IONIAN << 9
 LOCRIAN = IONIAN << 11
+
+# Some of the constants above coincide (e.g. `SUS2ADD6` and `M69`), those get a single name.
+CUM_PATTERN_NAMES = {
+    MAJOR: "maj",
+    MINOR: "min",
+    SUS2: "sus2",
+    SUS4: "sus4",
+    LYDSUS4: "lydsus4",
+    DIM: "dim",
+    AUG: "aug",
+    ADD9: "add9",
+    ADD4: "add4",
+    M6: "6",
+    DOM7: "7",
+    M7: "maj7",
+    m6: "m6",
+    m7: "m7",
+    mM7: "mM7",
+    SUS2SUS4: "sus2sus4",
+    DOM7SUS4: "7sus4",
+    M7SUS4: "maj7sus4",
+    M7LYDSUS4: "maj7lydsus4",
+    DIM7: "dim7",
+    HALFDIM7: "m7b5",
+    DIMM7: "dimM7",
+    AUG7: "aug7",
+    AUGM7: "augM7",
+    DOM7f9: "7b9",
+    DOM9: "9",
+    DOM7s9: "7#9",
+    M9: "maj9",
+    m9: "m9",
+    DIM9: "dim9",
+    HALFDIM9: "m9b5",
+    M69: "6/9",
+    m69: "m6/9",
+    IONIAN: "ionian",
+    DORIAN: "dorian",
+    PHRYGIAN: "phrygian",
+    LYDIAN: "lydian",
+    MIXOLYDIAN: "mixolydian",
+    AEOLIAN: "aeolian",
+    LOCRIAN: "locrian",
+}
@@ -1,7 +1,11 @@
-from typing import Iterable
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+
+import numpy as np
 
 from src.combination import Combination
 from src.cum_pattern import CumPattern
+from src.my_types import boollist, intlist
 from src.note import Note
 from src.pattern import Pattern
 from src.pitch_class import PitchClass
@@ -9,39 +13,89 @@ from src.profiler import TimingMeta
 from src.shape import Shape
 from src.voicing import Voicing
 
+NOTES_BY_VALUE: tuple[Note, ...] = tuple(Note(value) for value in range(64))
+
 
 class Distribution(metaclass=TimingMeta):
+    """A `Distribution` is an ordered list of `Note`s, one per voice, possibly with duplicates.
+
+    It's stored as the `Note` values, one byte each, so that equality is a single bytes
+    comparison, and the hash is computed once. Interning identical `Distribution`s
+    can be turned on with `enable_interning`, to share their cached derived values.
+    """
+
+    __slots__ = ("_hash", "_pc_count", "_pc_lanes", "_voicing", "values")
 
-    __slots__ = ("notes", "_voicing", "_pc_count")
+    # The slots that only cache derived values, see `src.caches`.
+    _cache_slots = ("_voicing", "_pc_lanes", "_pc_count")
 
-    notes: list[Note]
+    values: bytes
+    _hash: int | None
     _voicing: Voicing | None
-    _pc_count: dict[PitchClass, int] | None
+    _pc_lanes: bytes | None
+    _pc_count: Mapping[PitchClass, int] | None
 
-    def __init__(self, notes: Iterable[Note]):
-        self.notes = list(notes)
-        self._voicing = None
-        self._pc_count = None
+    # Per `values`, the interned instance, if interning is enabled.
+    _instances: dict[bytes, "Distribution"] | None = None
+
+    def __new__(cls, notes: Iterable[Note]):
+        note_values = bytes([note.bitmask.bit_length() - 1 for note in notes])
+        return cls._from_note_values_bytes(note_values)
+
+    @classmethod
+    def _from_note_values_bytes(cls, note_values: bytes) -> "Distribution":
+        instances = cls._instances
+        if instances is not None:
+            instance = instances.get(note_values)
+            if instance is not None:
+                return instance
+        instance = object.__new__(cls)
+        instance.values = note_values
+        instance._hash = None
+        instance._voicing = None
+        instance._pc_lanes = None
+        instance._pc_count = None
+        if instances is not None:
+            # Another thread may have interned the same `Distribution` in the meantime.
+            instance = instances.setdefault(note_values, instance)
+        return instance
+
+    @classmethod
+    def enable_interning(cls) -> None:
+        """Makes all `Distribution`s created from now on unique per list of `Note`s,
+        until `disable_interning` is called. The interned instances are kept alive."""
+        if cls._instances is None:
+            cls._instances = {}
+
+    @classmethod
+    def disable_interning(cls) -> None:
+        cls._instances = None
 
     @classmethod
     def from_shape_and_root(cls, root: Note, shape: Shape) -> "Distribution":
         return Distribution([root + (shape.offset + interval) for interval in shape])
 
+    @property
+    def notes(self) -> list[Note]:
+        return [NOTES_BY_VALUE[value] for value in self.values]
+
     def __iter__(self):
-        return iter(self.notes)
+        return iter([NOTES_BY_VALUE[value] for value in self.values])
 
     def __len__(self):
-        return len(self.notes)
+        return len(self.values)
 
     def __getitem__(self, i: int) -> Note:
-        return self.notes[i]
+        return NOTES_BY_VALUE[self.values[i]]
 
     def __add__(self, other: Note) -> "Distribution":
-        return Distribution([*self.notes, other])
+        return Distribution._from_note_values_bytes(self.values + bytes((other.value,)))
 
     def __lshift__(self, i: int) -> "Distribution":
-        notes = [note << i for note in self.notes]
-        return Distribution(notes)
+        note_values = [value - i for value in self.values]
+        if note_values and not 0 <= min(note_values) <= max(note_values) < 64:
+            raise OverflowError()
+        return Distribution._from_note_values_bytes(bytes(note_values))
 
     def __rshift__(self, i: int) -> "Distribution":
         return self << -i
@@ -53,15 +107,26 @@ class Distribution(metaclass=TimingMeta):
         return str(self)
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, Distribution) and self.notes == other.notes
+        return isinstance(other, Distribution) and self.values == other.values
 
     def __hash__(self) -> int:
-        return hash(tuple(note for note in self.notes))
+        if self._hash is None:
+            # The hash of the tuple of `Note`s, as before the packed representation,
+            # to keep the iteration order of sets of `Distribution`s.
+            self._hash = hash(tuple([NOTES_BY_VALUE[value] for value in self.values]))
+        return self._hash
+
+    def __reduce__(self) -> tuple:
+        # Just the `Note` values, one byte each, re-interned on unpickling.
+        return (Distribution._from_note_values_bytes, (self.values,))
 
     @property
     def voicing(self) -> Voicing:
         if self._voicing is None:
-            self._voicing = Voicing(self.notes)
+            bitmask = 0
+            for value in self.values:
+                bitmask |= 1 << value
+            self._voicing = Voicing.from_64bit_bitmask(bitmask)
         return self._voicing
 
     def fits(
@@ -90,22 +155,105 @@ class Distribution(metaclass=TimingMeta):
         return self.voicing.pattern
 
     @property
-    def pc_count(self) -> dict[PitchClass, int]:
+    def note_values_bytes(self) -> bytes:
+        """The `Note` values, one byte each."""
+        return self.values
+
+    @property
+    def pc_lanes(self) -> bytes:
+        """The number of `Note`s per `PitchClass`, in 12 lanes indexed by `PitchClass` value."""
+        if self._pc_lanes is None:
+            pc_lanes = bytearray(12)
+            for value in self.values:
+                pc_lanes[value % 12] += 1
+            self._pc_lanes = bytes(pc_lanes)
+        return self._pc_lanes
+
+    @property
+    def pc_count(self) -> Mapping[PitchClass, int]:
+        """The number of `Note`s per present `PitchClass`, read-only as it's shared."""
         if self._pc_count is None:
-            pc_count: dict[PitchClass, int] = {}
-            for note in self:
-                pc = note.pc
-                if pc not in pc_count:
-                    pc_count[pc] = 0
-                pc_count[pc] += 1
-            self._pc_count = pc_count
+            self._pc_count = MappingProxyType(
+                {
+                    PitchClass(value): count
+                    for value, count in enumerate(self.pc_lanes)
+                    if count
+                }
+            )
         return self._pc_count
 
     def has_optimal_pc_spread(self, nr_of_pcs: int) -> bool:
-        pc_count = self.pc_count
-        occurences = list(pc_count.values())
-        if len(occurences) > nr_of_pcs:
+        pc_lanes = self.pc_lanes
+        nr_of_present_pcs = 12 - pc_lanes.count(0)
+        if nr_of_present_pcs > nr_of_pcs:
             raise ValueError
-        if len(occurences) < nr_of_pcs:
-            return max(occurences) == 1
-        return max(occurences) - min(occurences) <= 1
+        if nr_of_present_pcs < nr_of_pcs:
+            return max(pc_lanes) == 1
+        return max(pc_lanes) - min(count for count in pc_lanes if count) <= 1
+
+
+def get_distributions(note_values: intlist) -> list[Distribution]:
+    """Builds a `Distribution` per row of candidates in columnar form.
+
+    Parameters
+    ----------
+    note_values : intlist
+        `Note` values of shape (candidates, voices).
+
+    Returns
+    -------
+    list[Distribution]
+        A `Distribution` per candidate, straight from the bytes of its row.
+    """
+    note_values = np.ascontiguousarray(note_values, dtype=np.uint8)
+    nr_of_candidates, nr_of_voices = note_values.shape
+    packed = note_values.tobytes()
+    from_bytes = Distribution._from_note_values_bytes
+    if not nr_of_voices:
+        return [from_bytes(b"") for _ in range(nr_of_candidates)]
+    return [
+        from_bytes(packed[start : start + nr_of_voices])
+        for start in range(0, len(packed), nr_of_voices)
+    ]
+
+
+def get_pc_lanes(note_values: intlist) -> intlist:
+    """Vectorized `Distribution.pc_lanes`, for candidates in columnar form.
+
+    Parameters
+    ----------
+    note_values : intlist
+        `Note` values of shape (candidates, voices).
+
+    Returns
+    -------
+    intlist
+        The number of `Note`s per `PitchClass`, of shape (candidates, 12).
+    """
+    pcs = np.asarray(note_values)[..., np.newaxis] % 12
+    return np.sum(pcs == np.arange(12), axis=-2)
+
+
+def have_optimal_pc_spread(note_values: intlist, nr_of_pcs: int | intlist) -> boollist:
+    """Vectorized `Distribution.has_optimal_pc_spread`, for candidates in columnar form.
+
+    Parameters
+    ----------
+    note_values : intlist
+        `Note` values of shape (candidates, voices).
+    nr_of_pcs : int | intlist
+        The number of `PitchClass`es to spread over, for all candidates or per candidate.
+
+    Returns
+    -------
+    boollist
+        Per candidate, whether its `Note`s are spread optimally. Unlike the scalar version,
+        a candidate with more `PitchClass`es than `nr_of_pcs` doesn't raise a `ValueError`
+        for the whole column, but just gets False.
+    """
+    pc_lanes = get_pc_lanes(note_values)
+    nr_of_present_pcs = np.count_nonzero(pc_lanes, axis=-1)
+    most = np.max(pc_lanes, axis=-1)
+    least = np.min(np.where(pc_lanes, pc_lanes, most[..., np.newaxis]), axis=-1)
+    optimal = np.where(nr_of_present_pcs < nr_of_pcs, most == 1, most - least <= 1)
+    return optimal & (nr_of_present_pcs <= nr_of_pcs)
@@ -0,0 +1,150 @@
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from src.combination import Combination
+from src.distribution import Distribution, get_distributions, have_optimal_pc_spread
+from src.my_types import boollist, int16list, intlist
+from src.pattern import Pattern
+from src.shape import Shape
+from src.util import get_pattern_tables
+from src.voicing_array import VoicingArray
+
+
+class DistributionArray:
+    """Many `Distribution`s with the same number of voices at once,
+    stored as an int8 matrix of `Note` values of shape (distributions, voices).
+
+    Supports the bulk versions of the operations on `Distribution`, without a Python loop.
+    Slicing gives a view on the same matrix, indexing with an integer gives a `Distribution`,
+    and indexing with a boolean mask or an array of indices gives a filtered copy.
+
+    Attributes
+    ----------
+    values : intlist
+        The `Note` values, of shape (distributions, voices).
+    """
+
+    __slots__ = ("values",)
+
+    values: intlist
+
+    def __init__(self, values: intlist):
+        values = np.asarray(values, dtype=np.int8)
+        assert values.ndim == 2, f"{values.shape = }"
+        self.values = values
+
+    @classmethod
+    def from_distributions(
+        cls, distributions: Iterable[Distribution], nr_of_voices: int | None = None
+    ) -> "DistributionArray":
+        rows = [[note.value for note in distribution] for distribution in distributions]
+        if not rows:
+            return DistributionArray(np.zeros((0, nr_of_voices or 0), dtype=np.int8))
+        return DistributionArray(rows)
+
+    @classmethod
+    def from_shape(cls, root_note_values: intlist, shape: Shape) -> "DistributionArray":
+        """Vectorized `Distribution.from_shape_and_root`, building `shape` on every root at once.
+
+        Raises
+        ------
+        OverflowError
+            If any `Note` would leave the 64-note range.
+        """
+        intervals = np.array(
+            [shape.offset + interval for interval in shape], dtype=np.int64
+        )
+        roots = np.asarray(root_note_values, dtype=np.int64)
+        return DistributionArray._from_unchecked(roots[:, np.newaxis] + intervals)
+
+    @classmethod
+    def _from_unchecked(cls, values: intlist) -> "DistributionArray":
+        if np.any((values < 0) | (values >= 64)):
+            raise OverflowError()
+        return DistributionArray(values)
+
+    def to_distributions(self) -> list[Distribution]:
+        return get_distributions(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Distribution]:
+        return iter(self.to_distributions())
+
+    def __getitem__(
+        self, i: "int | slice | intlist | boollist"
+    ) -> "Distribution | DistributionArray":
+        if isinstance(i, (int, np.integer)):
+            return Distribution._from_note_values_bytes(
+                self.values[i].astype(np.uint8).tobytes()
+            )
+        return DistributionArray(self.values[i])
+
+    def __lshift__(self, i: "int | intlist") -> "DistributionArray":
+        """Transposes all `Distribution`s down by `i` semitones, or each by its own amount.
+
+        Raises
+        ------
+        OverflowError
+            If any `Note` would leave the 64-note range.
+        """
+        shifts = np.asarray(i, dtype=np.int64)
+        if shifts.ndim:
+            shifts = shifts[:, np.newaxis]
+        return DistributionArray._from_unchecked(self.values - shifts)
+
+    def __rshift__(self, i: "int | intlist") -> "DistributionArray":
+        return self << -np.asarray(i, dtype=np.int64)
+
+    def __str__(self) -> str:
+        return f"DistributionArray({self.to_distributions()})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def fits(
+        self, to_fit: Combination | Pattern, optimise_pc_spread: bool = False
+    ) -> boollist:
+        """Vectorized `Distribution.fits`."""
+        fits = self.voicings.fits(to_fit)
+        if not optimise_pc_spread:
+            return fits
+        spread = np.zeros(len(self), dtype=np.bool_)
+        spread[fits] = have_optimal_pc_spread(self.values[fits], len(to_fit))
+        return spread
+
+    @property
+    def nr_of_voices(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def voicings(self) -> VoicingArray:
+        note_bitmasks = np.uint64(1) << self.values.astype(np.uint64)
+        return VoicingArray(np.bitwise_or.reduce(note_bitmasks, axis=1))
+
+    @property
+    def combination_bitmasks(self) -> int16list:
+        pc_bitmasks = np.uint16(1) << (self.values % 12).astype(np.uint16)
+        return np.bitwise_or.reduce(pc_bitmasks, axis=1)
+
+    @property
+    def combinations(self) -> list[Combination]:
+        return [
+            Combination._get_instance(bitmask)
+            for bitmask in self.combination_bitmasks.tolist()
+        ]
+
+    @property
+    def pattern_ids(self) -> intlist:
+        """The dense id of the `Pattern` of every `Distribution`, see `get_pattern_tables`."""
+        ids = np.array(get_pattern_tables().ids, dtype=np.intp)
+        return ids[self.combination_bitmasks]
+
+    @property
+    def patterns(self) -> list[Pattern]:
+        return [
+            Pattern.from_12bit_bitmask(bitmask)
+            for bitmask in self.combination_bitmasks.tolist()
+        ]
@@ -1,26 +1,23 @@
 import asyncio
-from sounddevice import play as play_recording  # type: ignore
 
 from src.audio_io import record
 from src.audio_to_notes import extract_note_sequence
 from src.constants import SAMPLE_RATE
-from src.midi_driver_interface import peep, play_melody, poop
+from src.distribution import Distribution
 from src.metrics.diatonic_local import DiatonicLocal
+from src.metrics.individual_steps import IndividualSteps
 from src.metrics.internal_interval_range import InternalIntervalRange
+from src.metrics.legal_patterns import LegalPatterns
+from src.metrics.legal_ranges import LegalRanges
 from src.metrics.no_combination_reps import NoCombinationReps
 from src.metrics.no_dup_notes import NoDupNotes
-from src.metrics.legal_ranges import LegalRanges
-from src.metrics.legal_patterns import LegalPatterns
+from src.midi_driver_interface import peep, play_melody, poop
+from src.my_types import *
+from src.note import *
 from src.pattern import *
-from src.stochastic_distribution_engine import StochasticDistributionEngine
-from src.metrics.individual_steps import IndividualSteps
-from src.distribution import Distribution
 from src.pitch_class import *
-from src.note import *
 from src.shape import *
-from src.my_types import *
-from IPython.display import display, clear_output  # type: ignore
-import ipywidgets as widgets  # type: ignore
+from src.stochastic_distribution_engine import StochasticDistributionEngine
 
 DEFAULT_STRING_RANGES = [(G2, G3), (B2, B3), (E3, E4)]
 DEFAULT_START = Distribution([C3, F3, A3])
@@ -172,6 +169,10 @@ class GuitarPractice:
         sleep_duration : float
             The time the player gets to play back a chord.
         """
+        import ipywidgets as widgets  # type: ignore
+        from IPython.display import display  # type: ignore
+        from sounddevice import play as play_recording  # type: ignore
+
         future: asyncio.Future[int] = asyncio.get_event_loop().create_future()
 
         for distribution in distributions:
@@ -299,6 +300,9 @@ class GuitarPractice:
 
         Uses interactive widgets for Jupyter notebook compatibility.
         """
+        import ipywidgets as widgets  # type: ignore
+        from IPython.display import display  # type: ignore
+
         if not self.engine.history or not self.nr_of_chords_per_round:
             print("No history to study")
             poop()
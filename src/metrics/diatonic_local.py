@@ -1,9 +1,11 @@
-from src.combination import Combination
+from collections.abc import Iterable
+
 from src.constants import INF
 from src.cum_pattern import IONIAN
 from src.metrics.metric import Metric
 from src.pattern import Pattern
 from src.distribution import Distribution
+from src.util import get_fitting_rotations_table
 
 
 class DiatonicLocal(Metric):
@@ -17,87 +19,94 @@ class DiatonicLocal(Metric):
     max_lookback : int
         How far back in history to reward diatonicity.
 
-    scale_pattern : Pattern
-        Scale pattern within which to establish diatonicity.
+    scale_pattern : Pattern | Iterable[Pattern]
+        Scale pattern(s) within which to establish diatonicity. Fitting any rotation
+        of any of these is enough. Kept as a list in `self.scale_patterns`.
 
     Enforces
     --------
-    - The union of a candidate and the latest `min_lookback` `Distribution`s fit `self.scale_pattern`.
+    - The union of a candidate and the latest `min_lookback` `Distribution`s fit `self.scale_patterns`.
 
     Rewards
     -------
     - The more latest `Distribution`s in history we can add to this union.
+
+    Notes
+    -----
+    Every rotation of every scale pattern gets its own bit, and `fitting_table` maps every
+    `Combination` bitmask to the bits of the rotations it fits in. Checking a candidate then
+    comes down to a table lookup and a bitwise AND, regardless of the number of scale patterns.
     """
 
     def __init__(
         self,
         min_lookback: int = 1,
         max_lookback: int = INF,
-        scale_pattern: Pattern = IONIAN.pattern,
+        scale_pattern: Pattern | Iterable[Pattern] = IONIAN.pattern,
         weight: float = 1,
     ):
         super().__init__(weight)
         self.min_lookback = min_lookback
         self.max_lookback = max_lookback
-        self.concrete_combinations: list[Combination] = Combination.all_from_pattern(
-            scale_pattern
-        )
+        if isinstance(scale_pattern, Pattern):
+            self.scale_patterns = [scale_pattern]
+        else:
+            self.scale_patterns = list(scale_pattern)
+
+        self.fitting_table = [0] * 4096
+        for i, pattern in enumerate(self.scale_patterns):
+            table = get_fitting_rotations_table(pattern.bitmask)
+            for combination_bitmask, fitting in enumerate(table):
+                self.fitting_table[combination_bitmask] |= fitting << (12 * i)
+
+        # union_history[i] is the union of the latest i + 1 `Combination`s in history.
+        self.union_history: list[int] = []
 
     def setup(self, history: list[Distribution]) -> None:
-        actual_min_lookback = min(self.min_lookback, len(history))
-        actual_max_lookback = min(self.max_lookback, len(history))
-        combination_history = [
-            distribution.combination for distribution in history[-actual_max_lookback:]
+        new_history = self._get_new_history(history)
+        if new_history is None:
+            self.union_history = []
+            new_history = history[-self.max_lookback :]
+        for distribution in new_history:
+            self._push(distribution.combination.bitmask)
+
+        actual_min_lookback = min(self.min_lookback, len(self.union_history))
+        if actual_min_lookback:
+            union_min_lookback = self.union_history[actual_min_lookback - 1]
+        else:
+            union_min_lookback = 0
+        self.fit_any_to_be_allowed = self.fitting_table[union_min_lookback]
+
+        self.fit_any_iteratively_for_bonus_points = [
+            self.fitting_table[union]
+            for union in self.union_history[actual_min_lookback:]
+        ]
+        self.bonus_per_fit: dict[int, float] = {}
+
+    def _push(self, combination_bitmask: int) -> None:
+        self.union_history = [combination_bitmask] + [
+            combination_bitmask | union
+            for union in self.union_history[: self.max_lookback - 1]
         ]
-        reversed_history = list(reversed(combination_history))
-
-        union_history_min_lookback = sum(
-            reversed_history[:actual_min_lookback], Combination([])
-        )
-        self.fit_any_to_be_allowed = {
-            concrete
-            for concrete in self.concrete_combinations
-            if union_history_min_lookback in concrete
-        }
-
-        fit_any_iteratively_for_bonus_points: list[set[Combination]] = []
-        for i in range(actual_min_lookback, actual_max_lookback):
-            union_history_bonus = sum(reversed_history[: i + 1], Combination([]))
-            fit_any_iteratively_for_bonus_points.append(
-                {
-                    concrete
-                    for concrete in self.concrete_combinations
-                    if union_history_bonus in concrete
-                }
-            )
-
-        bonus_per_fit: dict[Combination, float] = {}
-        for i, combinations in reversed(
-            list(enumerate(fit_any_iteratively_for_bonus_points))
-        ):
-            for combination in combinations:
-                if combination not in bonus_per_fit:
-                    bonus_per_fit[combination] = (i + 1) / len(
-                        fit_any_iteratively_for_bonus_points
-                    )
-
-        self.bonus_per_fit: list[tuple[Combination, float]] = list(
-            sorted(bonus_per_fit.items(), key=lambda cf: -cf[1])
-        )
 
     def _allows_partial(self, candidate: Distribution) -> bool:
-        candidate_combination = candidate.combination
-        for to_fit in self.fit_any_to_be_allowed:
-            if candidate_combination in to_fit:
-                return True
-        return False
+        fitting = self.fitting_table[candidate.combination.bitmask]
+        return bool(fitting & self.fit_any_to_be_allowed)
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
         return True
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
-        candidate_combination = candidate.combination
-        for to_fit, score in self.bonus_per_fit:
-            if candidate_combination in to_fit:
-                return score
+        fitting = self.fitting_table[candidate.combination.bitmask]
+        if fitting not in self.bonus_per_fit:
+            self.bonus_per_fit[fitting] = self._get_bonus(fitting)
+        return self.bonus_per_fit[fitting]
+
+    def _get_bonus(self, fitting: int) -> float:
+        # The unions only grow going back in history, so the sets of fitting rotations
+        # are nested, and the deepest one we still fit determines the bonus.
+        nr_of_bonus_fits = len(self.fit_any_iteratively_for_bonus_points)
+        for i in reversed(range(nr_of_bonus_fits)):
+            if fitting & self.fit_any_iteratively_for_bonus_points[i]:
+                return (i + 1) / nr_of_bonus_fits
         return 0
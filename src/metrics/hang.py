@@ -1,9 +1,10 @@
-from itertools import pairwise
-from src.metrics.legal_notes import LegalNotes
+import warnings
+from functools import cache
+from itertools import combinations
+
+from src.distribution import Distribution
 from src.metrics.metric import Metric
 from src.note import *
-from src.distribution import Distribution
-
 
 HANG_SMAM_NOTES: tuple[Note, list[Note]] = (D2, [A2, C3, E3, G3, C4, A3, F3, D3, Bf2])
 
@@ -20,47 +21,96 @@ class Hang(Metric):
         The notes in the ring, ordered going around the ring, such that two notes
         that are next to each other on the ring are next to each other in `self.ring`.
 
-    require_pair : bool
-        Requires that at least two notes are next to each other.
+    require_playability : bool
+        Requires that all notes can be played simultaneously with two hands.
+        Previously `require_pair`, which is still accepted, but deprecated.
 
     Enforces
     --------
     - All notes in a candidate to be available on the hang (self.ding and self.ring).
 
-    if require_pair:
-        - Two notes from the distribution to be playable simultaneously with one hand.
+    if require_playability:
+        - All notes to be playable simultaneously. Up to two notes always are, three notes need a pair
+        (two notes next to each other on the ring), four notes need two separate pairs, and five or more
+        notes aren't playable. Duplicate notes count as one note.
     """
 
     def __init__(
         self,
         hang_notes: tuple[Note, list[Note]] = HANG_SMAM_NOTES,
-        require_pair: bool = True,
+        require_playability: bool = True,
+        require_pair: bool | None = None,
     ):
         super().__init__(0)
+        if require_pair is not None:
+            warnings.warn(
+                "`require_pair` is deprecated, use `require_playability` instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            require_playability = require_pair
         self.ding, self.ring = hang_notes
-        self.legal_notes = LegalNotes([hang_notes[0]] + hang_notes[1])
-        self.require_pair = require_pair
+        self.notes_bitmask = 0
+        for note in [self.ding, *self.ring]:
+            self.notes_bitmask |= note.bitmask
+        self.playable_bitmasks = get_playable_bitmasks(self.ding, tuple(self.ring))
+        self.require_playability = require_playability
+
+    @property
+    def require_pair(self) -> bool:
+        """Deprecated alias of `require_playability`."""
+        return self.require_playability
 
     def setup(self, history: list[Distribution]) -> None:
         pass
 
-    def has_pair(self, candidate: Distribution) -> bool:
-        if len(candidate) < 2:
-            return False
-        for note1, note2 in pairwise(self.ring + self.ring[:1]):
-            if note1 in candidate and note2 in candidate:
-                return True
-        return False
-
     def _allows_partial(self, candidate: Distribution) -> bool:
-        return self.legal_notes._allows_partial(candidate)  # type: ignore
+        # Any subset of a playable set of notes is playable too, so we can prune on it.
+        bitmask = candidate.voicing.bitmask
+        if self.require_playability:
+            return bitmask in self.playable_bitmasks
+        return bitmask & self.notes_bitmask == bitmask
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
-        return not self.require_pair or self.has_pair(candidate)
+        return True
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
         return 0
 
 
-# TODO requires pair -> requires playability
-# (twee- noten altijd goed, drie noten -> pair, vier noten -> twee pair, vijf+ -> nee)
+@cache
+def get_playable_bitmasks(ding: Note, ring: tuple[Note, ...]) -> frozenset[int]:
+    """Finds all sets of notes that are playable simultaneously on a hang.
+
+    Parameters
+    ----------
+    ding : Note
+        The note of the ding.
+    ring : tuple[Note, ...]
+        The notes in the ring, in order going around the ring.
+
+    Returns
+    -------
+    frozenset[int]
+        The `Voicing` bitmasks of all playable sets of notes, including the empty one.
+    """
+    note_bitmasks = {note.bitmask for note in (ding, *ring)}
+    pair_bitmasks = {
+        note1.bitmask | note2.bitmask
+        for note1, note2 in zip(ring, ring[1:] + ring[:1])
+        if note1 != note2
+    }
+
+    playable: set[int] = {0}
+    for nr_of_notes in (1, 2):
+        for notes in combinations(note_bitmasks, nr_of_notes):
+            playable.add(sum(notes))
+    for pair_bitmask in pair_bitmasks:
+        for note_bitmask in note_bitmasks:
+            if not note_bitmask & pair_bitmask:
+                playable.add(pair_bitmask | note_bitmask)
+    for pair_bitmask1, pair_bitmask2 in combinations(pair_bitmasks, 2):
+        if not pair_bitmask1 & pair_bitmask2:
+            playable.add(pair_bitmask1 | pair_bitmask2)
+
+    return frozenset(playable)
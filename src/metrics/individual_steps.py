@@ -1,7 +1,10 @@
+import numpy as np
+
 from src.exceptions import NoRefDistributionException
 from src.metrics.metric import *
+from src.my_types import boollist, floatlist, intlist
+from src.distribution import NOTES_BY_VALUE, Distribution, get_distributions
 from src.note import Note
-from src.distribution import Distribution
 
 
 class IndividualSteps(GeneratingMetric):
@@ -33,6 +36,12 @@ class IndividualSteps(GeneratingMetric):
     -------
     - The smaller the sum of the differences between the intervals between notes in `ref_distribution`
     and the corresponding notes in a candidate and `ideal_step`.
+
+    Notes
+    -----
+    In `setup`, the legality and the penalty of every possible `Note` value are precomputed per voice,
+    as arrays of shape (voices, 64). Candidates can be generated, checked and scored in their
+    columnar form: an integer array of shape (candidates, voices) holding `Note` values.
     """
 
     def __init__(
@@ -56,14 +65,29 @@ class IndividualSteps(GeneratingMetric):
 
     def setup(self, history: list[Distribution]) -> None:
         self.ref_distribution = self._get_ref_distribution(history, self.history_index)
+        if self.ref_distribution is None:
+            return
+
+        self.ref_values: intlist = np.array(
+            [note.value for note in self.ref_distribution], dtype=np.int64
+        )
+        distances = np.abs(np.arange(64) - self.ref_values[:, np.newaxis])
+        self.allowed_per_voice: boollist = (self.min_step <= distances) & (
+            distances <= self.max_step
+        )
+        self._allowed_per_voice_rows: list[list[bool]] = self.allowed_per_voice.tolist()
+        if self.ideal_step is not None:
+            self.penalty_per_voice: floatlist = np.abs(distances - self.ideal_step)
+            self._penalty_per_voice_rows: list[list[float]] = (
+                self.penalty_per_voice.tolist()
+            )
 
     def _allows_partial(self, candidate: Distribution) -> bool:
         if self.ref_distribution is None:
             return True
 
-        for ref_note, can_note in zip(self.ref_distribution, candidate):
-            d = self.distance(ref_note, can_note)
-            if not (self.min_step <= d <= self.max_step):
+        for allowed, can_note in zip(self._allowed_per_voice_rows, candidate):
+            if not allowed[can_note.value]:
                 return False
 
         return True
@@ -77,33 +101,116 @@ class IndividualSteps(GeneratingMetric):
 
         penalty = 0
 
-        for ref_note, can_note in zip(self.ref_distribution, candidate):
-            d = self.distance(ref_note, can_note)
-            penalty += abs(d - self.ideal_step)
+        for penalties, can_note in zip(self._penalty_per_voice_rows, candidate):
+            penalty += penalties[can_note.value]
 
         return 1 - penalty / len(candidate) / self.max_deviation
 
-    @classmethod
-    def distance(cls, ref_note: Note, can_note: Note) -> float:
-        return abs(can_note - ref_note)
+    def allows_array(self, values: intlist) -> boollist:
+        """Vectorized `_allows_partial` for complete candidates in columnar form.
 
-    def get_allowed(self) -> set[Distribution]:
+        Parameters
+        ----------
+        values : intlist
+            `Note` values of shape (candidates, voices).
+
+        Returns
+        -------
+        boollist
+            Per candidate, whether it's allowed.
+        """
+        if self.ref_distribution is None:
+            return np.ones(len(values), dtype=np.bool_)
+        voices = np.arange(values.shape[1])
+        return np.all(self.allowed_per_voice[voices, values], axis=1)
+
+    def score_array(self, values: intlist) -> floatlist:
+        """Vectorized `score_assuming_pruned` for complete candidates in columnar form.
+
+        Parameters
+        ----------
+        values : intlist
+            `Note` values of shape (candidates, voices), assumed to be legal.
+
+        Returns
+        -------
+        floatlist
+            The weighted score per candidate.
+        """
+        if self.ref_distribution is None or self.ideal_step is None:
+            return np.zeros(len(values))
+        voices = np.arange(values.shape[1])
+        penalties = np.sum(self.penalty_per_voice[voices, values], axis=1)
+        return (1 - penalties / values.shape[1] / self.max_deviation) * self.weight
+
+    def get_allowed_array(self) -> intlist:
+        """Generates all allowed candidates in columnar form.
+
+        Returns
+        -------
+        intlist
+            `Note` values of shape (candidates, voices), as int8.
+        """
         if self.ref_distribution is None:
             raise NoRefDistributionException
 
-        allowed: set[Distribution] = {Distribution([])}
-        for ref_note in self.ref_distribution:
-            new_allowed: set[Distribution] = set()
-            for partial_distribution in allowed:
-                for d in range(self.min_step, self.max_step + 1):
-                    new_note_up = ref_note + d
-                    new_allowed.add(partial_distribution + new_note_up)
+        nr_of_voices = len(self.ref_values)
+        if not nr_of_voices:
+            return np.zeros((1, 0), dtype=np.int8)
+
+        steps = np.arange(self.min_step, self.max_step + 1)
+        offsets = np.unique(np.concatenate((steps, -steps)))
+        offset_grid = np.meshgrid(*([offsets] * nr_of_voices), indexing="ij")
+        values = self.ref_values + np.stack(
+            [offsets_per_voice.ravel() for offsets_per_voice in offset_grid], axis=1
+        )
+        in_range = np.all((0 <= values) & (values < 64), axis=1)
 
-                    if d == 0:
-                        continue
+        return values[in_range].astype(np.int8)
 
-                    new_note_down = ref_note - d
-                    new_allowed.add(partial_distribution + new_note_down)
-            allowed = new_allowed
+    def get_allowed(self) -> set[Distribution]:
+        """Generates all allowed candidates.
+
+        The candidates are added to the set voice by voice, in the same order and through
+        intermediate sets of the same hashes as the original nested loops, so that the set
+        iterates in the same order, and seeded runs keep giving the same progressions.
+        Tuples of `Note`s stand in for the partial `Distribution`s, as they hash the same.
+
+        Returns
+        -------
+        set[Distribution]
+            All `Distribution`s with every `Note` within the legal steps of its voice.
+        """
+        if self.ref_distribution is None:
+            raise NoRefDistributionException
 
-        return allowed
+        offsets = [
+            offset
+            for d in range(self.min_step, self.max_step + 1)
+            for offset in ((d,) if d == 0 else (d, -d))
+        ]
+        notes_per_voice = [
+            [
+                NOTES_BY_VALUE[value + offset]
+                for offset in offsets
+                if 0 <= value + offset < 64
+            ]
+            for value in self.ref_values.tolist()
+        ]
+        if not notes_per_voice:
+            return {Distribution([])}
+
+        partials: set[tuple[Note, ...]] = {()}
+        for notes in notes_per_voice[:-1]:
+            partials = {partial + (note,) for partial in partials for note in notes}
+        return set(
+            get_distributions(
+                np.array(
+                    [
+                        [note.value for note in partial + (note,)]
+                        for partial in partials
+                        for note in notes_per_voice[-1]
+                    ]
+                )
+            )
+        )
@@ -1,6 +1,13 @@
-from itertools import pairwise
+import numpy as np
+
 from src.metrics.metric import Metric
 from src.distribution import Distribution
+from src.my_types import boollist, int64list, intlist
+from src.util import (
+    get_gap_range_64bit_bitmask,
+    get_gap_ranges_64bit_bitmasks,
+    get_popcounts_64bit_bitmasks,
+)
 
 
 class InternalIntervalRange(Metric):
@@ -17,6 +24,12 @@ class InternalIntervalRange(Metric):
     Enforces
     --------
     - Any interval between two adjacent notes (sorted) in a candidate to be within the legal range.
+
+    Notes
+    -----
+    The intervals are the gaps between consecutive set bits in the bitmask of the `Voicing`.
+    Duplicate `Note`s in a `Distribution` collapse in its `Voicing`, so they are accounted for
+    separately, as an internal interval of 0.
     """
 
     def __init__(self, min_internal: int, max_internal: int):
@@ -28,14 +41,47 @@ class InternalIntervalRange(Metric):
         pass
 
     def _allows_partial(self, candidate: Distribution) -> bool:
-        for note1, note2 in pairwise(sorted(candidate.notes)):
-            d = note2 - note1
-            if d < self.min_internal or d > self.max_internal:
-                return False
-        return True
+        voicing = candidate.voicing
+        if len(voicing) < len(candidate) and not (
+            self.min_internal <= 0 <= self.max_internal
+        ):
+            return False
+
+        gap_range = get_gap_range_64bit_bitmask(voicing.bitmask)
+        if gap_range is None:
+            return True
+        min_gap, max_gap = gap_range
+        return self.min_internal <= min_gap and max_gap <= self.max_internal
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
         return True
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
         return 0
+
+    def allows_voicing_bitmasks(
+        self, voicing_bitmasks: int64list, nr_of_notes: intlist | int | None = None
+    ) -> boollist:
+        """Vectorized `_allows_partial`, on the bitmasks of the `Voicing`s of the candidates.
+
+        Parameters
+        ----------
+        voicing_bitmasks : int64list
+            The bitmasks of the `Voicing`s of the candidates.
+        nr_of_notes : intlist | int | None, optional
+            The number of `Note`s per candidate, used for detecting duplicate `Note`s,
+            by default None for no duplicates.
+
+        Returns
+        -------
+        boollist
+            Per candidate, whether it's allowed.
+        """
+        min_gap, max_gap = get_gap_ranges_64bit_bitmasks(voicing_bitmasks)
+        allowed = (max_gap == 0) | (
+            (self.min_internal <= min_gap) & (max_gap <= self.max_internal)
+        )
+        if nr_of_notes is not None and not self.min_internal <= 0 <= self.max_internal:
+            popcounts = get_popcounts_64bit_bitmasks(voicing_bitmasks)
+            allowed &= popcounts >= np.asarray(nr_of_notes)
+        return allowed
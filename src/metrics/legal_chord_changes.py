@@ -3,6 +3,8 @@ from src.combination import Combination
 from src.cum_pattern import CumPattern
 from src.metrics.metric import Metric
 from src.distribution import Distribution
+from src.pitch_class import PitchClass
+from src.util import get_root_match_table, get_set_bit_indices
 
 
 class LegalChordChanges(Metric):
@@ -75,14 +77,16 @@ class LegalChordChanges(Metric):
     def get_allowed_combinations(
         self, history: list[Distribution]
     ) -> dict[Combination, float]:
-        last_combination = history[-1].combination
+        last_combination_bitmask = history[-1].combination.bitmask
 
         allowed: dict[Combination, float] = {}
         for cum, allowed_for_cum in self.scored_rules.items():
-            roots_for_matches = last_combination.match(cum)
-            for root in roots_for_matches:
+            roots_bitmask = get_root_match_table(cum.bitmask)[last_combination_bitmask]
+            for root in get_set_bit_indices(roots_bitmask):
                 for new_cum, shift, score in allowed_for_cum:
-                    combination = Combination.from_cum(root + shift, new_cum)
+                    combination = Combination.from_cum(
+                        PitchClass((root + shift) % 12), new_cum
+                    )
                     if combination not in allowed:
                         allowed[combination] = score
                         continue
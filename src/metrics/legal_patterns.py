@@ -3,6 +3,7 @@ from src.exceptions import WronglyAssumedLegalityException
 from src.metrics.metric import Metric
 from src.pattern import Pattern
 from src.distribution import Distribution
+from src.util import get_pattern_tables
 
 
 class LegalPatterns(Metric):
@@ -27,6 +28,12 @@ class LegalPatterns(Metric):
     Rewards
     -------
     - Based on set scores (1 by default).
+
+    Notes
+    -----
+    Using the shared pattern containment matrix, `fitting_per_pattern_id` lists per `Pattern` id
+    the sizes and scores of the legal patterns it fits in, in the order of `scored_legal_patterns`.
+    Checking a candidate then only involves its own `Pattern`, and the pc spread if needed.
     """
 
     def __init__(
@@ -51,20 +58,36 @@ class LegalPatterns(Metric):
 
         self.optimise_pc_spread = optimise_pc_spread
 
+        containment_matrix = get_pattern_tables().containment_matrix
+        self.fitting_per_pattern_id: list[list[tuple[int, float]]] = [
+            [] for _ in range(len(containment_matrix))
+        ]
+        for legal_pattern, score in self.scored_legal_patterns:
+            for pattern_id in containment_matrix[legal_pattern.id].nonzero()[0]:
+                self.fitting_per_pattern_id[pattern_id].append(
+                    (len(legal_pattern), score)
+                )
+
     def setup(self, history: list[Distribution]) -> None:
         pass
 
     def _allows_partial(self, candidate: Distribution) -> bool:
-        for legal_pattern, _ in self.scored_legal_patterns:
-            if candidate.fits(legal_pattern, self.optimise_pc_spread):
-                return True
-        return False
+        return self._get_fitting_score(candidate) is not None
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
         return True
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
-        for legal_pattern, score in self.scored_legal_patterns:
-            if candidate.fits(legal_pattern, self.optimise_pc_spread):
+        score = self._get_fitting_score(candidate)
+        if score is None:
+            raise WronglyAssumedLegalityException()
+        return score
+
+    def _get_fitting_score(self, candidate: Distribution) -> float | None:
+        # The score of the first legal pattern the candidate fits, if any.
+        for nr_of_pcs, score in self.fitting_per_pattern_id[candidate.pattern.id]:
+            if not self.optimise_pc_spread or candidate.has_optimal_pc_spread(
+                nr_of_pcs
+            ):
                 return score
-        raise WronglyAssumedLegalityException()
+        return None
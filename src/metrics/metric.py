@@ -4,7 +4,7 @@ from src.profiler import TimingMeta
 from src.distribution import Distribution
 
 
-class Metric(ABC):
+class Metric(ABC, metaclass=TimingMeta):
     """The blueprint of a metric used in the generation of distribution progressions.
 
     To Implement
@@ -38,10 +38,51 @@ class Metric(ABC):
 
     def __init__(self, weight: float):
         self.weight = weight
+        self._seen_history: list[Distribution] | None = None
+        self._seen_history_len = 0
+        self._seen_history_last: Distribution | None = None
 
     @abstractmethod
     def setup(self, history: list[Distribution]) -> None: ...
 
+    def _get_new_history(
+        self, history: list[Distribution]
+    ) -> list[Distribution] | None:
+        """Finds the `Distribution`s that were appended to `history` since the previous call.
+
+        Metrics that keep state between steps can use this in `setup` to update that state
+        incrementally, instead of recomputing it from the full history every step.
+
+        When `history` is the same list as in the previous call, it's assumed to have only
+        been appended to, as `StochasticDistributionEngine` does, which is checked in
+        constant time. Any other list is compared to the previous one up to its length.
+        As `Distribution`s can be interned, the latest one being the same object says
+        little about the rest of a different list.
+
+        Parameters
+        ----------
+        history : list[Distribution]
+            The history as passed to `setup`.
+
+        Returns
+        -------
+        list[Distribution] | None
+            The newly appended `Distribution`s, or `None` if `history` doesn't continue the
+            history seen in the previous call (e.g. after `StochasticDistributionEngine.reset`).
+        """
+        seen_history = self._seen_history
+        seen_len = self._seen_history_len
+        if seen_history is None or not 0 < seen_len <= len(history):
+            continues = False
+        elif history is seen_history:
+            continues = history[seen_len - 1] is self._seen_history_last
+        else:
+            continues = history[:seen_len] == seen_history[:seen_len]
+        self._seen_history = history
+        self._seen_history_len = len(history)
+        self._seen_history_last = history[-1] if history else None
+        return history[seen_len:] if continues else None
+
     def prune(self, candidates: set[Distribution]) -> set[Distribution]:
         pruned: set[Distribution] = set()
 
@@ -1,6 +1,9 @@
+import numpy as np
+
 from src.constants import INF
 from src.metrics.metric import Metric
 from src.distribution import Distribution
+from src.my_types import floatlist, intlist
 
 
 class NoCombinationReps(Metric):
@@ -9,11 +12,14 @@ class NoCombinationReps(Metric):
     Attributes
     ----------
     min_lookback : int
-        How far back in history to enforce no repetitions.
+        How far back in history to enforce no repetitions, at most `max_lookback`.
 
     max_lookback : int
         How far back in history to reward no repetitions.
 
+    last_seen : intlist
+        Per `Combination` bitmask, the index in history where it was last seen (-1 if never).
+
     Enforces
     --------
     - No repetitions within the latest `min_lookback` `Distribution`s.
@@ -29,36 +35,59 @@ class NoCombinationReps(Metric):
         super().__init__(weight)
         self.min_lookback = min_lookback
         self.max_lookback = max_lookback
+        self.last_seen: intlist = np.full(4096, -1, dtype=np.int64)
+        self.history_len = 0
 
     def setup(self, history: list[Distribution]) -> None:
-        self.actual_min_lookback = min(self.min_lookback, len(history))
+        new_history = self._get_new_history(history)
+        if new_history is None:
+            self.last_seen.fill(-1)
+            new_history = history[-self.max_lookback :]
+            self.history_len = len(history) - len(new_history)
+        for distribution in new_history:
+            self.last_seen[distribution.combination.bitmask] = self.history_len
+            self.history_len += 1
+
+        # Beyond `max_lookback`, nothing is enforced either.
+        self.actual_min_lookback = min(
+            self.min_lookback, self.max_lookback, len(history)
+        )
         self.actual_max_lookback = min(self.max_lookback, len(history))
-        combination_history = [
-            distribution.combination
-            for distribution in history[-self.actual_max_lookback :]
-        ]
-        self.reversed_combination_history = list(reversed(combination_history))
         if self.actual_max_lookback != self.actual_min_lookback:
             self.score_per_extra = 1 / (
                 self.actual_max_lookback - self.actual_min_lookback
             )
+        else:
+            self.score_per_extra = 0
 
     def _allows_partial(self, candidate: Distribution) -> bool:
         return True
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
-        return (
-            candidate.combination
-            not in self.reversed_combination_history[: self.actual_min_lookback]
-        )
+        steps_ago = self.history_len - self.last_seen[candidate.combination.bitmask]
+        return steps_ago > self.actual_min_lookback
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
-        score = 0
-        for combination in self.reversed_combination_history[
-            self.actual_min_lookback : self.actual_max_lookback
-        ]:
-            if combination == candidate.combination:
-                return score
-            score += self.score_per_extra
-
-        return score
+        steps_ago = self.history_len - self.last_seen[candidate.combination.bitmask]
+        nr_of_extras = min(steps_ago - 1, self.actual_max_lookback)
+        return float(nr_of_extras - self.actual_min_lookback) * self.score_per_extra
+
+    def score_combination_bitmasks(self, combination_bitmasks: intlist) -> floatlist:
+        """Scores a whole column of `Combination` bitmasks at once.
+
+        Parameters
+        ----------
+        combination_bitmasks : intlist
+            The bitmasks of the `Combination`s of the candidates.
+
+        Returns
+        -------
+        floatlist
+            What `score_assuming_pruned` would give per candidate, with NaN instead of `None`.
+        """
+        steps_ago = self.history_len - self.last_seen[combination_bitmasks]
+        nr_of_extras = np.minimum(steps_ago - 1, self.actual_max_lookback)
+        scores = (nr_of_extras - self.actual_min_lookback) * self.score_per_extra
+        return np.where(
+            steps_ago > self.actual_min_lookback, scores * self.weight, np.nan
+        )
@@ -1,5 +1,7 @@
 from src.metrics.metric import Metric
 from src.distribution import Distribution
+from src.my_types import boollist, int64list
+from src.util import get_span_64bit_bitmask, get_spans_64bit_bitmasks
 
 
 class WithinOctave(Metric):
@@ -17,10 +19,14 @@ class WithinOctave(Metric):
         pass
 
     def _allows_partial(self, candidate: Distribution) -> bool:
-        return max(candidate) - min(candidate) < 12
+        return get_span_64bit_bitmask(candidate.voicing.bitmask) < 12
 
     def _allows_complete_assuming_pruned(self, candidate: Distribution) -> bool:
         return True
 
     def _score_assuming_legal(self, candidate: Distribution) -> float:
         return 0
+
+    def allows_voicing_bitmasks(self, voicing_bitmasks: int64list) -> boollist:
+        """Vectorized `_allows_partial`, on the bitmasks of the `Voicing`s of the candidates."""
+        return get_spans_64bit_bitmasks(voicing_bitmasks) < 12
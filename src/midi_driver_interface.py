@@ -1,6 +1,4 @@
 import time
-import mido  # type: ignore
-from mido import Message  # type: ignore
 
 from src.distribution import Distribution
 from src.voicing import Voicing
@@ -11,9 +9,11 @@ DRIVER = "IAC Driver IN"
 
 def panic():
     """Sends note off events for all notes."""
-    output_port = mido.open_output(DRIVER)  # type: ignore
+    from mido import Message, open_output  # type: ignore
+
+    output_port = open_output(DRIVER)  # type: ignore
     for note in range(0, 90):
-        output_port.send(mido.Message("note_off", note=note))  # type: ignore
+        output_port.send(Message("note_off", note=note))  # type: ignore
     output_port.close()  # type: ignore
 
 
@@ -31,7 +31,9 @@ def play_chord(
     wake_up : bool, optional
         Whether to send a dummy note first, to wake up the driver, by default True
     """
-    output_port = mido.open_output(DRIVER)  # type: ignore
+    from mido import Message, open_output  # type: ignore
+
+    output_port = open_output(DRIVER)  # type: ignore
     if wake_up:
         output_port.send(Message("note_on", note=10, velocity=10))  # type: ignore
         time.sleep(0.2)
@@ -59,7 +61,9 @@ def play_melody(
     wake_up : bool, optional
         Whether to send a dummy note first, to wake up the driver, by default True
     """
-    output_port = mido.open_output(DRIVER)  # type: ignore
+    from mido import Message, open_output  # type: ignore
+
+    output_port = open_output(DRIVER)  # type: ignore
     panic()
     if durations is None:
         durations = [0.4] * len(notes)
@@ -72,7 +76,9 @@ def play_melody(
 
 def peep():
     """Sends a high note (E5) to the driver, lasting 0.3 seconds."""
-    output_port = mido.open_output(DRIVER)  # type: ignore
+    from mido import Message, open_output  # type: ignore
+
+    output_port = open_output(DRIVER)  # type: ignore
     output_port.send(Message("note_on", note=Ef5.midi_value, velocity=80))  # type: ignore
     time.sleep(0.3)
     output_port.send(Message("note_off", note=Ef5.midi_value, velocity=80))  # type: ignore
@@ -80,7 +86,9 @@ def peep():
 
 def poop():
     """Sends a low note (E2) to the driver, lasting 0.3 seconds."""
-    output_port = mido.open_output(DRIVER)  # type: ignore
+    from mido import Message, open_output  # type: ignore
+
+    output_port = open_output(DRIVER)  # type: ignore
     output_port.send(Message("note_on", note=Ef2.midi_value, velocity=80))  # type: ignore
     time.sleep(0.3)
     output_port.send(Message("note_off", note=Ef2.midi_value, velocity=80))  # type: ignore
@@ -1,43 +1,42 @@
 from typing import overload
 
 from math import log
+
 import numpy as np
 
 from src.constants import FREQ_ROOT
-from src.my_types import int64
+from src.my_types import floatlist, intlist
 from src.pitch_class import PitchClass
 from src.profiler import TimingMeta
 
 
 class Note(metaclass=TimingMeta):
-    """A `Note` represents one specific pitch, like C4."""
+    """A `Note` represents one specific pitch, like C4.
+
+    All 64 `Note`s are created once, at import, so that getting one never mutates
+    shared state, and there's only ever one instance per `Note`, also across threads.
+    """
 
     __slots__ = ("bitmask",)
 
-    bitmask: int64
+    bitmask: int
 
-    _instances: dict[int64, "Note"] = {}
+    _instances: dict[int, "Note"]
 
     def __new__(cls, value: int) -> "Note":
         assert 0 <= value < 64, "out of bounds"
-        bitmask = int64(1) << int64(value)
+        bitmask = 1 << value
         return cls.from_64bit_bitmask(bitmask)
 
     @classmethod
-    def from_64bit_bitmask(cls, bitmask: int64) -> "Note":
+    def from_64bit_bitmask(cls, bitmask: int) -> "Note":
         assert bitmask.bit_count() == 1, f"{bitmask.bit_count() = }"
-        return cls._get_or_create(bitmask)
+        assert not bitmask >> 64, "out of bounds"
+        return cls._get_instance(bitmask)
 
     @classmethod
-    def _get_or_create(cls, bitmask: int64) -> "Note":
-        if bitmask in cls._instances:
-            return cls._instances[bitmask]
-
-        instance = super().__new__(cls)
-        instance.bitmask = bitmask
-        cls._instances[bitmask] = instance
-
-        return instance
+    def _get_instance(cls, bitmask: int) -> "Note":
+        return cls._instances[bitmask]
 
     @classmethod
     def from_pc(cls, pc: PitchClass, degree: int) -> "Note":
@@ -47,7 +46,7 @@ class Note(metaclass=TimingMeta):
         >>> Note.from_pc(C, 3)
         C3
         """
-        bitmask = int64(pc.bitmask) << int64(degree * 12)
+        bitmask = pc.bitmask << (degree * 12)
         return Note.from_64bit_bitmask(bitmask)
 
     @classmethod
@@ -82,7 +81,7 @@ class Note(metaclass=TimingMeta):
         """
         at_least = cls.from_pc_at_least(pc, ref_note)
         at_most = cls.from_pc_at_most(pc, ref_note)
-        return min(at_least, at_most, key=lambda note: np.abs(note - ref_note))
+        return min(at_least, at_most, key=lambda note: abs(note - ref_note))
 
     @classmethod
     def from_pcs_closest_to(cls, pcs: list[PitchClass], ref_note: "Note") -> "Note":
@@ -93,7 +92,7 @@ class Note(metaclass=TimingMeta):
             at_most = cls.from_pc_at_most(pc, ref_note)
             options.append(at_least)
             options.append(at_most)
-        return min(options, key=lambda note: np.abs(note - ref_note))
+        return min(options, key=lambda note: abs(note - ref_note))
 
     @classmethod
     def from_str(cls, s: str) -> "Note":
@@ -120,9 +119,9 @@ class Note(metaclass=TimingMeta):
 
     def __lshift__(self, i: int) -> "Note":
         if i < 0:
-            bitmask = int64(self.bitmask << -i)
+            bitmask = self.bitmask << -i
         else:
-            bitmask = int64(self.bitmask >> i)
+            bitmask = self.bitmask >> i
         return Note.from_64bit_bitmask(bitmask)
 
     def __rshift__(self, i: int) -> "Note":
@@ -153,7 +152,7 @@ class Note(metaclass=TimingMeta):
 
     def __sub__(self, other: "Note | int") -> "Note | int":
         if isinstance(other, Note):
-            return int(self.value) - int(other.value)
+            return self.value - other.value
         else:  # int
             return self << other
 
@@ -161,13 +160,17 @@ class Note(metaclass=TimingMeta):
         return isinstance(other, Note) and self.bitmask == other.bitmask
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        # Re-interns on unpickling.
+        return (Note._get_instance, (self.bitmask,))
 
     def __gt__(self, other: "Note") -> bool:
-        return bool(self.value > other.value)
+        return self.value > other.value
 
     def __ge__(self, other: "Note") -> bool:
-        return bool(self.value >= other.value)
+        return self.value >= other.value
 
     @property
     def pc(self) -> PitchClass:
@@ -175,19 +178,73 @@ class Note(metaclass=TimingMeta):
 
     @property
     def degree(self) -> int:
-        return int(self.value) // 12
+        return self.value // 12
 
     @property
     def freq(self) -> float:
-        return 2 ** float(self.value / 12) * FREQ_ROOT
+        return NOTE_FREQS[self.value]
 
     @property
     def midi_value(self) -> int:
-        return int(self.value) + 24
+        return self.value + 24
 
     @property
-    def value(self) -> int64:
-        return int64(self.bitmask.item().bit_length() - 1)
+    def value(self) -> int:
+        return self.bitmask.bit_length() - 1
+
+
+def _create_all_notes() -> dict[int, Note]:
+    instances: dict[int, Note] = {}
+    for value in range(64):
+        instance = object.__new__(Note)
+        instance.bitmask = 1 << value
+        instances[instance.bitmask] = instance
+    return instances
+
+
+Note._instances = _create_all_notes()
+
+NOTE_FREQS: tuple[float, ...] = tuple(
+    2 ** (value / 12) * FREQ_ROOT for value in range(64)
+)
+_NOTE_FREQS_ARRAY: floatlist = np.array(NOTE_FREQS)
+_NOTE_FREQS_ARRAY.flags.writeable = False
+
+
+def note_values_to_freqs(note_values: intlist) -> floatlist:
+    """Vectorized `Note.freq`.
+
+    Parameters
+    ----------
+    note_values : intlist
+        `Note` values, of any shape.
+
+    Returns
+    -------
+    floatlist
+        The frequency per `Note` value, of the same shape.
+    """
+    return _NOTE_FREQS_ARRAY[note_values]
+
+
+def freqs_to_note_values(freqs: floatlist) -> tuple[intlist, floatlist]:
+    """Vectorized `Note.from_freq`, also giving how far off every frequency is.
+
+    Parameters
+    ----------
+    freqs : floatlist
+        Frequencies, of any shape.
+
+    Returns
+    -------
+    tuple[intlist, floatlist]
+        Per frequency the value of the closest `Note`, and its deviation from that `Note`
+        in cents (between -50 and 50). The values aren't checked to be in range.
+    """
+    exact_values = np.log2(np.asarray(freqs, dtype=np.float64) / FREQ_ROOT) * 12
+    note_values = np.rint(exact_values)
+    cents = (exact_values - note_values) * 100
+    return note_values.astype(np.int64), cents
 
 
 C0 = Note(0)
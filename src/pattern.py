@@ -1,11 +1,10 @@
-from functools import lru_cache
 from typing import Sequence
 
 from src.my_types import *
 from src.profiler import TimingMeta
 from src.util import (
     get_all_12bit_bitmask_rotations,
-    get_normal_form_12bit_bitmask,
+    get_pattern_tables,
     inner_intervals_to_cum_pattern_bitmask,
     shape_bitmask_and_offset_to_cum_pattern_bitmask,
 )
@@ -17,48 +16,45 @@ class Pattern(metaclass=TimingMeta):
 
     The concept of a major triad can be expressed as a `Pattern`.
     There's no distinction between the `Pattern` of ionian and lydian for example.
+
+    Every `Pattern` carries a dense `id` (0 to 351), indexing into the shared `PatternTables`
+    from `get_pattern_tables`, so that containment checks come down to a single lookup.
+
+    All 352 `Pattern`s are created once, at import, so that getting one never mutates
+    shared state, and there's only ever one instance per `Pattern`, also across threads.
     """
 
-    __slots__ = ("bitmask", "rotations")
+    __slots__ = ("_containment_row", "_inner_intervals", "bitmask", "id", "rotations")
 
-    bitmask: int16
-    rotations: int16list
+    bitmask: int
+    rotations: tuple[int, ...]
+    id: int
+    _containment_row: bytes
+    _inner_intervals: tuple[int, ...]
 
-    _instances: dict[int16, "Pattern"] = {}
+    _instances: tuple["Pattern", ...]
 
     def __new__(cls, intervals: Sequence[int]) -> "Pattern":
         assert (
             sum(intervals) % 12 == 0
         ), f"Intervals should sum to 0 (mod 12), {intervals = }"
         cum_pattern_bitmask = inner_intervals_to_cum_pattern_bitmask(intervals)
-        return cls._get_or_create(cum_pattern_bitmask)
+        return cls._get_instance(cum_pattern_bitmask)
 
     @classmethod
-    def _get_or_create(cls, bitmask: int16) -> "Pattern":
-        assert (
-            bitmask & int16(0xFFF) == bitmask
-        ), f"Bitmask {bitmask} is not 12 bits long."
-        if bitmask in cls._instances:
-            return cls._instances[bitmask]
-
-        instance = super().__new__(cls)
-        instance.bitmask = get_normal_form_12bit_bitmask(bitmask)
-        instance.rotations = get_all_12bit_bitmask_rotations(instance.bitmask)
-
-        for rotation in instance.rotations:
-            cls._instances[rotation] = instance
-
-        return instance
+    def _get_instance(cls, bitmask: int) -> "Pattern":
+        assert bitmask & 0xFFF == bitmask, f"Bitmask {bitmask} is not 12 bits long."
+        return cls._instances[bitmask]
 
     @classmethod
-    def from_12bit_bitmask(cls, input_bitmask: int16) -> "Pattern":
+    def from_12bit_bitmask(cls, input_bitmask: int) -> "Pattern":
         """Creates a `Pattern` from a 12-bit bitmask, which does not need to be in normal form.
 
         Such a bitmask could be representing a `CumPattern`, or a `Combination`.
 
         Parameters
         ----------
-        input_bitmask : int16
+        input_bitmask : int
             A 12-bit bitmask representing the pattern.
 
         Returns
@@ -67,19 +63,19 @@ class Pattern(metaclass=TimingMeta):
             The `Pattern` instance created from the input bitmask.
         """
         assert (
-            input_bitmask & int16(0xFFF) == input_bitmask
+            input_bitmask & 0xFFF == input_bitmask
         ), f"Bitmask {input_bitmask} is not 12 bits long."
-        return cls._get_or_create(input_bitmask)
+        return cls._get_instance(input_bitmask)
 
     @classmethod
-    def from_64bit_bitmask(cls, input_bitmask: int64) -> "Pattern":
+    def from_64bit_bitmask(cls, input_bitmask: int) -> "Pattern":
         """Creates a `Pattern` from a 64-bit bitmask.
 
         Such a bitmask could be representing a `Voicing` or a `Shape`.
 
         Parameters
         ----------
-        input_bitmask : int64
+        input_bitmask : int
             A 64-bit bitmask representing a `Voicing` or a `Shape`.
 
         Returns
@@ -88,13 +84,17 @@ class Pattern(metaclass=TimingMeta):
             The `Pattern` instance created from the input bitmask.
         """
         # Works for Voicing as well, because, since we're in Pattern
-        # we just need an arbitrary cum_pattern rotation for _get_or_create
+        # we just need an arbitrary cum_pattern rotation for _get_instance
         bitmask = shape_bitmask_and_offset_to_cum_pattern_bitmask(input_bitmask, 0)
 
-        return cls._get_or_create(bitmask)
+        return cls._get_instance(bitmask)
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        # Re-interns on unpickling.
+        return (Pattern._get_instance, (self.bitmask,))
 
     def __len__(self) -> int:
         return self.bitmask.bit_count()
@@ -103,27 +103,16 @@ class Pattern(metaclass=TimingMeta):
         if self in PATTERN_NAMES:
             return PATTERN_NAMES[self]
 
-        return f"Pattern({self.inner_intervals})"
+        return f"Pattern({list(self.inner_intervals)})"
 
     def __repr__(self) -> str:
         return str(self)
 
     @property
-    def inner_intervals(self) -> list[int]:
+    def inner_intervals(self) -> tuple[int, ...]:
         """Returns the inner intervals of the pattern, always summing to 12."""
-        inner_intervals: list[int] = []
-
-        pos: int | None = None
-        for i in range(12):
-            if self.bitmask & (int16(1) << int16(i)):
-                if pos is not None:
-                    inner_intervals.append((i - pos) % 12)
-                pos = i
-        if pos is not None:
-            inner_intervals.append(12 - pos % 12)
-        return inner_intervals
-
-    @lru_cache
+        return self._inner_intervals
+
     def __contains__(self, other: "Pattern") -> bool:
         """
         Examples
@@ -137,11 +126,54 @@ class Pattern(metaclass=TimingMeta):
         >>> DIM.pattern in M7.pattern
         False
         """
-        for rotation in other.rotations:
-            if (self.bitmask & rotation) == rotation:
-                return True
-        return False
+        return bool(self._containment_row[other.id])
 
+    def contains_12bit_bitmask(self, bitmask: int) -> bool:
+        """Checks whether the `Pattern` of a 12-bit bitmask fits in this `Pattern`,
+        without creating that `Pattern`.
+
+        Parameters
+        ----------
+        bitmask : int
+            A 12-bit bitmask, typically of a `Combination`.
+
+        Returns
+        -------
+        bool
+            Whether some rotation of `bitmask` is a subset of this `Pattern`.
+        """
+        return bool(self._containment_row[get_pattern_tables().ids[bitmask]])
+
+
+def _get_inner_intervals(bitmask: int) -> tuple[int, ...]:
+    inner_intervals: list[int] = []
+
+    pos: int | None = None
+    for i in range(12):
+        if bitmask & (1 << i):
+            if pos is not None:
+                inner_intervals.append((i - pos) % 12)
+            pos = i
+    if pos is not None:
+        inner_intervals.append(12 - pos % 12)
+    return tuple(inner_intervals)
+
+
+def _create_all_patterns() -> tuple[Pattern, ...]:
+    pattern_tables = get_pattern_tables()
+    patterns: list[Pattern] = []
+    for pattern_id, bitmask in enumerate(pattern_tables.normal_forms):
+        instance = object.__new__(Pattern)
+        instance.bitmask = bitmask
+        instance.rotations = get_all_12bit_bitmask_rotations(bitmask)
+        instance.id = pattern_id
+        instance._containment_row = pattern_tables.containment_rows[pattern_id]
+        instance._inner_intervals = _get_inner_intervals(bitmask)
+        patterns.append(instance)
+    return tuple(patterns[pattern_id] for pattern_id in pattern_tables.ids)
+
+
+Pattern._instances = _create_all_patterns()
 
 MARY = Pattern([4, 3, 5])
 MINNY = Pattern([3, 4, 5])
@@ -1,6 +1,5 @@
 from typing import overload
 
-from src.my_types import int16, int64
 from src.profiler import TimingMeta
 from src.util import (
     is_12bit,
@@ -13,37 +12,33 @@ class PitchClass(metaclass=TimingMeta):
     """A `PitchClass` represents a class of notes that are spaced apart by octaves.
 
     The concept of C can be expressed as a `PitchClass`.
+
+    All 12 `PitchClass`es are created once, at import, so that getting one never mutates
+    shared state, and there's only ever one instance per `PitchClass`, also across threads.
     """
 
     __slots__ = ("bitmask",)
 
-    bitmask: int16
+    bitmask: int
 
-    _instances: dict[int16, "PitchClass"] = {}
+    _instances: dict[int, "PitchClass"]
 
-    def __new__(cls, value: int | int16 | int64):
-        bitmask = int16(1) << int16(value % 12)
+    def __new__(cls, value: int):
+        bitmask = 1 << (value % 12)
         return cls._from_12bit_bitmask(bitmask)
 
     @classmethod
-    def _from_12bit_bitmask(cls, bitmask: int16) -> "PitchClass":
+    def _from_12bit_bitmask(cls, bitmask: int) -> "PitchClass":
         assert is_12bit(bitmask), f"{bitmask = }"
         assert bitmask.bit_count() == 1, f"{bitmask.bit_count() = }"
-        return cls._get_or_create(bitmask)
+        return cls._get_instance(bitmask)
 
     @classmethod
-    def _get_or_create(cls, bitmask: int16) -> "PitchClass":
-        if bitmask in cls._instances:
-            return cls._instances[bitmask]
-
-        instance = super().__new__(cls)
-        instance.bitmask = bitmask
-        cls._instances[bitmask] = instance
-
-        return instance
+    def _get_instance(cls, bitmask: int) -> "PitchClass":
+        return cls._instances[bitmask]
 
     @classmethod
-    def from_note_bitmask(cls, note_bitmask: int64) -> "PitchClass":
+    def from_note_bitmask(cls, note_bitmask: int) -> "PitchClass":
         bitmask = note_bitmask_to_pitch_class_bitmask(note_bitmask)
         return PitchClass._from_12bit_bitmask(bitmask)
 
@@ -105,18 +100,33 @@ class PitchClass(metaclass=TimingMeta):
         if isinstance(other, PitchClass):
             return (self.value - other.value) % 12
         else:  # int
-            return PitchClass(int(self.value) - other)
+            return PitchClass(self.value - other)
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, PitchClass) and self.bitmask == other.bitmask
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        # Re-interns on unpickling.
+        return (PitchClass._get_instance, (self.bitmask,))
 
     @property
-    def value(self) -> int16:
-        return int16(self.bitmask.item().bit_length() - 1)
+    def value(self) -> int:
+        return self.bitmask.bit_length() - 1
+
+
+def _create_all_pcs() -> dict[int, PitchClass]:
+    instances: dict[int, PitchClass] = {}
+    for value in range(12):
+        instance = object.__new__(PitchClass)
+        instance.bitmask = 1 << value
+        instances[instance.bitmask] = instance
+    return instances
+
 
+PitchClass._instances = _create_all_pcs()
 
 C = PitchClass(0)
 Cs = PitchClass(1)
@@ -151,7 +161,7 @@ PC_NAMES = {
     B: "B",
 }
 
-ALL_PCS = list(sorted(PC_NAMES.keys(), key=lambda pc: int(pc.bitmask)))
+ALL_PCS = list(sorted(PC_NAMES.keys(), key=lambda pc: pc.bitmask))
 
 ALTERNATIVE_PC_NAMES = {
     Cs: "C#",
@@ -1,8 +1,15 @@
+import json
+import math
+import os
+import sys
+import threading
 from abc import ABCMeta
-from time import perf_counter
-from functools import wraps
 from collections import defaultdict
-from typing import Callable, Any, TypeVar, cast
+from collections.abc import Callable, Iterable
+from functools import wraps
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import Any, NamedTuple, TypeVar, cast
 
 T = TypeVar("T", bound=Callable[..., Any])
 C = TypeVar("C", bound=type)
@@ -11,6 +18,163 @@ class_timings: dict[type, dict[str, tuple[float, int]]] = defaultdict(
     dict[str, tuple[float, int]]
 )
 
+# Set to anything but "" or "0" to instrument all `TimingMeta` classes from the start.
+PROFILING_ENV_VAR = "CHORDS_PROFILING"
+
+_profiling_enabled = os.environ.get(PROFILING_ENV_VAR, "") not in ("", "0")
+
+# Every class created by `TimingMeta`, so that they can be instrumented later on.
+_timed_classes: list[type] = []
+
+# Per instrumented class, the original (unwrapped) attributes.
+_original_methods: dict[type, dict[str, Any]] = {}
+
+DEFAULT_BUCKETS_PER_OCTAVE = 8
+
+_buckets_per_octave = DEFAULT_BUCKETS_PER_OCTAVE
+
+
+class LatencyHistogram:
+    """Counts durations in logarithmic buckets, to estimate percentiles cheaply.
+
+    Bucket `i` holds the durations `d` with `i <= log2(d in ns) * buckets_per_octave < i + 1`,
+    so percentiles are accurate up to a factor `2 ** (1 / buckets_per_octave)`,
+    regardless of the number of recorded durations.
+
+    Attributes
+    ----------
+    buckets_per_octave : int
+        The resolution: the number of buckets per doubling of the duration.
+    counts : dict[int, int]
+        The number of durations per (non-empty) bucket.
+    count : int
+        The total number of durations.
+    total : float
+        The sum of the durations, in seconds.
+    max : float
+        The longest duration, in seconds.
+    """
+
+    __slots__ = ("buckets_per_octave", "count", "counts", "max", "total")
+
+    def __init__(self, buckets_per_octave: int = DEFAULT_BUCKETS_PER_OCTAVE):
+        self.buckets_per_octave = buckets_per_octave
+        self.counts: dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        if duration > 1e-9:
+            bucket = int(math.log2(duration * 1e9) * self.buckets_per_octave)
+        else:
+            bucket = 0
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def percentile(self, p: float) -> float:
+        """Estimates the duration below which `p` percent of the durations fall.
+
+        Parameters
+        ----------
+        p : float
+            The percentage, between 0 and 100.
+
+        Returns
+        -------
+        float
+            The upper bound of the bucket the percentile falls in (capped at `max`),
+            in seconds, 0 if nothing was recorded.
+        """
+        target = self.count * p / 100
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                upper_bound = 2 ** ((bucket + 1) / self.buckets_per_octave) / 1e9
+                return min(upper_bound, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """The count, total, mean, p50, p90, p99 and max, with durations in seconds."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds the durations recorded in `other` to this histogram.
+
+        Raises
+        ------
+        ValueError
+            If `other` has a different resolution.
+        """
+        if other.buckets_per_octave != self.buckets_per_octave:
+            raise ValueError(
+                f"can't merge a histogram with {other.buckets_per_octave} buckets per octave "
+                f"into one with {self.buckets_per_octave}"
+            )
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+
+class_histograms: dict[type, dict[str, LatencyHistogram]] = defaultdict(
+    dict[str, LatencyHistogram]
+)
+
+
+class Span(NamedTuple):
+    """A single call of an instrumented method, as a node in the call tree.
+
+    Attributes
+    ----------
+    name : str
+        The qualified name of the method, like "Pattern.__contains__".
+    start : float
+        The `perf_counter` time at which the call started, in seconds.
+    duration : float
+        The duration of the call, in seconds, including the calls it made.
+    parent : int
+        The index in `recorded_spans` of the call this call was made from, -1 if none.
+    thread_id : int
+        The identifier of the thread the call was made in.
+    """
+
+    name: str
+    start: float
+    duration: float
+    parent: int
+    thread_id: int
+
+
+_recording_spans = False
+
+# About 200 MB worth of `Span`s, which takes a few seconds of instrumented calls.
+DEFAULT_MAX_SPANS = 1_000_000
+
+_max_spans: int | None = DEFAULT_MAX_SPANS
+
+# Every `Span` recorded, in order of starting time (per thread), so parents precede children.
+# It stops growing at `_max_spans`, see `enable_profiling`.
+recorded_spans: list[Span | None] = []
+
+# Guards reserving an index in `recorded_spans`, which threads do concurrently.
+_recorded_spans_lock = threading.Lock()
+
+# Per thread, the indices in `recorded_spans` of the calls currently being made.
+_span_stacks = threading.local()
+
 
 def timed_method(cls: type) -> Callable[[T], T]:
     """Decorator factory that instruments a method of a class
@@ -29,20 +193,20 @@ def timed_method(cls: type) -> Callable[[T], T]:
     Notes
     -----
     This is intended for use with `TimingMeta`, which applies the decorator
-    automatically to all non-special methods of a class.
+    automatically to all methods of a class, if profiling is enabled.
     """
 
     def decorator(method: T) -> T:
+        span_name = f"{cls.__name__}.{method.__name__}"
+
         @wraps(method)
-        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _recording_spans:
+                return _call_recording_span(cls, span_name, method, *args, **kwargs)
             start = perf_counter()
-            result = method(self, *args, **kwargs)
+            result = method(*args, **kwargs)
             duration = perf_counter() - start
-            method_name = method.__name__
-            if method_name not in class_timings[cls]:
-                class_timings[cls][method_name] = (0, 0)
-            time, count = class_timings[cls][method_name]
-            class_timings[cls][method_name] = (time + duration, count + 1)
+            _record_timing(cls, method.__name__, duration)
             return result
 
         return cast(T, wrapper)
@@ -50,9 +214,57 @@ def timed_method(cls: type) -> Callable[[T], T]:
     return decorator
 
 
+def _record_timing(cls: type, method_name: str, duration: float) -> None:
+    if method_name not in class_timings[cls]:
+        class_timings[cls][method_name] = (0, 0)
+        class_histograms[cls][method_name] = LatencyHistogram(_buckets_per_octave)
+    time, count = class_timings[cls][method_name]
+    class_timings[cls][method_name] = (time + duration, count + 1)
+    class_histograms[cls][method_name].record(duration)
+
+
+def _call_recording_span(
+    cls: type, span_name: str, method: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    stack: list[int] | None = getattr(_span_stacks, "stack", None)
+    if stack is None:
+        stack = _span_stacks.stack = []
+    parent = stack[-1] if stack else -1
+    with _recorded_spans_lock:
+        index = len(recorded_spans)
+        if _max_spans is not None and index >= _max_spans:
+            index = -1
+        else:
+            recorded_spans.append(
+                None
+            )  # Reserved, so that the parent precedes its children.
+    if index == -1:
+        start = perf_counter()
+        result = method(*args, **kwargs)
+        _record_timing(cls, method.__name__, perf_counter() - start)
+        return result
+    stack.append(index)
+
+    start = perf_counter()
+    try:
+        return method(*args, **kwargs)
+    finally:
+        duration = perf_counter() - start
+        stack.pop()
+        recorded_spans[index] = Span(
+            span_name, start, duration, parent, threading.get_ident()
+        )
+        _record_timing(cls, method.__name__, duration)
+
+
 class TimingMeta(ABCMeta):
     """Metaclass that automatically applies the `timed_method` decorator
-    to all callable attributes (excluding special methods) of a class.
+    to all callable attributes (including special methods) of a class,
+    if profiling is enabled.
+
+    Profiling is disabled by default, in which case the class is left untouched
+    and calls carry no overhead at all. It's enabled by setting the environment variable
+    `CHORDS_PROFILING` (before importing), or by calling `enable_profiling()`.
 
     Usage
     -----
@@ -60,7 +272,8 @@ class TimingMeta(ABCMeta):
         def slow_function(self):
             ...
 
-    After running some methods, call `report_timings()` to see durations.
+    After calling `enable_profiling()` and running some methods, call `report_timings()`
+    to see durations.
     """
 
     def __new__(
@@ -70,13 +283,97 @@ class TimingMeta(ABCMeta):
         namespace: dict[str, Any],
     ) -> type:
         cls = super().__new__(mcs, name, bases, namespace)
-        for attr_name, attr_value in namespace.items():
-            if callable(attr_value):  # and not attr_name.startswith("__"):
-                wrapped = timed_method(cls)(attr_value)
-                setattr(cls, attr_name, wrapped)
+        _timed_classes.append(cls)
+        if _profiling_enabled:
+            instrument_class(cls)
         return cls
 
 
+def instrument_class(cls: C) -> C:
+    """Applies the `timed_method` decorator to all callable attributes defined in `cls`.
+
+    Works for any class, also ones that were already imported, and doesn't need `TimingMeta`.
+    Instrumenting an already instrumented class does nothing.
+
+    Parameters
+    ----------
+    cls : C
+        The class to instrument.
+
+    Returns
+    -------
+    C
+        The same class, so that this can be used as a class decorator.
+    """
+    if cls in _original_methods:
+        return cls
+
+    originals: dict[str, Any] = {}
+    for attr_name, attr_value in list(vars(cls).items()):
+        if isinstance(attr_value, staticmethod):
+            # Also covers `__new__`, which is turned into a staticmethod implicitly.
+            wrapped = staticmethod(timed_method(cls)(attr_value.__func__))
+        elif callable(attr_value) and not isinstance(attr_value, type):
+            wrapped = timed_method(cls)(attr_value)
+        else:
+            continue
+        originals[attr_name] = attr_value
+        setattr(cls, attr_name, wrapped)
+    _original_methods[cls] = originals
+    return cls
+
+
+def uninstrument_class(cls: type) -> None:
+    """Restores the original attributes of a class instrumented by `instrument_class`."""
+    originals = _original_methods.pop(cls, {})
+    for attr_name, attr_value in originals.items():
+        setattr(cls, attr_name, attr_value)
+
+
+def enable_profiling(
+    record_spans: bool = False,
+    buckets_per_octave: int = DEFAULT_BUCKETS_PER_OCTAVE,
+    max_spans: int | None = DEFAULT_MAX_SPANS,
+) -> None:
+    """Instruments all `TimingMeta` classes, including the ones created later on.
+
+    Parameters
+    ----------
+    record_spans : bool, optional
+        Whether to also record every call as a `Span` in `recorded_spans`, to be able to
+        see the call tree, by default False. See `export_chrome_trace`, `export_speedscope`
+        and `export_collapsed_stacks`.
+        Every call adds a `Span`, so this takes memory proportional to the number of calls.
+    buckets_per_octave : int, optional
+        The resolution of the `LatencyHistogram`s of methods that weren't timed yet,
+        by default `DEFAULT_BUCKETS_PER_OCTAVE`.
+    max_spans : int | None, optional
+        The maximum length of `recorded_spans`, None for unbounded,
+        by default `DEFAULT_MAX_SPANS`. Once reached, calls are still timed,
+        but not recorded as `Span`s, until `clear_spans` is called.
+    """
+    global _profiling_enabled, _recording_spans, _buckets_per_octave, _max_spans
+    _profiling_enabled = True
+    _recording_spans = record_spans
+    _buckets_per_octave = buckets_per_octave
+    _max_spans = max_spans
+    for cls in _timed_classes:
+        instrument_class(cls)
+
+
+def disable_profiling() -> None:
+    """Removes the instrumentation from all instrumented classes, leaving no overhead."""
+    global _profiling_enabled, _recording_spans
+    _profiling_enabled = False
+    _recording_spans = False
+    for cls in list(_original_methods):
+        uninstrument_class(cls)
+
+
+def is_profiling_enabled() -> bool:
+    return _profiling_enabled
+
+
 def report_timings() -> None:
     """Prints a timing report of all methods instrumented by `TimingMeta`.
 
@@ -84,6 +381,7 @@ def report_timings() -> None:
     -------
     - Execution time per method grouped by class
     - Total execution time
+    - Tail latencies per method (p50, p99 and max)
 
     After reporting, the stored timing data is cleared.
     """
@@ -96,4 +394,544 @@ def report_timings() -> None:
             print(
                 f"    {k}: {time:.6f} seconds, called {count} times. Time per call: {time/count:.8f}"
             )
+            histogram = class_histograms[cls].get(k)
+            if histogram is not None:
+                print(
+                    f"        p50: {histogram.percentile(50):.8f}, "
+                    f"p99: {histogram.percentile(99):.8f}, max: {histogram.max:.8f}"
+                )
+    clear_timings()
+
+
+def get_timing_report() -> dict[str, dict[str, dict[str, float]]]:
+    """Gives the data of `report_timings` in a structured form, without clearing it.
+
+    Returns
+    -------
+    dict[str, dict[str, dict[str, float]]]
+        Per class name, per method name, the `LatencyHistogram.summary`:
+        the count, total, mean, p50, p90, p99 and max, with durations in seconds.
+    """
+    return {
+        cls.__name__: {
+            method_name: histogram.summary()
+            for method_name, histogram in histograms.items()
+        }
+        for cls, histograms in class_histograms.items()
+    }
+
+
+def export_timing_report(path: str) -> None:
+    """Writes `get_timing_report` to a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file to write.
+    """
+    with open(path, "w") as f:
+        json.dump(get_timing_report(), f, indent=2)
+
+
+def clear_timings() -> None:
     class_timings.clear()
+    class_histograms.clear()
+
+
+class TimingSnapshot(NamedTuple):
+    """The timing data of a single process, keyed by class name, so that it can be pickled
+    and sent to another process, e.g. as (part of) the result of a `ProcessPoolExecutor` task.
+
+    Attributes
+    ----------
+    worker : str
+        A label for the process the data comes from.
+    timings : dict[str, dict[str, tuple[float, int]]]
+        Per class name, per method name, the total time and the number of calls,
+        like `class_timings`.
+    histograms : dict[str, dict[str, LatencyHistogram]]
+        Per class name, per method name, the `LatencyHistogram`, like `class_histograms`.
+    """
+
+    worker: str
+    timings: dict[str, dict[str, tuple[float, int]]]
+    histograms: dict[str, dict[str, LatencyHistogram]]
+
+
+def take_snapshot(worker: str | None = None, clear: bool = True) -> TimingSnapshot:
+    """Captures the timing data of this process, to ship it to the parent process.
+
+    Parameters
+    ----------
+    worker : str | None, optional
+        A label for this process, by default based on its process id.
+    clear : bool, optional
+        Whether to clear the timing data afterwards, by default True, so that taking
+        a snapshot after every task doesn't count the earlier tasks twice.
+
+    Returns
+    -------
+    TimingSnapshot
+        The timing data, to be merged with `merge_snapshots`.
+    """
+    # Merging copies the histograms, and combines classes with the same name.
+    snapshot = merge_snapshots(
+        (
+            TimingSnapshot(
+                "",
+                {cls.__name__: method_timings},
+                {cls.__name__: class_histograms[cls]},
+            )
+            for cls, method_timings in class_timings.items()
+        ),
+        f"pid {os.getpid()}" if worker is None else worker,
+    )
+    if clear:
+        clear_timings()
+    return snapshot
+
+
+def merge_snapshots(
+    snapshots: Iterable[TimingSnapshot], worker: str = "all"
+) -> TimingSnapshot:
+    """Combines `TimingSnapshot`s, e.g. of all workers, or of all tasks of a worker.
+
+    Parameters
+    ----------
+    snapshots : Iterable[TimingSnapshot]
+        The snapshots to combine. Histograms need to have the same resolution.
+    worker : str, optional
+        The label of the combined snapshot, by default "all".
+
+    Returns
+    -------
+    TimingSnapshot
+        The summed timings and merged histograms.
+    """
+    timings: dict[str, dict[str, tuple[float, int]]] = defaultdict(dict)
+    histograms: dict[str, dict[str, LatencyHistogram]] = defaultdict(dict)
+    for snapshot in snapshots:
+        for cls_name, method_timings in snapshot.timings.items():
+            for method_name, (time, count) in method_timings.items():
+                total_time, total_count = timings[cls_name].get(method_name, (0, 0))
+                timings[cls_name][method_name] = (
+                    time + total_time,
+                    count + total_count,
+                )
+        for cls_name, method_histograms in snapshot.histograms.items():
+            for method_name, histogram in method_histograms.items():
+                if method_name not in histograms[cls_name]:
+                    histograms[cls_name][method_name] = LatencyHistogram(
+                        histogram.buckets_per_octave
+                    )
+                histograms[cls_name][method_name].merge(histogram)
+    return TimingSnapshot(worker, dict(timings), dict(histograms))
+
+
+def get_merged_timing_report(
+    snapshots: Iterable[TimingSnapshot],
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Gives the data of `get_timing_report` for all snapshots together,
+    with a breakdown per worker.
+
+    Parameters
+    ----------
+    snapshots : Iterable[TimingSnapshot]
+        The snapshots of the workers. Snapshots with the same worker label are combined.
+
+    Returns
+    -------
+    dict[str, dict[str, dict[str, Any]]]
+        Per class name, per method name, the `LatencyHistogram.summary` of all workers
+        together, with under "per_worker" the summary per worker label.
+    """
+    snapshots_per_worker: dict[str, list[TimingSnapshot]] = defaultdict(list)
+    for snapshot in snapshots:
+        snapshots_per_worker[snapshot.worker].append(snapshot)
+    worker_snapshots = [
+        merge_snapshots(worker_snapshots, worker)
+        for worker, worker_snapshots in snapshots_per_worker.items()
+    ]
+    merged = merge_snapshots(worker_snapshots)
+
+    report: dict[str, dict[str, dict[str, Any]]] = {}
+    for cls_name, method_timings in merged.timings.items():
+        report[cls_name] = {}
+        for method_name in method_timings:
+            per_worker = {
+                snapshot.worker: _summarize(snapshot, cls_name, method_name)
+                for snapshot in worker_snapshots
+                if method_name in snapshot.timings.get(cls_name, {})
+            }
+            report[cls_name][method_name] = {
+                **_summarize(merged, cls_name, method_name),
+                "per_worker": per_worker,
+            }
+    return report
+
+
+def _summarize(
+    snapshot: TimingSnapshot, cls_name: str, method_name: str
+) -> dict[str, float]:
+    histogram = snapshot.histograms.get(cls_name, {}).get(method_name)
+    if histogram is not None:
+        return histogram.summary()
+    time, count = snapshot.timings[cls_name][method_name]
+    return {"count": count, "total": time, "mean": time / count if count else 0.0}
+
+
+def report_merged_timings(snapshots: Iterable[TimingSnapshot]) -> None:
+    """Prints a timing report like `report_timings` for all snapshots together,
+    with the total time and number of calls per worker below every method.
+
+    Parameters
+    ----------
+    snapshots : Iterable[TimingSnapshot]
+        The snapshots of the workers.
+    """
+    report = get_merged_timing_report(snapshots)
+    print("\nMerged Timing Report:")
+    for cls_name, methods in sorted(
+        report.items(), key=lambda x: -sum(m["total"] for m in x[1].values())
+    ):
+        print(f"{cls_name}:")
+        for method_name, summary in sorted(
+            methods.items(), key=lambda x: -x[1]["total"]
+        ):
+            time, count = summary["total"], summary["count"]
+            print(
+                f"    {method_name}: {time:.6f} seconds, called {count} times. Time per call: {time/count:.8f}"
+            )
+            if "p50" in summary:
+                print(
+                    f"        p50: {summary['p50']:.8f}, "
+                    f"p99: {summary['p99']:.8f}, max: {summary['max']:.8f}"
+                )
+            for worker, worker_summary in sorted(summary["per_worker"].items()):
+                print(
+                    f"        {worker}: {worker_summary['total']:.6f} seconds, "
+                    f"called {worker_summary['count']} times"
+                )
+
+
+def _get_finished_spans() -> list[Span]:
+    return [span for span in recorded_spans if span is not None]
+
+
+def export_chrome_trace(path: str) -> None:
+    """Writes `recorded_spans` to a file in the Chrome Trace Event format,
+    to be opened in chrome://tracing or https://ui.perfetto.dev.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file to write.
+    """
+    pid = os.getpid()
+    trace_events = [
+        {
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": span.start * 1e6,
+            "dur": span.duration * 1e6,
+            "pid": pid,
+            "tid": span.thread_id,
+        }
+        for span in _get_finished_spans()
+    ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def export_speedscope(path: str) -> None:
+    """Writes `recorded_spans` to a file in the speedscope format, one profile per thread,
+    to be opened in https://www.speedscope.app.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file to write.
+    """
+    frame_indices: dict[str, int] = {}
+    events_per_thread: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    open_spans_per_thread: dict[int, list[int]] = defaultdict(list)
+
+    def close(thread_id: int) -> None:
+        span = cast(Span, recorded_spans[open_spans_per_thread[thread_id].pop()])
+        events_per_thread[thread_id].append(
+            {
+                "type": "C",
+                "frame": frame_indices[span.name],
+                "at": span.start + span.duration,
+            }
+        )
+
+    for index, span in enumerate(recorded_spans):
+        if span is None:
+            continue
+        open_spans = open_spans_per_thread[span.thread_id]
+        while open_spans and open_spans[-1] != span.parent:
+            close(span.thread_id)
+        frame_index = frame_indices.setdefault(span.name, len(frame_indices))
+        events_per_thread[span.thread_id].append(
+            {"type": "O", "frame": frame_index, "at": span.start}
+        )
+        open_spans.append(index)
+    for thread_id, open_spans in open_spans_per_thread.items():
+        while open_spans:
+            close(thread_id)
+
+    profiles = [
+        {
+            "type": "evented",
+            "name": f"thread {thread_id}",
+            "unit": "seconds",
+            "startValue": events[0]["at"],
+            "endValue": events[-1]["at"],
+            "events": events,
+        }
+        for thread_id, events in events_per_thread.items()
+    ]
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "$schema": "https://www.speedscope.app/file-format-schema.json",
+                "shared": {"frames": [{"name": name} for name in frame_indices]},
+                "profiles": profiles,
+            },
+            f,
+        )
+
+
+def get_collapsed_stacks() -> dict[str, float]:
+    """Aggregates `recorded_spans` per call stack, like "get_next;prune;__contains__".
+
+    Returns
+    -------
+    dict[str, float]
+        Per call stack (names separated by ";", outermost first), the total self time
+        in seconds, i.e. excluding the time spent in the instrumented calls it made.
+    """
+    stacks: dict[int, str] = {}
+    self_times: dict[int, float] = {}
+    for index, span in enumerate(recorded_spans):
+        if span is None:
+            continue
+        parent_stack = stacks.get(span.parent)
+        stacks[index] = (
+            span.name if parent_stack is None else f"{parent_stack};{span.name}"
+        )
+        self_times[index] = span.duration
+        if span.parent in self_times:
+            self_times[span.parent] -= span.duration
+
+    collapsed: dict[str, float] = defaultdict(float)
+    for index, stack in stacks.items():
+        collapsed[stack] += self_times[index]
+    return dict(collapsed)
+
+
+def export_collapsed_stacks(path: str) -> None:
+    """Writes `recorded_spans` to a file in the collapsed stack format, with self times
+    in microseconds, to be turned into a flamegraph by e.g. flamegraph.pl or speedscope.
+
+    Parameters
+    ----------
+    path : str
+        The path of the text file to write.
+    """
+    with open(path, "w") as f:
+        f.writelines(
+            f"{stack} {round(self_time * 1e6)}\n"
+            for stack, self_time in sorted(get_collapsed_stacks().items())
+        )
+
+
+def clear_spans() -> None:
+    """Forgets all `recorded_spans`, e.g. to only export the next `get_next` call."""
+    recorded_spans.clear()
+
+
+# The phase the engine is in, like "prune", read by the `SamplingProfiler`.
+_current_phase: str | None = None
+
+
+def mark_phase(phase: str | None) -> None:
+    """Marks the start of a phase of the work, to attribute samples of
+    the `SamplingProfiler` to. Cheap enough to call unconditionally.
+
+    Parameters
+    ----------
+    phase : str | None
+        The name of the phase, like "setup", "generate", "prune", "score" or "pick",
+        or None when leaving the last phase.
+    """
+    global _current_phase
+    _current_phase = phase
+
+
+class SamplingProfiler:
+    """Statistical profiler, that periodically captures the stack of a thread
+    from a background thread, instead of timing every call.
+
+    Its overhead doesn't depend on how small the profiled methods are, so it also gives
+    a fair picture of methods like `Note.__hash__`, and it doesn't need `TimingMeta`.
+    Samples are attributed to the phase set by `mark_phase` at the time of sampling.
+
+    The background thread can only take a sample once the sampled thread releases the GIL,
+    which it does voluntarily in e.g. numpy calls, and otherwise every switch interval
+    (5 ms by default, see `sys.getswitchinterval`). So with the default settings, samples
+    are biased towards numpy calls, and taken at most every switch interval.
+    Pass `lower_switch_interval=True` to lower the switch interval to a tenth of `interval`
+    while sampling. Note that this is process-wide: it makes all threads switch more often,
+    which costs some throughput, and the original value is only restored by `stop`.
+
+    Usage
+    -----
+    with SamplingProfiler() as profiler:
+        for _ in range(100):
+            engine.get_next()
+    profiler.report()
+
+    Attributes
+    ----------
+    interval : float
+        The time between samples, in seconds.
+    lower_switch_interval : bool
+        Whether to lower the process-wide switch interval while sampling.
+    thread_id : int
+        The identifier of the sampled thread.
+    samples : dict[str, dict[str, tuple[int, int]]]
+        Per phase, per function, the number of samples in which it was running itself,
+        and the number of samples in which it was anywhere on the stack.
+    nr_of_samples : int
+        The total number of samples taken.
+    duration : float
+        The total time sampled, in seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_id: int | None = None,
+        lower_switch_interval: bool = False,
+    ):
+        self.interval = interval
+        self.lower_switch_interval = lower_switch_interval
+        self.thread_id = (
+            threading.main_thread().ident if thread_id is None else thread_id
+        )
+        self.samples: dict[str, dict[str, tuple[int, int]]] = defaultdict(dict)
+        self.nr_of_samples = 0
+        self.duration = 0.0
+        self._function_names: dict[CodeType, str] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_time = 0.0
+        self._original_switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._original_switch_interval = sys.getswitchinterval()
+        if self.lower_switch_interval:
+            sys.setswitchinterval(
+                min(self.interval / 10, self._original_switch_interval)
+            )
+        self._start_time = perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += perf_counter() - self._start_time
+        if self.lower_switch_interval:
+            sys.setswitchinterval(self._original_switch_interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(cast(int, self.thread_id))
+            if frame is not None:
+                self._record_sample(frame, _current_phase)
+
+    def _record_sample(self, frame: FrameType, phase: str | None) -> None:
+        samples = self.samples["other" if phase is None else phase]
+        leaf_name = self._get_function_name(frame.f_code)
+        on_stack: set[str] = set()
+        current: FrameType | None = frame
+        while current is not None:
+            on_stack.add(self._get_function_name(current.f_code))
+            current = current.f_back
+
+        for name in on_stack:
+            self_count, inclusive_count = samples.get(name, (0, 0))
+            if name == leaf_name:
+                self_count += 1
+            samples[name] = (self_count, inclusive_count + 1)
+        self.nr_of_samples += 1
+
+    def _get_function_name(self, code: CodeType) -> str:
+        name = self._function_names.get(code)
+        if name is None:
+            file_name = os.path.basename(code.co_filename)
+            # `co_qualname` only exists since Python 3.11.
+            qualname = getattr(code, "co_qualname", code.co_name)
+            name = f"{qualname} ({file_name}:{code.co_firstlineno})"
+            self._function_names[code] = name
+        return name
+
+    def get_report(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Gives the estimated time spent per phase, per function.
+
+        Returns
+        -------
+        dict[str, dict[str, dict[str, float]]]
+            Per phase, per function, the number of samples in which it was running itself,
+            and the estimated time in seconds it spent running itself ("self")
+            and including the functions it called ("inclusive").
+        """
+        time_per_sample = (
+            self.duration / self.nr_of_samples if self.nr_of_samples else 0
+        )
+        return {
+            phase: {
+                name: {
+                    "samples": self_count,
+                    "self": self_count * time_per_sample,
+                    "inclusive": inclusive_count * time_per_sample,
+                }
+                for name, (self_count, inclusive_count) in per_function.items()
+            }
+            for phase, per_function in self.samples.items()
+        }
+
+    def report(self) -> None:
+        """Prints the estimated time spent per function, grouped by phase,
+        in the format of `report_timings`. Functions never running themselves are left out.
+        """
+        print("\nSampling Report:")
+        report = self.get_report()
+        for phase, per_function in sorted(
+            report.items(), key=lambda x: -sum(f["self"] for f in x[1].values())
+        ):
+            print(f"{phase}:")
+            for name, timing in sorted(
+                per_function.items(), key=lambda x: (-x[1]["self"], -x[1]["inclusive"])
+            ):
+                if not timing["samples"]:
+                    continue
+                print(
+                    f"    {name}: {timing['self']:.6f} seconds, sampled {timing['samples']} times. "
+                    f"Including calls: {timing['inclusive']:.6f}"
+                )
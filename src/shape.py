@@ -1,28 +1,42 @@
 from typing import Iterable
 
 from src.cum_pattern import CumPattern
-from src.my_types import int64
 from src.note import Note
 from src.pattern import Pattern
 from src.profiler import TimingMeta
-from src.util import get_first_set_bit_index, tetris_64bit_bitmask
+from src.util import (
+    get_first_set_bit_index,
+    get_set_bit_indices,
+    tetris_64bit_bitmask,
+)
 
 
 class Shape(metaclass=TimingMeta):
     """A `Shape` represents a chord shape, as a `set` of intervals from an arbitrary root.
     Can't contain duplicates. CAN contain negative intervals.
+
+    Unlike the 12-bit types, there are too many `Shape`s to create them all at import.
+    Interning identical `Shape`s on first use can be turned on with `enable_interning`,
+    to share their cached derived values.
     """
 
-    __slots__ = ("bitmask", "offset")
+    __slots__ = ("_intervals_from_root", "bitmask", "offset")
+
+    # The slots that only cache derived values, see `src.caches`.
+    _cache_slots = ("_intervals_from_root",)
 
-    bitmask: int64
+    bitmask: int
     offset: int
+    _intervals_from_root: tuple[int, ...] | None
+
+    # Per (bitmask, offset), the interned instance, if interning is enabled.
+    _instances: dict[tuple[int, int], "Shape"] | None = None
 
-    def __init__(self, intervals_from_root: Iterable[int]):
+    def __new__(cls, intervals_from_root: Iterable[int]):
         assert (
             max(intervals_from_root) - max(intervals_from_root) < 64
         ), "range too large"
-        bitmask = int64(0)
+        bitmask = 0
         min_interval = min(intervals_from_root)
         if min_interval < 0:
             intervals_from_root_positive = [
@@ -31,30 +45,49 @@ class Shape(metaclass=TimingMeta):
         else:
             intervals_from_root_positive = intervals_from_root
         for interval in intervals_from_root_positive:
-            bitmask |= int64(1) << int64(interval)
+            bitmask |= 1 << interval
         bitmask = tetris_64bit_bitmask(bitmask)
-        self.bitmask = bitmask
-        self.offset = min_interval
+        return cls._from_64bit_bitmask_and_offset(bitmask, min_interval)
 
     @classmethod
-    def _from_64bit_bitmask_and_offset(cls, bitmask: int64, offset: int) -> "Shape":
-        instance = cls.__new__(cls)
+    def _from_64bit_bitmask_and_offset(cls, bitmask: int, offset: int) -> "Shape":
+        instances = cls._instances
+        if instances is not None:
+            instance = instances.get((bitmask, offset))
+            if instance is not None:
+                return instance
+        instance = object.__new__(cls)
         instance.bitmask = bitmask
         instance.offset = offset
+        instance._intervals_from_root = None
+        if instances is not None:
+            # Another thread may have interned the same `Shape` in the meantime.
+            instance = instances.setdefault((bitmask, offset), instance)
         return instance
 
+    @classmethod
+    def enable_interning(cls) -> None:
+        """Makes all `Shape`s created from now on unique per bitmask and offset,
+        until `disable_interning` is called. The interned instances are kept alive."""
+        if cls._instances is None:
+            cls._instances = {}
+
+    @classmethod
+    def disable_interning(cls) -> None:
+        cls._instances = None
+
     @classmethod
     def from_voicing_bitmask_and_root(
-        cls, voicing_bitmask: int64, root: Note | None = None
+        cls, voicing_bitmask: int, root: Note | None = None
     ) -> "Shape":
         if not voicing_bitmask:
-            return Shape._from_64bit_bitmask_and_offset(int64(0), 0)
+            return Shape._from_64bit_bitmask_and_offset(0, 0)
 
         bitmask = tetris_64bit_bitmask(voicing_bitmask)
         if root is None:
             offset = 0
         else:
-            offset = int(get_first_set_bit_index(voicing_bitmask) - root.value)
+            offset = get_first_set_bit_index(voicing_bitmask) - root.value
         return Shape._from_64bit_bitmask_and_offset(bitmask, offset)
 
     @property
@@ -66,14 +99,12 @@ class Shape(metaclass=TimingMeta):
         return CumPattern.from_shape_bitmask_and_offset(self.bitmask, self.offset)
 
     @property
-    def intervals_from_root(self) -> list[int]:
-        intervals_from_root: list[int] = []
-        for i in range(64):
-            if self.bitmask & (int64(1) << int64(i)):
-                intervals_from_root.append(i)
-        return intervals_from_root
-
-    def __add__(self, other: "int | int64 | Shape") -> "Shape":
+    def intervals_from_root(self) -> tuple[int, ...]:
+        if self._intervals_from_root is None:
+            self._intervals_from_root = tuple(get_set_bit_indices(self.bitmask))
+        return self._intervals_from_root
+
+    def __add__(self, other: "int | Shape") -> "Shape":
         """Adds an individual interval, or all intervals from another `Shape`.
 
         Duplicates are always filtered.
@@ -96,14 +127,11 @@ class Shape(metaclass=TimingMeta):
                 w_higher_offset = other
                 w_lower_offset = self
 
-            d_offset = int64(w_higher_offset.offset - w_lower_offset.offset)
+            d_offset = w_higher_offset.offset - w_lower_offset.offset
 
             bitmask_w_higher_offset_shifted = w_higher_offset.bitmask << d_offset
 
-            if (
-                bitmask_w_higher_offset_shifted.bit_count()
-                != w_higher_offset.bitmask.bit_count()
-            ):
+            if bitmask_w_higher_offset_shifted >> 64:
                 raise OverflowError()
 
             bitmask = bitmask_w_higher_offset_shifted | w_lower_offset.bitmask
@@ -111,15 +139,17 @@ class Shape(metaclass=TimingMeta):
 
             return Shape._from_64bit_bitmask_and_offset(bitmask, offset)
 
-        else:  # int | int64
+        else:  # int
             if other < self.offset:
-                bitmask = self.bitmask << int64(self.offset - other)
-                if bitmask.bit_count() != self.bitmask.bit_count():
+                bitmask = self.bitmask << (self.offset - other)
+                if bitmask >> 64:
                     raise OverflowError()
-                bitmask |= int64(1)
-                offset = int(other)
+                bitmask |= 1
+                offset = other
             else:
-                bitmask = self.bitmask | (int64(1) << (int64(other) - self.offset))
+                bitmask = self.bitmask | (1 << (other - self.offset))
+                if bitmask >> 64:
+                    raise OverflowError()
                 offset = self.offset
             return Shape._from_64bit_bitmask_and_offset(bitmask, offset)
 
@@ -130,7 +160,7 @@ class Shape(metaclass=TimingMeta):
         return self.bitmask.bit_count()
 
     def __str__(self):
-        return f"Shape({self.intervals_from_root})"
+        return f"Shape({list(self.intervals_from_root)})"
 
     def __repr__(self):
         return str(self)
@@ -143,4 +173,7 @@ class Shape(metaclass=TimingMeta):
         )
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        return (Shape._from_64bit_bitmask_and_offset, (self.bitmask, self.offset))
@@ -1,12 +1,12 @@
 from typing import Sequence
 
 from src.metrics.metric import GeneratingMetric, Metric
-from src.profiler import TimingMeta
+from src.profiler import TimingMeta, mark_phase
 from src.util import weighted_pick
 from src.distribution import Distribution
 
 
-class StochasticDistributionEngine:
+class StochasticDistributionEngine(metaclass=TimingMeta):
     """Creates a progression of `Distribution`s based on a list of `Metric`s.
     It iteratively picks a next `Distribution` by determining which `Distribution`s
     are allowed by all `Metric`s, and then making a weighted random pick,
@@ -33,30 +33,39 @@ class StochasticDistributionEngine:
         Distribution | None
             The next `Distribution`, or `None` if there are no legal `Distribution`s.
         """
-        for metric in self.all_metrics:
-            metric.setup(self.history)
+        try:
+            mark_phase("setup")
+            for metric in self.all_metrics:
+                metric.setup(self.history)
 
-        candidates = self.generating_metric.get_allowed()
-        for metric in self.other_metrics:
-            candidates = metric.prune(candidates)
+            mark_phase("generate")
+            candidates = self.generating_metric.get_allowed()
+            mark_phase("prune")
+            for metric in self.other_metrics:
+                candidates = metric.prune(candidates)
 
-        scored_distributions: dict[Distribution, float] = {}
+            mark_phase("score")
+            scored_distributions: dict[Distribution, float] = {}
 
-        for distribution in candidates:
-            scored_distributions[distribution] = 0
-            for metric in self.all_metrics:
-                new_score = metric.score_assuming_pruned(distribution)
-                if new_score is None:
-                    scored_distributions.pop(distribution)
-                    break
-                scored_distributions[distribution] += new_score
+            for distribution in candidates:
+                scored_distributions[distribution] = 0
+                for metric in self.all_metrics:
+                    new_score = metric.score_assuming_pruned(distribution)
+                    if new_score is None:
+                        scored_distributions.pop(distribution)
+                        break
+                    scored_distributions[distribution] += new_score
 
-        if not scored_distributions:
-            return None
+            if not scored_distributions:
+                return None
 
-        next_distribution = weighted_pick(scored_distributions)
-        self.history.append(next_distribution)
-        return next_distribution
+            mark_phase("pick")
+            next_distribution = weighted_pick(scored_distributions)
+            self.history.append(next_distribution)
+            return next_distribution
+        finally:
+            # Also when a metric raises, so that later samples aren't attributed to a stale phase.
+            mark_phase(None)
 
     def reset(self, start: Distribution) -> None:
         """Whipes the history of the engine, and starts over with `start`.
@@ -1,52 +1,95 @@
-from functools import lru_cache
+from array import array
+from functools import cache
 import numpy as np
-from typing import Iterable, Sequence, TypeVar
+from typing import Iterable, NamedTuple, Sequence, TypeVar
 import random
 
 from src.constants import MASK_12BIT
-from src.my_types import int16, int16list, int64
-
+from src.my_types import int64list, intlist
 
 T = TypeVar("T")
 
 
-@lru_cache
-def get_all_12bit_bitmask_rotations(bitmask: int16) -> int16list:
+class Bit12Tables(NamedTuple):
+    """Properties of every 12-bit bitmask, indexed by the bitmask itself.
+
+    The empty bitmask has a `lowest_set_bit` of 12.
+    """
+
+    rotations_left: tuple[tuple[int, ...], ...]
+    rotations_right: tuple[tuple[int, ...], ...]
+    normal_forms: tuple[int, ...]
+    popcounts: bytes
+    set_bit_indices: tuple[tuple[int, ...], ...]
+    lowest_set_bits: bytes
+
+
+@cache
+def get_12bit_tables() -> Bit12Tables:
+    """Builds the `Bit12Tables`, once.
+
+    Returns
+    -------
+    Bit12Tables
+        The tables, as Python containers for fast scalar lookups.
+    """
+    bitmasks = np.arange(4096)
+    ns = np.arange(12)
+    rotations_left = (
+        (bitmasks[:, np.newaxis] << ns) | (bitmasks[:, np.newaxis] >> (12 - ns))
+    ) & MASK_12BIT
+    rotations_right = rotations_left[:, (12 - ns) % 12]
+    is_set = (bitmasks[:, np.newaxis] >> ns) & 1 == 1
+    # Setting bit i in all bitmasks below 1 << i gives the ones below 1 << (i + 1).
+    set_bit_indices: list[tuple[int, ...]] = [()]
+    for i in range(12):
+        set_bit_indices += [indices + (i,) for indices in set_bit_indices]
+    lowest_set_bits = np.where(is_set.any(axis=1), is_set.argmax(axis=1), 12)
+
+    return Bit12Tables(
+        rotations_left=tuple(map(tuple, rotations_left.tolist())),
+        rotations_right=tuple(map(tuple, rotations_right.tolist())),
+        normal_forms=tuple(rotations_left.min(axis=1).tolist()),
+        popcounts=is_set.sum(axis=1).astype(np.uint8).tobytes(),
+        set_bit_indices=tuple(set_bit_indices),
+        lowest_set_bits=lowest_set_bits.astype(np.uint8).tobytes(),
+    )
+
+
+def get_all_12bit_bitmask_rotations(bitmask: int) -> tuple[int, ...]:
     """Get all 12 rotations of the bitmask.
 
     Parameters
     ----------
-    bitmask : int16
+    bitmask : int
         The 12-bit integer to rotate.
 
     Returns
     -------
-    int16list
-        A list of all 12 rotations of the bitmask.
+    tuple[int, ...]
+        All 12 rotations of the bitmask.
     """
-    return np.array(
-        [rotate_12bit_bitmask_right(bitmask, i) for i in range(12)], dtype=int16
-    )
+    assert is_12bit(bitmask), f"{bitmask = }"
+    return get_12bit_tables().rotations_right[bitmask]
 
 
-@lru_cache
-def get_normal_form_12bit_bitmask(bitmask: int16) -> int16:
+def get_normal_form_12bit_bitmask(bitmask: int) -> int:
     """Get the lexicographically smallest rotation starting with bit 0 set.
 
     This is the normal form of a pattern.
 
     Parameters
     ----------
-    bitmask : int16
+    bitmask : int
         The 12-bit integer to normalize.
 
     Returns
     -------
-    int16
+    int
         The lexicographically smallest rotation of the bitmask.
     """
-    rotations = get_all_12bit_bitmask_rotations(bitmask)
-    return min(rotations)
+    assert is_12bit(bitmask), f"{bitmask = }"
+    return get_12bit_tables().normal_forms[bitmask]
 
 
 def weighted_pick(options: dict[T, float]) -> T:
@@ -70,7 +113,7 @@ def weighted_pick(options: dict[T, float]) -> T:
     return random.choices(ts, weights=weights, k=1)[0]
 
 
-def inner_intervals_to_cum_pattern_bitmask(inner_intervals: Sequence[int]) -> int16:
+def inner_intervals_to_cum_pattern_bitmask(inner_intervals: Sequence[int]) -> int:
     """Convert inner intervals to a `CumPattern` bitmask.
 
     Parameters
@@ -80,20 +123,20 @@ def inner_intervals_to_cum_pattern_bitmask(inner_intervals: Sequence[int]) -> in
 
     Returns
     -------
-    int16
+    int
         A 12-bit integer representing the cumulative pattern, where each bit corresponds to a position in the cumulative pattern.
     """
-    bitmask = int16(0)
+    bitmask = 0
     pos = 0
     for interval in inner_intervals:
-        bitmask |= int16(1) << int16(pos)
+        bitmask |= 1 << pos
         pos = (pos + interval) % 12
     return bitmask
 
 
 def intervals_from_root_to_cum_pattern_bitmask(
     intervals_from_root: Iterable[int],
-) -> int16:
+) -> int:
     """Convert intervals from root to a `CumPattern` bitmask.
 
     Parameters
@@ -103,147 +146,492 @@ def intervals_from_root_to_cum_pattern_bitmask(
 
     Returns
     -------
-    int16
+    int
         A 12-bit integer representing the cumulative pattern.
     """
-    bitmask = int16(0)
+    bitmask = 0
     for interval in intervals_from_root:
-        bitmask |= int16(1) << int16(interval % 12)
+        bitmask |= 1 << (interval % 12)
     return bitmask
 
 
-@lru_cache
-def rotate_12bit_bitmask_right(bitmask: int16, n: int | int16) -> int16:
+def rotate_12bit_bitmask_right(bitmask: int, n: int) -> int:
     """Rotate bitmask right by n positions within 12 bits.
 
     Parameters
     ----------
-    bitmask : int16
+    bitmask : int
         The bitmask to rotate.
     n : int
         The number of positions to rotate the bitmask to the right.
     Returns
     -------
-    int16
+    int
         The rotated bitmask, ensuring it remains within 12 bits.
     """
     assert is_12bit(bitmask), f"{bitmask = }"
-    n = n % 12
-    return ((bitmask >> int16(n)) | (bitmask << int16(12 - n))) & MASK_12BIT
+    return get_12bit_tables().rotations_right[bitmask][n % 12]
 
 
-@lru_cache
-def rotate_12bit_bitmask_left(bitmask: int16, n: int | int16) -> int16:
+def rotate_12bit_bitmask_left(bitmask: int, n: int) -> int:
     """Rotate bitmask left by n positions within 12 bits.
 
     Parameters
     ----------
-    bitmask : int16
+    bitmask : int
         The bitmask to rotate.
     n : int
         The number of positions to rotate the bitmask to the left.
     Returns
     -------
-    int16
+    int
         The rotated bitmask, ensuring it remains within 12 bits.
     """
     assert is_12bit(bitmask), f"{bitmask = }"
-    n = n % 12
-    return ((bitmask << int16(n)) | (bitmask >> int16(12 - n))) & MASK_12BIT
+    return get_12bit_tables().rotations_left[bitmask][n % 12]
 
 
-@lru_cache
-def tetris_12bit_bitmask(bitmask: int16) -> int16:
+def tetris_12bit_bitmask(bitmask: int) -> int:
     """Shift the bitmask right until the least significant set bit is at bit 0.
 
     Parameters
     ----------
-    bitmask : int16
+    bitmask : int
         The bitmask to shift.
 
     Returns
     -------
-    int16
+    int
         The shifted bitmask with the first set bit at position 0
     """
     assert is_12bit(bitmask), f"{bitmask = }"
     assert bitmask, f"{bitmask = }"
 
-    first_set_bit_index = get_first_set_bit_index(bitmask)
-    tetrissed_bitmask = bitmask >> int16(first_set_bit_index)
-
-    return tetrissed_bitmask
+    return bitmask >> get_12bit_tables().lowest_set_bits[bitmask]
 
 
-@lru_cache
-def tetris_64bit_bitmask(bitmask: int64) -> int64:
+def tetris_64bit_bitmask(bitmask: int) -> int:
     """Shift the bitmask right until the least significant set bit is at bit 0.
 
     Parameters
     ----------
-    bitmask : int64
+    bitmask : int
         The bitmask to shift.
 
     Returns
     -------
-    int64
+    int
         The shifted bitmask with the first set bit at position 0.
     """
     assert bitmask, "Bitmask must be non-empty."
 
     first_set_bit_index = get_first_set_bit_index(bitmask)
-    tetrissed_bitmask = bitmask >> int64(first_set_bit_index)
+    tetrissed_bitmask = bitmask >> first_set_bit_index
 
     return tetrissed_bitmask
 
 
-@lru_cache
-def voicing_bitmask_to_combination_bitmask(voicing_bitmask: int64) -> int16:
-    bitmask = int16(0)
+@cache
+def get_chunk16_fold_tables() -> tuple[array, array, array, array]:
+    """Builds the tables for folding a 64-bit bitmask into 12 bits, once.
 
-    for _ in range(6):
-        bitmask |= int16(voicing_bitmask & MASK_12BIT)
-        voicing_bitmask >>= int64(12)
-    return bitmask
+    The i-th table maps every 16-bit chunk at bits 16i..16i+15 onto the 12-bit bitmask
+    of the pitch classes it covers. Since 16i modulo 12 only takes the values 0, 4 and 8,
+    the fourth table is the first one.
+
+    Returns
+    -------
+    tuple[array, array, array, array]
+        The tables, as `array`s of unsigned shorts for fast scalar lookups.
+        Use `np.frombuffer` for vectorized lookups.
+    """
+    chunks = np.arange(1 << 16)
+    folded = chunks & MASK_12BIT | chunks >> 12
+    tables = [
+        array("H", rotate_12bit_bitmasks_left(folded, offset).tolist())
+        for offset in (0, 4, 8)
+    ]
+    return tables[0], tables[1], tables[2], tables[0]
+
+
+class Chunk16Tables(NamedTuple):
+    """Properties of every 16-bit chunk, indexed by the chunk itself.
+
+    Used for answering questions about 64-bit bitmasks in four lookups.
+    Chunks with fewer than two set bits have a `min_gap` of 64 and a `max_gap` of 0,
+    the empty chunk has a `lowest` of 16 and a `highest` of 0.
+    """
+
+    lowest: bytes
+    highest: bytes
+    min_gap: bytes
+    max_gap: bytes
+    popcount: bytes
+
+
+@cache
+def get_chunk16_tables() -> Chunk16Tables:
+    """Builds the `Chunk16Tables`, once.
+
+    Returns
+    -------
+    Chunk16Tables
+        The tables, as `bytes` for fast scalar lookups. Use `np.frombuffer` for vectorized lookups.
+    """
+    chunks = np.arange(1 << 16)
+    lowest = np.full(1 << 16, 16)
+    highest = np.zeros(1 << 16, dtype=np.int64)
+    min_gap = np.full(1 << 16, 64)
+    max_gap = np.zeros(1 << 16, dtype=np.int64)
+    popcount = np.zeros(1 << 16, dtype=np.int64)
+    for i in range(16):
+        is_set = (chunks >> i) & 1 == 1
+        has_previous = is_set & (popcount > 0)
+        gap = i - highest
+        min_gap = np.where(has_previous, np.minimum(min_gap, gap), min_gap)
+        max_gap = np.where(has_previous, np.maximum(max_gap, gap), max_gap)
+        lowest = np.where(is_set & (popcount == 0), i, lowest)
+        highest = np.where(is_set, i, highest)
+        popcount += is_set
+
+    return Chunk16Tables(
+        *(
+            table.astype(np.uint8).tobytes()
+            for table in (lowest, highest, min_gap, max_gap, popcount)
+        )
+    )
+
+
+def rotate_12bit_bitmasks_left(bitmasks: intlist, n: int) -> intlist:
+    """Vectorized `rotate_12bit_bitmask_left`.
+
+    Parameters
+    ----------
+    bitmasks : intlist
+        The 12-bit bitmasks to rotate.
+    n : int
+        The number of positions to rotate by.
+
+    Returns
+    -------
+    intlist
+        The rotated bitmasks.
+    """
+    n = n % 12
+    return ((bitmasks << n) | (bitmasks >> (12 - n))) & MASK_12BIT
+
+
+def voicing_bitmask_to_combination_bitmask(voicing_bitmask: int) -> int:
+    table0, table1, table2, table3 = get_chunk16_fold_tables()
+    voicing_bitmask = int(voicing_bitmask)
+    return (
+        table0[voicing_bitmask & 0xFFFF]
+        | table1[voicing_bitmask >> 16 & 0xFFFF]
+        | table2[voicing_bitmask >> 32 & 0xFFFF]
+        | table3[voicing_bitmask >> 48]
+    )
+
+
+def voicing_bitmasks_to_combination_bitmasks(voicing_bitmasks: int64list) -> intlist:
+    """Vectorized `voicing_bitmask_to_combination_bitmask`.
+
+    Parameters
+    ----------
+    voicing_bitmasks : int64list
+        The 64-bit bitmasks to fold, as an array of unsigned 64-bit integers.
+
+    Returns
+    -------
+    intlist
+        The 12-bit bitmasks of the pitch classes covered, as unsigned 16-bit integers.
+    """
+    voicing_bitmasks = np.asarray(voicing_bitmasks, dtype=np.uint64)
+    combination_bitmasks = np.zeros(voicing_bitmasks.shape, dtype=np.uint16)
+    for i, table in enumerate(get_chunk16_fold_tables()):
+        chunks = (voicing_bitmasks >> np.uint64(16 * i)) & np.uint64(0xFFFF)
+        combination_bitmasks |= np.frombuffer(table, dtype=np.uint16)[chunks]
+    return combination_bitmasks
 
 
-def note_bitmask_to_pitch_class_bitmask(note_bitmask: int64) -> int16:
-    # These are equivalent
-    return voicing_bitmask_to_combination_bitmask(note_bitmask)
+def note_bitmask_to_pitch_class_bitmask(note_bitmask: int) -> int:
+    # A single set bit folds onto a single set bit.
+    return 1 << ((int(note_bitmask).bit_length() - 1) % 12)
 
 
 def shape_bitmask_and_offset_to_cum_pattern_bitmask(
-    shape_bitmask: int64, offset: int
-) -> int16:
+    shape_bitmask: int, offset: int
+) -> int:
     bitmask = voicing_bitmask_to_combination_bitmask(shape_bitmask)
-    bitmask = rotate_12bit_bitmask_left(bitmask, int16(offset % 12))
+    bitmask = rotate_12bit_bitmask_left(bitmask, offset % 12)
 
     return bitmask
 
 
-@lru_cache
-def get_set_bit_indices(x: int16 | int64 | int) -> list[int]:
+def get_set_bit_indices(x: int) -> list[int]:
+    set_bit_indices = get_12bit_tables().set_bit_indices
+    item = int(x)
+    if item <= MASK_12BIT:
+        return list(set_bit_indices[item])
+
     indices: list[int] = []
-    item = x if isinstance(x, int) else x.item()
+    offset = 0
     while item:
-        index = get_first_set_bit_index(item)
-        indices.append(index)
-        item &= item - 1
+        indices.extend(index + offset for index in set_bit_indices[item & MASK_12BIT])
+        item >>= 12
+        offset += 12
     return indices
 
 
-@lru_cache
-def get_first_set_bit_index(x: int16 | int64 | int) -> int:
-    item = x if isinstance(x, int) else x.item()
+def get_first_set_bit_index(x: int) -> int:
+    item = int(x)
     lsb = item & -item
     index = lsb.bit_length() - 1
     return index
 
 
-def is_12bit(x: int16) -> bool:
+def is_12bit(x: int) -> bool:
     return x & MASK_12BIT == x
 
 
+@cache
+def get_fitting_rotations_table(bitmask: int) -> list[int]:
+    """For every 12-bit bitmask, find the rotations of `bitmask` it is a subset of.
+
+    Parameters
+    ----------
+    bitmask : int
+        The 12-bit bitmask to rotate, typically the bitmask of a scale `Pattern`.
+
+    Returns
+    -------
+    list[int]
+        4096 12-bit integers. Bit `i` of entry `b` is set if and only if `b` is a subset
+        of `bitmask` rotated left by `i`.
+    """
+    assert is_12bit(bitmask), f"{bitmask = }"
+
+    table = [0] * 4096
+    for i in range(12):
+        rotation = rotate_12bit_bitmask_left(bitmask, i)
+        subset = rotation
+        while True:
+            table[subset] |= 1 << i
+            if not subset:
+                break
+            subset = (subset - 1) & rotation
+    return table
+
+
+@cache
+def get_root_match_table(cum_pattern_bitmask: int) -> array:
+    """For every 12-bit bitmask, find the roots from which the `CumPattern` can be built.
+
+    Built once per `CumPattern` bitmask, and shared by everyone matching against it.
+
+    Parameters
+    ----------
+    cum_pattern_bitmask : int
+        The 12-bit bitmask of the `CumPattern`.
+
+    Returns
+    -------
+    array
+        4096 12-bit integers, as unsigned shorts. Bit `r` of entry `b` is set if and only if
+        `r` is in `b`, and `cum_pattern_bitmask` rotated left by `r` is a subset of `b`.
+    """
+    assert is_12bit(cum_pattern_bitmask), f"{cum_pattern_bitmask = }"
+
+    bitmasks = np.arange(4096)
+    table = np.zeros(4096, dtype=np.uint16)
+    for root in range(12):
+        rotation = rotate_12bit_bitmask_left(cum_pattern_bitmask, root) | 1 << root
+        table[bitmasks & rotation == rotation] |= 1 << root
+    return array("H", table.tolist())
+
+
+def get_root_matches(
+    combination_bitmasks: intlist, cum_pattern_bitmask: int
+) -> intlist:
+    """Vectorized lookup into `get_root_match_table`.
+
+    Parameters
+    ----------
+    combination_bitmasks : intlist
+        The 12-bit bitmasks of the `Combination`s to match.
+    cum_pattern_bitmask : int
+        The 12-bit bitmask of the `CumPattern` to match for.
+
+    Returns
+    -------
+    intlist
+        Per `Combination`, the 12-bit bitmask of matching roots, as unsigned 16-bit integers.
+    """
+    table = np.frombuffer(get_root_match_table(cum_pattern_bitmask), dtype=np.uint16)
+    return table[combination_bitmasks]
+
+
+class PatternTables(NamedTuple):
+    """Dense ids for all 352 `Pattern`s (including the empty one), and which contain which.
+
+    Ids are assigned in increasing order of normal form, so the empty pattern has id 0.
+    """
+
+    normal_forms: tuple[int, ...]
+    ids: tuple[int, ...]
+    containment_matrix: np.ndarray
+    containment_rows: tuple[bytes, ...]
+
+
+@cache
+def get_pattern_tables() -> PatternTables:
+    """Builds the `PatternTables`, once.
+
+    Returns
+    -------
+    PatternTables
+        `normal_forms` maps an id to the normal form bitmask of its pattern, `ids` maps any
+        12-bit bitmask to the id of its pattern. Entry `[i, j]` of `containment_matrix`
+        (and byte `j` of `containment_rows[i]`) tells whether pattern `j` fits in pattern `i`.
+    """
+    tables = get_12bit_tables()
+    normal_forms = sorted(set(tables.normal_forms))
+    id_per_normal_form = {
+        bitmask: pattern_id for pattern_id, bitmask in enumerate(normal_forms)
+    }
+    ids = tuple(id_per_normal_form[bitmask] for bitmask in tables.normal_forms)
+
+    outer_rotations = np.array([tables.rotations_left[b] for b in normal_forms])
+    inners = np.array(normal_forms)
+    fits_rotation = (
+        outer_rotations[:, :, np.newaxis] & inners == inners
+    )  # (outer, rotation, inner)
+    containment_matrix = fits_rotation.any(axis=1)
+    containment_matrix.flags.writeable = False
+
+    return PatternTables(
+        normal_forms=tuple(normal_forms),
+        ids=ids,
+        containment_matrix=containment_matrix,
+        containment_rows=tuple(
+            row.astype(np.uint8).tobytes() for row in containment_matrix
+        ),
+    )
+
+
+def get_gap_range_64bit_bitmask(bitmask: int) -> tuple[int, int] | None:
+    """Finds the smallest and biggest distance between consecutive set bits.
+
+    Parameters
+    ----------
+    bitmask : int
+        The bitmask, e.g. of a `Voicing`.
+
+    Returns
+    -------
+    tuple[int, int] | None
+        The smallest and the biggest gap, or `None` if fewer than two bits are set.
+    """
+    tables = get_chunk16_tables()
+    bitmask = int(bitmask)
+    min_gap = 64
+    max_gap = 0
+    previous_highest = -1
+    for offset in (0, 16, 32, 48):
+        chunk = (bitmask >> offset) & 0xFFFF
+        if not chunk:
+            continue
+        if previous_highest >= 0:
+            gap = tables.lowest[chunk] + offset - previous_highest
+            min_gap = min(min_gap, gap)
+            max_gap = max(max_gap, gap)
+        min_gap = min(min_gap, tables.min_gap[chunk])
+        max_gap = max(max_gap, tables.max_gap[chunk])
+        previous_highest = tables.highest[chunk] + offset
+
+    if not max_gap:
+        return None
+    return min_gap, max_gap
+
+
+def get_gap_ranges_64bit_bitmasks(bitmasks: int64list) -> tuple[intlist, intlist]:
+    """Vectorized `get_gap_range_64bit_bitmask`.
+
+    Parameters
+    ----------
+    bitmasks : int64list
+        The bitmasks, e.g. of `Voicing`s.
+
+    Returns
+    -------
+    tuple[intlist, intlist]
+        The smallest and the biggest gap per bitmask, 64 and 0 if fewer than two bits are set.
+    """
+    tables = get_chunk16_tables()
+    lowest, highest, min_gaps, max_gaps, _ = (
+        np.frombuffer(table, dtype=np.uint8).astype(np.int64) for table in tables
+    )
+    bitmasks = np.asarray(bitmasks, dtype=np.uint64)
+    min_gap = np.full(bitmasks.shape, 64, dtype=np.int64)
+    max_gap = np.zeros(bitmasks.shape, dtype=np.int64)
+    previous_highest = np.full(bitmasks.shape, -1, dtype=np.int64)
+    for offset in (0, 16, 32, 48):
+        chunks = ((bitmasks >> np.uint64(offset)) & np.uint64(0xFFFF)).astype(np.intp)
+        is_set = chunks != 0
+        crosses = is_set & (previous_highest >= 0)
+        gap = lowest[chunks] + offset - previous_highest
+        min_gap = np.where(crosses, np.minimum(min_gap, gap), min_gap)
+        max_gap = np.where(crosses, np.maximum(max_gap, gap), max_gap)
+        min_gap = np.minimum(min_gap, min_gaps[chunks])
+        max_gap = np.maximum(max_gap, max_gaps[chunks])
+        previous_highest = np.where(is_set, highest[chunks] + offset, previous_highest)
+    return min_gap, max_gap
+
+
+def get_span_64bit_bitmask(bitmask: int) -> int:
+    """Finds the distance between the highest and the lowest set bit, 0 if no bits are set."""
+    bitmask = int(bitmask)
+    if not bitmask:
+        return 0
+    return bitmask.bit_length() - (bitmask & -bitmask).bit_length()
+
+
+def get_lowest_set_bits_64bit_bitmasks(bitmasks: int64list) -> intlist:
+    """Finds the index of the lowest set bit of every bitmask, 64 for empty ones."""
+    lowest = np.frombuffer(get_chunk16_tables().lowest, dtype=np.uint8).astype(np.int64)
+    bitmasks = np.asarray(bitmasks, dtype=np.uint64)
+    lowest_overall = np.full(bitmasks.shape, 64, dtype=np.int64)
+    for offset in (48, 32, 16, 0):
+        chunks = ((bitmasks >> np.uint64(offset)) & np.uint64(0xFFFF)).astype(np.intp)
+        is_set = chunks != 0
+        lowest_overall = np.where(is_set, lowest[chunks] + offset, lowest_overall)
+    return lowest_overall
+
+
+def get_spans_64bit_bitmasks(bitmasks: int64list) -> intlist:
+    """Vectorized `get_span_64bit_bitmask`."""
+    highest = np.frombuffer(get_chunk16_tables().highest, dtype=np.uint8)
+    highest = highest.astype(np.int64)
+    bitmasks = np.asarray(bitmasks, dtype=np.uint64)
+    lowest_overall = get_lowest_set_bits_64bit_bitmasks(bitmasks)
+    highest_overall = np.full(bitmasks.shape, -1, dtype=np.int64)
+    for offset in (0, 16, 32, 48):
+        chunks = ((bitmasks >> np.uint64(offset)) & np.uint64(0xFFFF)).astype(np.intp)
+        is_set = chunks != 0
+        highest_overall = np.where(is_set, highest[chunks] + offset, highest_overall)
+    return np.maximum(highest_overall - lowest_overall, 0)
+
+
+def get_popcounts_64bit_bitmasks(bitmasks: int64list) -> intlist:
+    """Counts the set bits of every bitmask."""
+    popcount = np.frombuffer(get_chunk16_tables().popcount, dtype=np.uint8)
+    bitmasks = np.asarray(bitmasks, dtype=np.uint64)
+    counts = np.zeros(bitmasks.shape, dtype=np.int64)
+    for offset in (0, 16, 32, 48):
+        chunks = ((bitmasks >> np.uint64(offset)) & np.uint64(0xFFFF)).astype(np.intp)
+        counts += popcount[chunks]
+    return counts
+
+
 # @cache
 # def get_inner_intervals(intervals_from_root: Sequence[int]) -> tuple[int, ...]:
 #     """Finds the distances between successive elements in a sequence of integers,
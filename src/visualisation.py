@@ -1,9 +1,10 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from matplotlib import pyplot as plt
-from matplotlib.figure import Figure
 import numpy as np
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 
 def plot(
     y: Any,
@@ -13,7 +14,7 @@ def plot(
     ylabel: str = "Y",
     ylimit: float | None = None,
     xrange: tuple[float, float] | None = None,
-    figure: Figure | None = None,
+    figure: "Figure | None" = None,
     red_lines: list[float] | None = None,
     green_lines: list[float] | list[int] | None = None,
 ) -> None:
@@ -44,6 +45,8 @@ def plot(
     green_lines : list[float] | list[int] | None, optional
         X values for which to plot green vertical dashed lines, by default []
     """
+    from matplotlib import pyplot as plt
+
     if x is None:
         x = np.arange(len(y))
     if figure is None:
@@ -1,10 +1,9 @@
-from typing import Sequence
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
 
-from src.profiler import TimingMeta
 from src.cum_pattern import CumPattern
 from src.profiler import TimingMeta
 from src.shape import Shape
-from src.my_types import int64
 from src.note import Note
 from src.pattern import Pattern
 from src.pitch_class import PitchClass
@@ -19,33 +18,69 @@ class Voicing(metaclass=TimingMeta):
     """A `Voicing` represents a set of specific `Note`s.
     `Voicing`s are unordered and can't contain duplicate notes.
     It is the least abstract way to represent a chord or scale.
+
+    Interning identical `Voicing`s can be turned on with `enable_interning`,
+    to share their cached derived values.
     """
 
-    __slots__ = ("bitmask", "_combination", "_pattern", "_notes")
+    __slots__ = (
+        "_combination",
+        "_notes",
+        "_pattern",
+        "_pc_count",
+        "_shape",
+        "bitmask",
+    )
+
+    # The slots that only cache derived values, see `src.caches`.
+    _cache_slots = ("_combination", "_pattern", "_notes", "_shape", "_pc_count")
 
-    bitmask: int64
+    bitmask: int
     _combination: Combination | None
     _pattern: Pattern | None
     _notes: list[Note] | None
+    _shape: Shape | None
+    _pc_count: Mapping[PitchClass, int] | None
 
-    def __init__(self, notes: Sequence[Note]):
-        bitmask = int64(0)
+    # Per bitmask, the interned instance, if interning is enabled.
+    _instances: dict[int, "Voicing"] | None = None
+
+    def __new__(cls, notes: Sequence[Note]):
+        bitmask = 0
         for note in notes:
             bitmask |= note.bitmask
-        self.bitmask = bitmask
-        self._combination = None
-        self._pattern = None
-        self._notes = None
+        return cls.from_64bit_bitmask(bitmask)
 
     @classmethod
-    def from_64bit_bitmask(cls, bitmask: int64) -> "Voicing":
-        instance = cls.__new__(cls)
+    def from_64bit_bitmask(cls, bitmask: int) -> "Voicing":
+        instances = cls._instances
+        if instances is not None:
+            instance = instances.get(bitmask)
+            if instance is not None:
+                return instance
+        instance = object.__new__(cls)
         instance.bitmask = bitmask
         instance._combination = None
         instance._pattern = None
         instance._notes = None
+        instance._shape = None
+        instance._pc_count = None
+        if instances is not None:
+            # Another thread may have interned the same `Voicing` in the meantime.
+            instance = instances.setdefault(bitmask, instance)
         return instance
 
+    @classmethod
+    def enable_interning(cls) -> None:
+        """Makes all `Voicing`s created from now on unique per bitmask,
+        until `disable_interning` is called. The interned instances are kept alive."""
+        if cls._instances is None:
+            cls._instances = {}
+
+    @classmethod
+    def disable_interning(cls) -> None:
+        cls._instances = None
+
     def __iter__(self):
         return iter(self.notes)
 
@@ -61,10 +96,10 @@ class Voicing(metaclass=TimingMeta):
 
     def __lshift__(self, i: int) -> "Voicing":
         if i < 0:
-            bitmask = int64(self.bitmask << -i)
+            bitmask = self.bitmask << -i
         else:
-            bitmask = int64(self.bitmask >> i)
-        if bitmask.bit_count() != self.bitmask.bit_count():
+            bitmask = self.bitmask >> i
+        if bitmask.bit_count() != self.bitmask.bit_count() or bitmask >> 64:
             raise OverflowError()
         return Voicing.from_64bit_bitmask(bitmask)
 
@@ -81,12 +116,19 @@ class Voicing(metaclass=TimingMeta):
         return isinstance(other, Voicing) and self.bitmask == other.bitmask
 
     def __hash__(self) -> int:
-        return int(self.bitmask)
+        return self.bitmask
+
+    def __reduce__(self) -> tuple:
+        return (Voicing.from_64bit_bitmask, (self.bitmask,))
 
     @classmethod
     def from_shape(cls, root_note: Note, shape: Shape) -> "Voicing":
-        bitmask = shape.bitmask << (root_note.value + shape.offset)
-        if bitmask.bit_count() != shape.bitmask.bit_count():
+        shift = root_note.value + shape.offset
+        if shift < 0:
+            bitmask = shape.bitmask >> -shift
+        else:
+            bitmask = shape.bitmask << shift
+        if bitmask.bit_count() != shape.bitmask.bit_count() or bitmask >> 64:
             raise OverflowError()
         return Voicing.from_64bit_bitmask(bitmask)
 
@@ -108,7 +150,9 @@ class Voicing(metaclass=TimingMeta):
 
     @property
     def shape(self) -> Shape:
-        return Shape.from_voicing_bitmask_and_root(self.bitmask)
+        if self._shape is None:
+            self._shape = Shape.from_voicing_bitmask_and_root(self.bitmask)
+        return self._shape
 
     @property
     def pattern(self) -> Pattern:
@@ -117,14 +161,16 @@ class Voicing(metaclass=TimingMeta):
         return self._pattern
 
     @property
-    def pc_count(self) -> dict[PitchClass, int]:
-        pc_count: dict[PitchClass, int] = {}
-        for note in self:
-            pc = note.pc
-            if pc not in pc_count:
-                pc_count[pc] = 0
-            pc_count[pc] += 1
-        return pc_count
+    def pc_count(self) -> Mapping[PitchClass, int]:
+        if self._pc_count is None:
+            pc_count: dict[PitchClass, int] = {}
+            for note in self:
+                pc = note.pc
+                if pc not in pc_count:
+                    pc_count[pc] = 0
+                pc_count[pc] += 1
+            self._pc_count = MappingProxyType(pc_count)
+        return self._pc_count
 
     @property
     def notes(self) -> list[Note]:
@@ -0,0 +1,166 @@
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from src.combination import Combination
+from src.my_types import boollist, int16list, int64list, intlist
+from src.pattern import Pattern
+from src.shape import Shape
+from src.util import (
+    get_lowest_set_bits_64bit_bitmasks,
+    get_pattern_tables,
+    get_popcounts_64bit_bitmasks,
+    voicing_bitmasks_to_combination_bitmasks,
+)
+from src.voicing import Voicing
+
+
+class VoicingArray:
+    """Many `Voicing`s at once, stored as an array of their 64-bit bitmasks.
+
+    Supports the bulk versions of the operations on `Voicing`, without a Python loop.
+    Slicing gives a view on the same array, indexing with an integer gives a `Voicing`,
+    and indexing with a boolean mask or an array of indices gives a filtered copy.
+
+    Attributes
+    ----------
+    bitmasks : int64list
+        The `Voicing` bitmasks, as an array of unsigned 64-bit integers.
+    """
+
+    __slots__ = ("bitmasks",)
+
+    bitmasks: int64list
+
+    def __init__(self, bitmasks: int64list | Iterable[int]):
+        if not isinstance(bitmasks, np.ndarray):
+            bitmasks = np.fromiter(bitmasks, dtype=np.uint64)
+        self.bitmasks = np.asarray(bitmasks, dtype=np.uint64)
+
+    @classmethod
+    def from_voicings(cls, voicings: Iterable[Voicing]) -> "VoicingArray":
+        return VoicingArray([voicing.bitmask for voicing in voicings])
+
+    @classmethod
+    def from_shape(cls, root_note_values: intlist, shape: Shape) -> "VoicingArray":
+        """Vectorized `Voicing.from_shape`, building `shape` on every root at once.
+
+        Parameters
+        ----------
+        root_note_values : intlist
+            The values of the root `Note`s.
+        shape : Shape
+            The `Shape` to build on the roots.
+
+        Returns
+        -------
+        VoicingArray
+            A `Voicing` per root.
+        """
+        shifts = np.asarray(root_note_values, dtype=np.int64) + shape.offset
+        shape_bitmasks = np.full(shifts.shape, shape.bitmask, dtype=np.uint64)
+        return VoicingArray(shape_bitmasks) >> shifts
+
+    def to_voicings(self) -> list[Voicing]:
+        return [
+            Voicing.from_64bit_bitmask(bitmask) for bitmask in self.bitmasks.tolist()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.bitmasks)
+
+    def __iter__(self) -> Iterator[Voicing]:
+        return iter(self.to_voicings())
+
+    def __getitem__(
+        self, i: "int | slice | intlist | boollist"
+    ) -> "Voicing | VoicingArray":
+        if isinstance(i, (int, np.integer)):
+            return Voicing.from_64bit_bitmask(int(self.bitmasks[i]))
+        return VoicingArray(self.bitmasks[i])
+
+    def __lshift__(self, i: "int | intlist") -> "VoicingArray":
+        """Transposes all `Voicing`s down by `i` semitones, or each by its own amount.
+
+        Raises
+        ------
+        OverflowError
+            If any `Voicing` would leave the 64-note range.
+        """
+        return self >> -np.asarray(i, dtype=np.int64)
+
+    def __rshift__(self, i: "int | intlist") -> "VoicingArray":
+        """Transposes all `Voicing`s up by `i` semitones, or each by its own amount.
+
+        Raises
+        ------
+        OverflowError
+            If any `Voicing` would leave the 64-note range.
+        """
+        shifts = np.broadcast_to(np.asarray(i, dtype=np.int64), self.bitmasks.shape)
+        amounts = np.minimum(np.abs(shifts), 63).astype(np.uint64)
+        bitmasks = np.where(
+            shifts < 0, self.bitmasks >> amounts, self.bitmasks << amounts
+        )
+        out_of_range = (np.abs(shifts) > 63) & (self.bitmasks != 0)
+        if np.any(out_of_range) or np.any(
+            get_popcounts_64bit_bitmasks(bitmasks) != self.nr_of_notes
+        ):
+            raise OverflowError()
+        return VoicingArray(bitmasks)
+
+    def __str__(self) -> str:
+        return f"VoicingArray({self.to_voicings()})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def fits(self, to_fit: Combination | Pattern) -> boollist:
+        """Vectorized `Voicing.fits`."""
+        if isinstance(to_fit, Combination):
+            combination_bitmasks = self.combination_bitmasks
+            return combination_bitmasks & to_fit.bitmask == combination_bitmasks
+        else:  # Pattern
+            containment_matrix = get_pattern_tables().containment_matrix
+            return containment_matrix[to_fit.id][self.pattern_ids]
+
+    @property
+    def nr_of_notes(self) -> intlist:
+        return get_popcounts_64bit_bitmasks(self.bitmasks)
+
+    @property
+    def combination_bitmasks(self) -> int16list:
+        return voicing_bitmasks_to_combination_bitmasks(self.bitmasks)
+
+    @property
+    def combinations(self) -> list[Combination]:
+        return [
+            Combination._get_instance(bitmask)
+            for bitmask in self.combination_bitmasks.tolist()
+        ]
+
+    @property
+    def pattern_ids(self) -> intlist:
+        """The dense id of the `Pattern` of every `Voicing`, see `get_pattern_tables`."""
+        ids = np.array(get_pattern_tables().ids, dtype=np.intp)
+        return ids[self.combination_bitmasks]
+
+    @property
+    def patterns(self) -> list[Pattern]:
+        return [
+            Pattern.from_12bit_bitmask(bitmask)
+            for bitmask in self.combination_bitmasks.tolist()
+        ]
+
+    @property
+    def shape_bitmasks(self) -> int64list:
+        """The bitmasks of the `Shape`s of the `Voicing`s, i.e. shifted down to start at bit 0."""
+        lowest = np.minimum(get_lowest_set_bits_64bit_bitmasks(self.bitmasks), 63)
+        return self.bitmasks >> lowest.astype(np.uint64)
+
+    @property
+    def shapes(self) -> list[Shape]:
+        return [
+            Shape._from_64bit_bitmask_and_offset(bitmask, 0)
+            for bitmask in self.shape_bitmasks.tolist()
+        ]
@@ -0,0 +1,94 @@
+import unittest
+
+import src.util
+from src.caches import *
+from src.distribution import Distribution
+from src.metrics import diatonic_local
+from src.metrics.diatonic_local import get_fitting_rotations_table
+from src.note import C3, E3, G3
+from src.util import get_root_match_table
+
+
+class CachesTest(unittest.TestCase):
+    def test_get_cache_report(self):
+        # setup
+        distributions = [Distribution([C3, E3, G3]) for _ in range(10)]
+        for distribution in distributions[:4]:
+            _ = distribution.voicing
+        get_root_match_table(0b10010001)
+        get_root_match_table(0b10010001)
+
+        # create
+        report = {info.name: info for info in get_cache_report()}
+
+        # check
+        notes = report["src.note.Note._instances"]
+        self.assertEqual((notes.kind, notes.size, notes.hits), ("interned", 64, None))
+        self.assertEqual(report["src.pattern.Pattern._instances"].size, 352)
+
+        root_matches = report["src.util.get_root_match_table"]
+        self.assertEqual(root_matches.kind, "lru_cache")
+        self.assertGreaterEqual(root_matches.hits, 1)
+        self.assertEqual(root_matches.evictions, 0)
+        self.assertGreater(root_matches.nbytes, 4096 * 2)
+
+        voicings = report["src.distribution.Distribution._voicing"]
+        self.assertEqual(voicings.kind, "per-object")
+        self.assertGreaterEqual(voicings.size, 4)
+        self.assertGreaterEqual(voicings.maxsize, 10)
+
+    def test_get_approximate_size(self):
+        # setup
+        shared = list(range(1000))
+
+        # create
+        size = get_approximate_size([shared, shared])
+        shared_size = get_approximate_size(shared)
+
+        # check
+        self.assertGreater(size, shared_size)
+        self.assertLess(size, 2 * shared_size)
+
+    def test_clear_caches(self):
+        # setup
+        distribution = Distribution([C3, E3, G3])
+        _ = distribution.voicing
+        _ = distribution.pc_lanes
+        get_root_match_table(0b10010001)
+
+        # create
+        clear_caches(["src.distribution.Distribution._voicing"])
+
+        # check
+        self.assertIsNone(distribution._voicing)
+        self.assertIsNotNone(distribution._pc_lanes)
+        self.assertGreater(get_root_match_table.cache_info().currsize, 0)
+
+    def test_cap_cache(self):
+        # setup
+        original = src.util.get_fitting_rotations_table
+        name = "src.util.get_fitting_rotations_table"
+
+        # create
+        cap_cache(name, 2)
+        for bitmask in (0b1, 0b11, 0b111):
+            diatonic_local.get_fitting_rotations_table(bitmask)
+        report = {info.name: info for info in get_cache_report()}
+        entry_size = get_approximate_size(
+            [0b111, diatonic_local.get_fitting_rotations_table(0b111)]
+        )
+        cap_cache(name, None)
+
+        # check
+        self.assertEqual(report[name].maxsize, 2)
+        self.assertEqual(report[name].size, 2)
+        self.assertEqual(report[name].evictions, 1)
+        self.assertGreater(report[name].nbytes, entry_size)
+        self.assertIsNot(diatonic_local.get_fitting_rotations_table, original)
+        self.assertIs(
+            src.util.get_fitting_rotations_table,
+            diatonic_local.get_fitting_rotations_table,
+        )
+        self.assertIs(get_fitting_rotations_table, original)
+        with self.assertRaises(KeyError):
+            cap_cache("src.util.does_not_exist", 2)
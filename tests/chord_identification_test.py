@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from src.chord_identification import *
+from src.cum_pattern import *
+from src.note import *
+from src.pitch_class import *
+from src.voicing import Voicing
+
+
+class ChordIdentificationTest(unittest.TestCase):
+    def test_interpret(self):
+        # create
+        interpretations = interpret(Combination([C, E, G, B]))
+
+        # check
+        self.assertEqual(interpretations, (Interpretation(C, M7),))
+        self.assertEqual(str(interpretations[0]), "C maj7")
+        self.assertCountEqual(
+            interpret(Combination([C, E, G, A])),
+            [Interpretation(C, M6), Interpretation(A, m7)],
+        )
+        self.assertEqual(interpret(Combination([C, Df, D])), ())
+
+    def test_identify_voicing(self):
+        # create
+        identifications = identify_voicing(Voicing([B3, C4, E4, G4]))
+
+        # check
+        self.assertEqual(
+            identifications, (Identification(Interpretation(C, M7), B, 3),)
+        )
+        self.assertEqual(str(identifications[0]), "C maj7 / 3rd inversion")
+        self.assertEqual(str(identify_voicing(Voicing([C4, E4, G4]))[0]), "C maj")
+        self.assertEqual(identify_voicing(Voicing([])), ())
+
+    def test_identify(self):
+        # setup
+        voicings = [
+            Voicing([B3, C4, E4, G4]),
+            Voicing([E3, C4, G4]),
+            Voicing([]),
+            Voicing([C4, Df4]),
+            Voicing([B3, C4, E4, G4]),
+        ]
+
+        # create
+        identifications = identify(
+            np.array([voicing.bitmask for voicing in voicings], dtype=np.uint64)
+        )
+
+        # check
+        self.assertEqual(
+            identifications, [identify_voicing(voicing) for voicing in voicings]
+        )
+        self.assertEqual(str(identifications[1][0]), "C maj / 1st inversion")
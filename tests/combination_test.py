@@ -1,4 +1,5 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 from src.pattern import *
 from src.combination import Combination
@@ -56,3 +57,21 @@ class CombinationTest(unittest.TestCase):
         self.assertTrue(self.C_MAJOR.fits(MARY))
         self.assertTrue(self.C_MAJOR.fits(M7.pattern))
         self.assertFalse(self.C_MAJOR.fits(MINNY))
+
+    def test_interning_across_threads(self):
+        # setup
+        def get_all(_: int) -> list[Combination]:
+            return [
+                Combination([PitchClass(i) for i in range(12) if bitmask >> i & 1])
+                for bitmask in range(4096)
+            ]
+
+        # create
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(get_all, range(4)))
+
+        # check
+        for result in results:
+            for bitmask, combination in enumerate(result):
+                self.assertEqual(combination.bitmask, bitmask)
+                self.assertIs(combination, results[0][bitmask])
@@ -26,3 +26,14 @@ class CumPatternTest(unittest.TestCase):
 
     def test_equal(self):
         self.assertNotEqual(MAJOR, MINOR)
+
+    def test_interning(self):
+        self.assertIs(CumPattern([0, 4, 7]), MAJOR)
+        self.assertIs(CumPattern([12, 16, 19]), MAJOR)
+        self.assertIs(MINOR + 4, MAJOR + 3)
+        self.assertIs(IONIAN << 2, DORIAN)
+
+    def test_intervals_from_root(self):
+        self.assertEqual(MAJOR.intervals_from_root, (0, 4, 7))
+        self.assertIs(MAJOR.intervals_from_root, MAJOR.intervals_from_root)
+        self.assertEqual(list(DOM7), [0, 4, 7, 10])
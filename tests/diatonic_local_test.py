@@ -1,6 +1,7 @@
 import unittest
 
 from src.shape import *
+from src.cum_pattern import IONIAN
 from src.metrics.diatonic_local import DiatonicLocal
 from src.note import *
 from src.distribution import Distribution
@@ -93,3 +94,67 @@ class DiatonicLocalTest(unittest.TestCase):
         self.assertIsNotNone(outEf)
         if outEf is not None:
             self.assertAlmostEqual(outEf, 0)
+
+    def test_prune_multiple_scale_patterns(self):
+        # setup
+        HARMONIC_MINOR = Pattern([2, 1, 2, 2, 1, 3, 1])
+        diatonic_local = DiatonicLocal(scale_pattern=[IONIAN.pattern, HARMONIC_MINOR])
+        A2_MINOR = Distribution([A2, C3, E3])
+        E3_MAJOR = Distribution([E3, Gs3, B3])
+        Ef3_MAJOR = Distribution([Ef3, G3, Bf3])
+
+        history = [A2_MINOR]
+        diatonic_local.setup(history)
+
+        pruned = diatonic_local.prune({E3_MAJOR, Ef3_MAJOR})
+
+        # check
+        self.assertIn(E3_MAJOR, pruned)
+        self.assertNotIn(Ef3_MAJOR, pruned)
+
+        # check
+        diatonic_local = DiatonicLocal()
+        diatonic_local.setup(history)
+        self.assertNotIn(E3_MAJOR, diatonic_local.prune({E3_MAJOR, Ef3_MAJOR}))
+
+    def test_setup_incremental(self):
+        # setup
+        incremental = DiatonicLocal(2, 3)
+        C3_MAJOR = Distribution([C3, E3, G3])
+        progression = [C3_MAJOR >> d for d in (0, 5, 7, 2, 9, 10, 3)]
+        candidates = {C3_MAJOR >> d for d in range(12)}
+
+        history: list[Distribution] = []
+        for distribution in progression:
+            history.append(distribution)
+            incremental.setup(history)
+            from_scratch = DiatonicLocal(2, 3)
+            from_scratch.setup(list(history))
+
+            # check
+            self.assertEqual(
+                incremental.prune(candidates), from_scratch.prune(candidates)
+            )
+            for candidate in candidates:
+                self.assertEqual(
+                    incremental.score(candidate), from_scratch.score(candidate)
+                )
+
+    def test_setup_other_history_with_same_latest(self):
+        # setup
+        C3_MAJOR = Distribution([C3, E3, G3])
+        metric = DiatonicLocal(1, 3)
+        metric.setup([C3_MAJOR >> 1, C3_MAJOR >> 6, C3_MAJOR])
+        candidates = {C3_MAJOR >> d for d in range(12)}
+
+        # create
+        # Another history, of which the latest `Distribution` is the same object.
+        history = [C3_MAJOR >> 5, C3_MAJOR >> 7, C3_MAJOR]
+        metric.setup(history)
+        from_scratch = DiatonicLocal(1, 3)
+        from_scratch.setup(history)
+
+        # check
+        self.assertEqual(metric.prune(candidates), from_scratch.prune(candidates))
+        for candidate in candidates:
+            self.assertEqual(metric.score(candidate), from_scratch.score(candidate))
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from src.cum_pattern import *
+from src.distribution import Distribution
+from src.distribution_array import DistributionArray
+from src.note import *
+from src.shape import Shape
+
+DISTRIBUTIONS = [
+    Distribution([C4, E4, G4]),
+    Distribution([B3, D4, G4]),
+    Distribution([C4, F4, C5]),
+    Distribution([C4, C4, E4]),
+]
+
+
+class DistributionArrayTest(unittest.TestCase):
+    def test_conversion(self):
+        # create
+        distribution_array = DistributionArray.from_distributions(DISTRIBUTIONS)
+
+        # check
+        self.assertEqual(distribution_array.values.dtype, np.int8)
+        self.assertEqual(distribution_array.to_distributions(), DISTRIBUTIONS)
+        self.assertEqual(distribution_array[2], DISTRIBUTIONS[2])
+
+    def test_slicing(self):
+        # setup
+        distribution_array = DistributionArray.from_distributions(DISTRIBUTIONS)
+
+        # create
+        sliced = distribution_array[1:]
+        filtered = distribution_array[distribution_array.fits(M7.pattern)]
+
+        # check
+        self.assertTrue(np.shares_memory(sliced.values, distribution_array.values))
+        self.assertEqual(sliced.to_distributions(), DISTRIBUTIONS[1:])
+        self.assertEqual(
+            filtered.to_distributions(),
+            [d for d in DISTRIBUTIONS if d.fits(M7.pattern)],
+        )
+
+    def test_transposition(self):
+        # setup
+        distribution_array = DistributionArray.from_distributions(DISTRIBUTIONS)
+
+        # check
+        self.assertEqual(
+            (distribution_array >> 2).to_distributions(),
+            [distribution >> 2 for distribution in DISTRIBUTIONS],
+        )
+        with self.assertRaises(OverflowError):
+            distribution_array << 60
+
+    def test_from_shape(self):
+        # setup
+        shape = Shape([0, 4, 7, 12])
+
+        # create
+        distribution_array = DistributionArray.from_shape(np.array([24, 30]), shape)
+
+        # check
+        self.assertEqual(
+            distribution_array.to_distributions(),
+            [
+                Distribution.from_shape_and_root(Note(24), shape),
+                Distribution.from_shape_and_root(Note(30), shape),
+            ],
+        )
+
+    def test_derived(self):
+        # setup
+        distribution_array = DistributionArray.from_distributions(DISTRIBUTIONS)
+
+        # check
+        self.assertEqual(
+            distribution_array.voicings.to_voicings(),
+            [distribution.voicing for distribution in DISTRIBUTIONS],
+        )
+        self.assertEqual(
+            distribution_array.combinations,
+            [distribution.combination for distribution in DISTRIBUTIONS],
+        )
+        self.assertEqual(
+            distribution_array.fits(MAJOR.pattern, optimise_pc_spread=True).tolist(),
+            [d.fits(MAJOR.pattern, optimise_pc_spread=True) for d in DISTRIBUTIONS],
+        )
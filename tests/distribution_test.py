@@ -1,11 +1,21 @@
+import pickle
+import sys
+import threading
 import unittest
 
+import numpy as np
+
 from src.combination import Combination
 from src.cum_pattern import *
 from src.note import *
 from src.shape import *
 from src.pitch_class import *
-from src.distribution import Distribution
+from src.distribution import (
+    Distribution,
+    get_distributions,
+    get_pc_lanes,
+    have_optimal_pc_spread,
+)
 
 
 class DistributionTest(unittest.TestCase):
@@ -47,3 +57,146 @@ class DistributionTest(unittest.TestCase):
         self.assertFalse(C4_MAJOR.fits(Combination.from_cum(C, MINOR)))
         self.assertFalse(C4_MAJOR_OCT.fits(Combination.from_cum(C, MINOR)))
         self.assertFalse(C4_MAJOR_OCT_.fits(Combination.from_cum(C, MINOR)))
+
+    def test_have_optimal_pc_spread(self):
+        # setup
+        distributions = [
+            Distribution([C4, E4, G4, C5]),
+            Distribution([C3, C4, E4, C5]),
+            Distribution([C4, E4, G4, B4]),
+        ]
+        note_values = np.array([[note.value for note in d] for d in distributions])
+
+        # create
+        pc_lanes = get_pc_lanes(note_values)
+        spread_4 = have_optimal_pc_spread(note_values, 4)
+        spread_per_distribution = have_optimal_pc_spread(note_values, [3, 3, 4])
+        spread_3 = have_optimal_pc_spread(note_values, 3)
+
+        # check
+        self.assertEqual(pc_lanes.tolist(), [list(d.pc_lanes) for d in distributions])
+        self.assertEqual(spread_4.tolist(), [False, False, True])
+        self.assertEqual(spread_per_distribution.tolist(), [True, False, True])
+        self.assertEqual(spread_3.tolist(), [True, False, False])
+        with self.assertRaises(ValueError):
+            distributions[2].has_optimal_pc_spread(3)
+
+    def test_pc_count(self):
+        # setup
+        distribution = Distribution([C3, C4, E4, G4])
+
+        # create
+        pc_count = distribution.pc_count
+
+        # check
+        self.assertEqual(pc_count, {C: 2, E: 1, G: 1})
+        self.assertIs(distribution.pc_count, pc_count)
+        with self.assertRaises(TypeError):
+            pc_count[D] = 1  # type: ignore[index]
+
+    def test_pickle(self):
+        # setup
+        distribution = Distribution([C3, C3, E4, G4])
+        interned = [C3, D, Combination.from_cum(C, MAJOR), MAJOR.pattern]
+        others = [M7, Shape([0, 4, 7]), distribution.voicing, distribution]
+
+        # create
+        unpickled_interned = pickle.loads(pickle.dumps(interned))
+        unpickled_others = pickle.loads(pickle.dumps(others))
+
+        # check
+        for original, unpickled in zip(interned, unpickled_interned):
+            self.assertIs(unpickled, original)
+        self.assertEqual(unpickled_others, others)
+        self.assertIs(unpickled_others[3][0], C3)
+
+    def test_packed(self):
+        # setup
+        distribution = Distribution([C4, E4, G4, C4])
+
+        # check
+        self.assertEqual(
+            distribution.values, bytes([C4.value, E4.value, G4.value, C4.value])
+        )
+        self.assertEqual(distribution.notes, [C4, E4, G4, C4])
+        self.assertEqual(list(distribution), [C4, E4, G4, C4])
+        self.assertEqual(distribution[1], E4)
+        self.assertEqual(len(distribution), 4)
+        self.assertEqual(distribution, Distribution([C4, E4, G4, C4]))
+        self.assertNotEqual(distribution, Distribution([C4, E4, G4]))
+        self.assertEqual(hash(distribution), hash((C4, E4, G4, C4)))
+        self.assertEqual(distribution + E4, Distribution([C4, E4, G4, C4, E4]))
+        self.assertEqual(distribution >> 2, Distribution([D4, Fs4, A4, D4]))
+        self.assertEqual(
+            distribution.voicing.bitmask, C4.bitmask | E4.bitmask | G4.bitmask
+        )
+        with self.assertRaises(OverflowError):
+            Distribution([C4, E4]) << 64
+        with self.assertRaises(OverflowError):
+            Distribution([C4, E4]) >> 64
+
+    def test_interning(self):
+        # create
+        Distribution.enable_interning()
+        try:
+            distribution1 = Distribution([C4, E4, G4])
+            distribution2 = Distribution([C4, E4]) + G4
+            unpickled = pickle.loads(pickle.dumps(distribution1))
+        finally:
+            Distribution.disable_interning()
+        distribution3 = Distribution([C4, E4, G4])
+
+        # check
+        self.assertIs(distribution1, distribution2)
+        self.assertIs(distribution1, unpickled)
+        self.assertIsNot(distribution1, distribution3)
+        self.assertEqual(distribution1, distribution3)
+
+    def test_interning_across_threads(self):
+        # setup
+        note_values = [
+            bytes([a, b, c]) for a in range(12) for b in range(12) for c in range(3)
+        ]
+        barrier = threading.Barrier(8)
+        results: list[list[Distribution]] = []
+
+        def create() -> None:
+            barrier.wait()
+            results.append(
+                [Distribution._from_note_values_bytes(values) for values in note_values]
+            )
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        switch_interval = sys.getswitchinterval()
+
+        # create
+        Distribution.enable_interning()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+            Distribution.disable_interning()
+
+        # check
+        for result in results[1:]:
+            for distribution1, distribution2 in zip(results[0], result):
+                self.assertIs(distribution1, distribution2)
+
+    def test_get_distributions(self):
+        # setup
+        note_values = np.array(
+            [[C4.value, E4.value], [D4.value, F4.value]], dtype=np.int8
+        )
+
+        # create
+        distributions = get_distributions(note_values)
+
+        # check
+        self.assertEqual(
+            distributions, [Distribution([C4, E4]), Distribution([D4, F4])]
+        )
+        self.assertEqual(get_distributions(np.zeros((2, 0))), [Distribution([])] * 2)
@@ -0,0 +1,56 @@
+import unittest
+
+from src.distribution import Distribution
+from src.metrics.hang import Hang
+from src.note import *
+
+
+class HangTest(unittest.TestCase):
+    def test_prune(self):
+        # setup
+        hang = Hang((D2, [A2, C3, E3, G3, C4, A3, F3, D3, Bf2]))
+        TWO = Distribution([D2, C4])
+        THREE_PAIR = Distribution([D2, A2, C3])
+        THREE_PAIR_WRAPPED = Distribution([F3, Bf2, A2])
+        THREE_NO_PAIR = Distribution([D2, A2, E3])
+        FOUR_TWO_PAIRS = Distribution([A2, C3, G3, C4])
+        FOUR_OVERLAPPING_PAIRS = Distribution([D2, A2, C3, E3])
+        FIVE = Distribution([A2, C3, E3, G3, C4])
+        UNAVAILABLE = Distribution([D2, B2])
+
+        candidates = {
+            TWO,
+            THREE_PAIR,
+            THREE_PAIR_WRAPPED,
+            THREE_NO_PAIR,
+            FOUR_TWO_PAIRS,
+            FOUR_OVERLAPPING_PAIRS,
+            FIVE,
+            UNAVAILABLE,
+        }
+        pruned = hang.prune(candidates)
+
+        # check
+        self.assertCountEqual(
+            pruned, [TWO, THREE_PAIR, THREE_PAIR_WRAPPED, FOUR_TWO_PAIRS]
+        )
+
+    def test_prune_without_playability(self):
+        # setup
+        hang = Hang(require_playability=False)
+        FIVE = Distribution([A2, C3, E3, G3, C4])
+        UNAVAILABLE = Distribution([D2, B2])
+
+        pruned = hang.prune({FIVE, UNAVAILABLE})
+
+        # check
+        self.assertCountEqual(pruned, [FIVE])
+
+    def test_require_pair_alias(self):
+        # create
+        with self.assertWarns(DeprecationWarning):
+            hang = Hang(require_pair=False)
+
+        # check
+        self.assertFalse(hang.require_playability)
+        self.assertFalse(hang.require_pair)
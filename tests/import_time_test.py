@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = (
+    "librosa",
+    "scipy",
+    "matplotlib",
+    "sounddevice",
+    "mido",
+    "IPython",
+    "ipywidgets",
+)
+
+# `src.guitar_practice` only uses the heavy modules once an exercise is recorded or played.
+LIGHT_MODULES = (
+    "src.guitar_practice",
+    "src.stochastic_distribution_engine",
+    "src.metrics.diatonic_local",
+    "src.metrics.hang",
+    "src.metrics.individual_steps",
+    "src.metrics.internal_interval_range",
+    "src.metrics.legal_chord_changes",
+    "src.metrics.legal_notes",
+    "src.metrics.legal_patterns",
+    "src.metrics.legal_range",
+    "src.metrics.legal_ranges",
+    "src.metrics.no_combination_reps",
+    "src.metrics.no_dup_notes",
+    "src.metrics.within_combination",
+    "src.metrics.within_octave",
+)
+
+# Generous, so that it only catches regressions like a heavy dependency sneaking back in.
+IMPORT_TIME_BUDGET_SEC = 1.0
+
+SCRIPT = f"""
+import importlib, json, sys, time
+start_time = time.perf_counter()
+for module in {LIGHT_MODULES!r}:
+    importlib.import_module(module)
+import_time = time.perf_counter() - start_time
+heavy = [module for module in {HEAVY_MODULES!r} if module in sys.modules]
+print(json.dumps({{"import_time": import_time, "heavy": heavy}}))
+"""
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_light_import(self):
+        # create
+        # A fresh interpreter, so that nothing has been imported yet.
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output)
+
+        # check
+        self.assertEqual(result["heavy"], [])
+        self.assertLess(result["import_time"], IMPORT_TIME_BUDGET_SEC)
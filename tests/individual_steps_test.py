@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from src.shape import *
 from src.metrics.individual_steps import IndividualSteps
 from src.note import *
@@ -21,6 +23,29 @@ class IndividualStepsTest(unittest.TestCase):
         # check
         self.assertEqual(len(allowed), 125)
 
+    def test_get_allowed_order(self):
+        # setup
+        individual_steps = IndividualSteps(0, 2, 1)
+        C3_MAJOR = Distribution([C3, E3, G3])
+        individual_steps.setup([C3_MAJOR])
+
+        # The nested loops `get_allowed` used to run, of which seeded runs depend on the order.
+        expected: set[Distribution] = {Distribution([])}
+        for ref_note in C3_MAJOR:
+            new_expected: set[Distribution] = set()
+            for partial_distribution in expected:
+                for d in range(3):
+                    new_expected.add(partial_distribution + (ref_note + d))
+                    if d:
+                        new_expected.add(partial_distribution + (ref_note - d))
+            expected = new_expected
+
+        # create
+        allowed = individual_steps.get_allowed()
+
+        # check
+        self.assertEqual(list(allowed), list(expected))
+
     def test_prune1(self):
         # setup
         individual_steps = IndividualSteps(0, 2, 1)
@@ -83,3 +108,44 @@ class IndividualStepsTest(unittest.TestCase):
         self.assertIsNotNone(outA)
         if outA is not None:
             self.assertAlmostEqual(outA, 0)
+
+    def test_get_allowed_array(self):
+        # setup
+        individual_steps = IndividualSteps(0, 2, 1)
+        C0_MAJOR = Distribution([C0, E0, G0])
+
+        history = [C0_MAJOR]
+        individual_steps.setup(history)
+
+        # create
+        allowed_array = individual_steps.get_allowed_array()
+        allowed = individual_steps.get_allowed()
+
+        # check
+        self.assertEqual(allowed_array.shape, (75, 3))
+        self.assertEqual(allowed_array.min(), 0)
+        self.assertEqual(len(allowed), 75)
+        self.assertIn(Distribution([C0, D0, A0]), allowed)
+
+    def test_score_array(self):
+        # setup
+        individual_steps = IndividualSteps(0, 3, 1)
+        C3_MAJOR = Distribution([C3, E3, G3])
+        F3_MAJOR = Distribution([C3, F3, A3])
+        G3_MAJOR = Distribution([G3, B3, D4])
+        A2_MAJOR = Distribution([A2, Cs3, E3])
+        candidates = [C3_MAJOR, F3_MAJOR, G3_MAJOR, A2_MAJOR]
+
+        history = [C3_MAJOR]
+        individual_steps.setup(history)
+
+        # create
+        values = np.array([[note.value for note in c] for c in candidates])
+        allows = individual_steps.allows_array(values)
+        scores = individual_steps.score_array(values)
+
+        # check
+        self.assertEqual(allows.tolist(), [True, True, False, True])
+        self.assertAlmostEqual(scores[0], 1 / 2)
+        self.assertAlmostEqual(scores[1], 2 / 3)
+        self.assertAlmostEqual(scores[3], 0)
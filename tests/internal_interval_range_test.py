@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from src.distribution import Distribution
+from src.metrics.internal_interval_range import InternalIntervalRange
+from src.metrics.within_octave import WithinOctave
+from src.note import *
+
+
+class InternalIntervalRangeTest(unittest.TestCase):
+    def test_prune(self):
+        # setup
+        internal_interval_range = InternalIntervalRange(3, 5)
+        C3_MAJOR = Distribution([C3, E3, G3])
+        C3_MAJOR_OPEN = Distribution([C3, G3, E4])
+        C3_MAJOR_UNORDERED = Distribution([G3, C3, E3])
+        C3_MAJOR_DUP = Distribution([C3, E3, E3])
+
+        candidates = {C3_MAJOR, C3_MAJOR_OPEN, C3_MAJOR_UNORDERED, C3_MAJOR_DUP}
+        pruned = internal_interval_range.prune(candidates)
+
+        # check
+        self.assertCountEqual(pruned, [C3_MAJOR, C3_MAJOR_UNORDERED])
+        self.assertIn(C3_MAJOR_DUP, InternalIntervalRange(0, 4).prune(candidates))
+
+    def test_allows_voicing_bitmasks(self):
+        # setup
+        internal_interval_range = InternalIntervalRange(3, 5)
+        within_octave = WithinOctave()
+        candidates = [
+            Distribution([C3, E3, G3]),
+            Distribution([C3, G3, E4]),
+            Distribution([C3, E3, E3]),
+            Distribution([C3, Ef3, Gf3, A3, C4]),
+        ]
+        voicing_bitmasks = np.array([int(c.voicing.bitmask) for c in candidates])
+        nr_of_notes = np.array([len(c) for c in candidates])
+
+        # create
+        allows_internal = internal_interval_range.allows_voicing_bitmasks(
+            voicing_bitmasks, nr_of_notes
+        )
+        allows_octave = within_octave.allows_voicing_bitmasks(voicing_bitmasks)
+
+        # check
+        self.assertEqual(allows_internal.tolist(), [True, False, False, True])
+        self.assertEqual(allows_octave.tolist(), [True, False, True, False])
+        for candidate, allowed in zip(candidates, allows_internal):
+            self.assertEqual(
+                internal_interval_range.score(candidate) is not None, allowed
+            )
+        for candidate, allowed in zip(candidates, allows_octave):
+            self.assertEqual(within_octave.score(candidate) is not None, allowed)
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from src.shape import *
 from src.metrics.no_combination_reps import NoCombinationReps
 from src.note import *
@@ -51,3 +53,81 @@ class NoCombinationRepsTest(unittest.TestCase):
         self.assertIsNotNone(out3)
         if out3 is not None:
             self.assertAlmostEqual(out3, 1)
+
+    def test_score_combination_bitmasks(self):
+        # setup
+        no_combination_reps = NoCombinationReps(1, 3)
+        C3_MAJOR = Distribution([C3, E3, G3])
+        F3_MAJOR = Distribution([F3, A3, C4])
+        G3_MAJOR = Distribution([G3, B3, D4])
+        C4_MAJOR = Distribution([C4, E4, G4])
+        candidates = [C3_MAJOR, F3_MAJOR, G3_MAJOR, C4_MAJOR >> 2]
+
+        history = [G3_MAJOR, C3_MAJOR]
+        no_combination_reps.setup(history)
+        history.append(F3_MAJOR)
+        no_combination_reps.setup(history)
+
+        # create
+        out = no_combination_reps.score_combination_bitmasks(
+            np.array([int(c.combination.bitmask) for c in candidates])
+        )
+
+        # check
+        for candidate, score in zip(candidates, out):
+            expected = no_combination_reps.score_assuming_pruned(candidate)
+            if expected is None:
+                self.assertTrue(np.isnan(score))
+            else:
+                self.assertAlmostEqual(score, expected)
+        self.assertTrue(np.isnan(out[1]))
+        self.assertAlmostEqual(out[0], 0)
+        self.assertAlmostEqual(out[2], 1 / 2)
+        self.assertAlmostEqual(out[3], 1)
+
+    def test_setup_rebuild_matches_incremental(self):
+        # setup
+        C3_MAJOR = Distribution([C3, E3, G3])
+        F3_MAJOR = Distribution([F3, A3, C4])
+        G3_MAJOR = Distribution([G3, B3, D4])
+        C4_MAJOR = Distribution([C4, E4, G4])
+        candidates = [C3_MAJOR, F3_MAJOR, G3_MAJOR, C4_MAJOR >> 2]
+        history = [C3_MAJOR, F3_MAJOR, G3_MAJOR, C4_MAJOR >> 2, C4_MAJOR]
+
+        incremental = NoCombinationReps(1, 3)
+        for i in range(1, len(history) + 1):
+            incremental.setup(history[:i])
+        rebuilt = NoCombinationReps(1, 3)
+        rebuilt.setup(history)
+
+        # create
+        out_incremental = [incremental.score(c) for c in candidates]
+        out_rebuilt = [rebuilt.score(c) for c in candidates]
+
+        # check
+        self.assertEqual(out_incremental, out_rebuilt)
+        self.assertEqual(out_rebuilt, [None, 1, 1 / 2, 0])
+
+    def test_min_lookback_above_max_lookback(self):
+        # setup
+        C3_MAJOR = Distribution([C3, E3, G3])
+        F3_MAJOR = Distribution([F3, A3, C4])
+        G3_MAJOR = Distribution([G3, B3, D4])
+        C4_MAJOR = Distribution([C4, E4, G4])
+        candidates = [C3_MAJOR, F3_MAJOR, G3_MAJOR, C4_MAJOR >> 2]
+        history = [C3_MAJOR, F3_MAJOR, G3_MAJOR, C4_MAJOR >> 2, C4_MAJOR]
+
+        incremental = NoCombinationReps(3, 2)
+        for i in range(1, len(history) + 1):
+            incremental.setup(history[:i])
+        rebuilt = NoCombinationReps(3, 2)
+        rebuilt.setup(history)
+
+        # create
+        out_incremental = [incremental.score(c) for c in candidates]
+        out_rebuilt = [rebuilt.score(c) for c in candidates]
+
+        # check
+        # Only the latest `max_lookback` are enforced, and there's nothing to reward.
+        self.assertEqual(out_incremental, out_rebuilt)
+        self.assertEqual(out_rebuilt, [None, 0, 0, None])
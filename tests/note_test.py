@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+
+from src.note import *
+
+
+class NoteTest(unittest.TestCase):
+    def test_note_values_to_freqs(self):
+        # setup
+        notes = [C0, A3, Ef5]
+
+        # create
+        freqs = note_values_to_freqs(np.array([note.value for note in notes]))
+
+        # check
+        self.assertEqual(freqs.tolist(), [note.freq for note in notes])
+        self.assertAlmostEqual(A3.freq, 440, places=2)
+
+    def test_freqs_to_note_values(self):
+        # setup
+        freqs = np.array([440.0, 440 * 2 ** (0.3 / 12), 440 * 2 ** (-0.2 / 12), 40.0])
+
+        # create
+        note_values, cents = freqs_to_note_values(freqs)
+
+        # check
+        self.assertEqual(
+            note_values.tolist(), [Note.from_freq(f).value for f in freqs.tolist()]
+        )
+        self.assertEqual(note_values[:3].tolist(), [A3.value] * 3)
+        np.testing.assert_allclose(cents[:3], [0, 30, -20], atol=0.1)
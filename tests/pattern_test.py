@@ -3,6 +3,7 @@ import unittest
 from src.pitch_class import *
 from src.cum_pattern import *
 from src.pattern import *
+from src.util import get_pattern_tables
 
 
 class PatternTest(unittest.TestCase):
@@ -16,3 +17,37 @@ class PatternTest(unittest.TestCase):
         self.assertTrue(MAJOR.pattern in DOM7.pattern)
         self.assertTrue(DIM.pattern in DOM7.pattern)
         self.assertFalse(MINOR.pattern in DOM7.pattern)
+
+    def test_containment_matrix(self):
+        # setup
+        pattern_tables = get_pattern_tables()
+        patterns = [
+            Pattern.from_12bit_bitmask(bitmask)
+            for bitmask in pattern_tables.normal_forms
+        ]
+
+        # check
+        self.assertEqual(len(patterns), 352)
+        self.assertEqual([pattern.id for pattern in patterns], list(range(352)))
+        for outer in patterns:
+            for inner in patterns:
+                expected = any(
+                    outer.bitmask & rotation == rotation for rotation in inner.rotations
+                )
+                self.assertEqual(inner in outer, expected)
+                self.assertEqual(
+                    pattern_tables.containment_matrix[outer.id, inner.id], expected
+                )
+
+    def test_contains_12bit_bitmask(self):
+        for bitmask in range(4096):
+            self.assertEqual(
+                M7.pattern.contains_12bit_bitmask(bitmask),
+                Pattern.from_12bit_bitmask(bitmask) in M7.pattern,
+            )
+
+    def test_interning(self):
+        for bitmask in range(4096):
+            pattern = Pattern.from_12bit_bitmask(bitmask)
+            for rotation in pattern.rotations:
+                self.assertIs(Pattern.from_12bit_bitmask(rotation), pattern)
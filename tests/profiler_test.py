@@ -0,0 +1,409 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+
+import src.profiler
+from src.distribution import Distribution
+from src.metrics.individual_steps import IndividualSteps
+from src.metrics.no_dup_notes import NoDupNotes
+from src.note import C3, E3
+from src.profiler import *
+from src.stochastic_distribution_engine import StochasticDistributionEngine
+
+
+class Dummy(metaclass=TimingMeta):
+    def __init__(self, value: int):
+        self.value = value
+
+    def double(self) -> int:
+        return self.value * 2
+
+    def quadruple(self) -> int:
+        return Dummy(self.double()).double()
+
+    @staticmethod
+    def triple(value: int) -> int:
+        return value * 3
+
+
+ORIGINAL_DOUBLE = Dummy.double
+
+
+def double_in_worker(nr_of_calls: int) -> TimingSnapshot:
+    enable_profiling()
+    for value in range(nr_of_calls):
+        Dummy(value).double()
+    return take_snapshot(worker=f"worker {nr_of_calls}")
+
+
+def busy_loop(duration: float) -> None:
+    start = perf_counter()
+    while perf_counter() - start < duration:
+        pass
+
+
+class ProfilerTest(unittest.TestCase):
+    def tearDown(self):
+        disable_profiling()
+        clear_timings()
+        clear_spans()
+
+    def test_disabled_by_default(self):
+        # create
+        Dummy(1).double()
+
+        # check
+        self.assertIs(Dummy.double, ORIGINAL_DOUBLE)
+        self.assertNotIn(Dummy, class_timings)
+
+    def test_enable_and_disable(self):
+        # create
+        enable_profiling()
+        self.assertEqual(Dummy(2).double(), 4)
+        self.assertEqual(Dummy.triple(2), 6)
+        timings = dict(class_timings[Dummy])
+        disable_profiling()
+        Dummy(3).double()
+
+        # check
+        self.assertEqual(timings["double"][1], 1)
+        self.assertEqual(timings["triple"][1], 1)
+        self.assertEqual(timings["__init__"][1], 1)
+        self.assertIs(Dummy.double, ORIGINAL_DOUBLE)
+        self.assertEqual(class_timings[Dummy]["double"][1], 1)
+
+    def test_instrument_class(self):
+        # setup
+        class Plain:
+            def method(self) -> int:
+                return 1
+
+        # create
+        instrument_class(Plain)
+        instrument_class(Plain)
+        Plain().method()
+        uninstrument_class(Plain)
+        Plain().method()
+
+        # check
+        self.assertEqual(class_timings[Plain]["method"][1], 1)
+
+    def test_record_spans(self):
+        # create
+        enable_profiling(record_spans=True)
+        self.assertEqual(Dummy(1).quadruple(), 4)
+
+        # check
+        names = [span.name for span in recorded_spans]
+        self.assertEqual(
+            names,
+            [
+                "Dummy.__init__",
+                "Dummy.quadruple",
+                "Dummy.double",
+                "Dummy.__init__",
+                "Dummy.double",
+            ],
+        )
+        parents = [span.parent for span in recorded_spans]
+        self.assertEqual(parents, [-1, -1, 1, 1, 1])
+        self.assertEqual(class_timings[Dummy]["double"][1], 2)
+
+    def test_record_spans_from_threads(self):
+        # setup
+        enable_profiling(record_spans=True)
+
+        def run() -> None:
+            for _ in range(200):
+                Dummy(1).quadruple()
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+
+        # create
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # check
+        self.assertEqual(len(recorded_spans), 4 * 200 * 5)
+        for index, span in enumerate(recorded_spans):
+            self.assertIsNotNone(span)
+            if span is not None and span.parent != -1:
+                parent = recorded_spans[span.parent]
+                self.assertLess(span.parent, index)
+                self.assertEqual(getattr(parent, "thread_id", None), span.thread_id)
+
+    def test_max_spans(self):
+        # create
+        enable_profiling(record_spans=True, max_spans=3)
+        Dummy(1).quadruple()
+        Dummy(1).quadruple()
+
+        # check
+        names = [span.name for span in recorded_spans if span is not None]
+        self.assertEqual(names, ["Dummy.__init__", "Dummy.quadruple", "Dummy.double"])
+        self.assertEqual(class_timings[Dummy]["double"][1], 4)
+
+    def test_not_recording_spans_by_default(self):
+        # create
+        enable_profiling()
+        Dummy(1).quadruple()
+
+        # check
+        self.assertEqual(recorded_spans, [])
+
+    def test_get_collapsed_stacks(self):
+        # create
+        enable_profiling(record_spans=True)
+        Dummy(1).quadruple()
+        collapsed = get_collapsed_stacks()
+        total = sum(span.duration for span in recorded_spans if span.parent == -1)
+
+        # check
+        self.assertEqual(
+            set(collapsed),
+            {
+                "Dummy.__init__",
+                "Dummy.quadruple",
+                "Dummy.quadruple;Dummy.double",
+                "Dummy.quadruple;Dummy.__init__",
+            },
+        )
+        self.assertAlmostEqual(sum(collapsed.values()), total)
+
+    def test_exports(self):
+        # setup
+        enable_profiling(record_spans=True)
+        Dummy(1).quadruple()
+
+        with tempfile.TemporaryDirectory() as directory:
+            # create
+            chrome_path = os.path.join(directory, "trace.json")
+            speedscope_path = os.path.join(directory, "profile.speedscope.json")
+            collapsed_path = os.path.join(directory, "stacks.txt")
+            export_chrome_trace(chrome_path)
+            export_speedscope(speedscope_path)
+            export_collapsed_stacks(collapsed_path)
+            with open(chrome_path) as f:
+                chrome_trace = json.load(f)
+            with open(speedscope_path) as f:
+                speedscope = json.load(f)
+            with open(collapsed_path) as f:
+                collapsed_lines = f.read().splitlines()
+
+        # check
+        self.assertEqual(len(chrome_trace["traceEvents"]), 5)
+        self.assertTrue(all(e["ph"] == "X" for e in chrome_trace["traceEvents"]))
+
+        frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+        events = speedscope["profiles"][0]["events"]
+        self.assertEqual(len(speedscope["profiles"]), 1)
+        self.assertEqual(len(events), 10)
+        depth = 0
+        for event in events:
+            depth += 1 if event["type"] == "O" else -1
+            self.assertGreaterEqual(depth, 0)
+        self.assertEqual(depth, 0)
+        self.assertEqual(frames[events[2]["frame"]], "Dummy.quadruple")
+        self.assertEqual([e["at"] for e in events], sorted(e["at"] for e in events))
+
+        self.assertEqual(len(collapsed_lines), 4)
+        self.assertTrue(collapsed_lines[0].startswith("Dummy.__init__ "))
+
+    def test_latency_histogram(self):
+        # setup
+        histogram = LatencyHistogram(buckets_per_octave=16)
+        durations = [i * 1e-6 for i in range(1, 1001)]
+
+        # create
+        for duration in durations:
+            histogram.record(duration)
+        summary = histogram.summary()
+
+        # check
+        precision = 2 ** (1 / 16)
+        self.assertEqual(summary["count"], 1000)
+        self.assertAlmostEqual(summary["total"], sum(durations))
+        self.assertEqual(summary["max"], 1e-3)
+        for p, expected in (("p50", 500e-6), ("p90", 900e-6), ("p99", 990e-6)):
+            self.assertGreaterEqual(summary[p], expected)
+            self.assertLessEqual(summary[p], expected * precision)
+
+    def test_latency_histogram_tiny_durations(self):
+        # setup
+        histogram = LatencyHistogram()
+
+        # create
+        histogram.record(0.0)
+        histogram.record(1e-10)
+
+        # check
+        self.assertEqual(histogram.percentile(100), 1e-10)
+        self.assertEqual(LatencyHistogram().percentile(50), 0)
+
+    def test_get_timing_report(self):
+        # create
+        enable_profiling(buckets_per_octave=4)
+        for value in range(10):
+            Dummy(value).double()
+        report = get_timing_report()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "timings.json")
+            export_timing_report(path)
+            with open(path) as f:
+                exported = json.load(f)
+
+        # check
+        self.assertEqual(report["Dummy"]["double"]["count"], 10)
+        self.assertEqual(class_histograms[Dummy]["double"].buckets_per_octave, 4)
+        self.assertLessEqual(
+            report["Dummy"]["double"]["p50"], report["Dummy"]["double"]["max"]
+        )
+        self.assertEqual(exported, report)
+
+    def test_take_snapshot(self):
+        # setup
+        enable_profiling()
+        Dummy(1).double()
+
+        # create
+        snapshot = pickle.loads(pickle.dumps(take_snapshot("worker")))
+
+        # check
+        self.assertEqual(snapshot.worker, "worker")
+        self.assertEqual(snapshot.timings["Dummy"]["double"][1], 1)
+        self.assertEqual(snapshot.histograms["Dummy"]["double"].count, 1)
+        self.assertNotIn(Dummy, class_timings)
+
+    def test_merge_snapshots(self):
+        # setup
+        enable_profiling()
+        snapshots: list[TimingSnapshot] = []
+        for worker, nr_of_calls in (("a", 1), ("b", 2), ("a", 3)):
+            for value in range(nr_of_calls):
+                Dummy(value).double()
+            snapshots.append(take_snapshot(worker))
+
+        # create
+        merged = merge_snapshots(snapshots)
+        report = get_merged_timing_report(snapshots)
+        with redirect_stdout(StringIO()) as output:
+            report_merged_timings(snapshots)
+
+        # check
+        self.assertEqual(merged.timings["Dummy"]["double"][1], 6)
+        self.assertEqual(merged.histograms["Dummy"]["double"].count, 6)
+        self.assertEqual(report["Dummy"]["double"]["count"], 6)
+        self.assertEqual(report["Dummy"]["double"]["per_worker"]["a"]["count"], 4)
+        self.assertEqual(report["Dummy"]["double"]["per_worker"]["b"]["count"], 2)
+        self.assertIn("        a: ", output.getvalue())
+
+    def test_merge_snapshots_with_different_resolutions(self):
+        # setup
+        enable_profiling(buckets_per_octave=4)
+        Dummy(1).double()
+        snapshot1 = take_snapshot()
+        enable_profiling(buckets_per_octave=8)
+        Dummy(1).double()
+        snapshot2 = take_snapshot()
+
+        # check
+        with self.assertRaises(ValueError):
+            merge_snapshots([snapshot1, snapshot2])
+
+    def test_snapshots_from_worker_processes(self):
+        # create
+        with ProcessPoolExecutor(2) as executor:
+            snapshots = list(executor.map(double_in_worker, [2, 5]))
+        report = get_merged_timing_report(snapshots)
+
+        # check
+        self.assertEqual(report["Dummy"]["double"]["count"], 7)
+        self.assertEqual(
+            report["Dummy"]["double"]["per_worker"]["worker 5"]["count"], 5
+        )
+        self.assertNotIn(Dummy, class_timings)
+
+    def test_sampling_profiler(self):
+        # setup
+        switch_interval = sys.getswitchinterval()
+
+        # create
+        with SamplingProfiler(interval=0.001):
+            default_switch_interval = sys.getswitchinterval()
+        with SamplingProfiler(interval=0.001, lower_switch_interval=True) as profiler:
+            lowered_switch_interval = sys.getswitchinterval()
+            mark_phase("prune")
+            busy_loop(0.1)
+            mark_phase(None)
+        report = profiler.get_report()
+        with redirect_stdout(StringIO()) as output:
+            profiler.report()
+
+        # check
+        self.assertEqual(default_switch_interval, switch_interval)
+        self.assertLess(lowered_switch_interval, switch_interval)
+        self.assertEqual(sys.getswitchinterval(), switch_interval)
+        self.assertGreater(profiler.nr_of_samples, 10)
+        busy_loop_name = next(name for name in report["prune"] if "busy_loop" in name)
+        busy_loop_timing = report["prune"][busy_loop_name]
+        self.assertGreater(busy_loop_timing["samples"], profiler.nr_of_samples / 2)
+        self.assertGreater(busy_loop_timing["self"], 0.05)
+        self.assertLessEqual(busy_loop_timing["samples"], profiler.nr_of_samples)
+        test_name = next(
+            name for name in report["prune"] if "test_sampling_profiler" in name
+        )
+        self.assertEqual(report["prune"][test_name]["samples"], 0)
+        self.assertGreater(report["prune"][test_name]["inclusive"], 0.05)
+        self.assertIn("prune:", output.getvalue())
+        self.assertIn(busy_loop_name, output.getvalue())
+
+    def test_phase_reset_when_metric_raises(self):
+        # setup
+        class FailingMetric(NoDupNotes):
+            def prune(self, distributions):
+                raise ValueError
+
+        engine = StochasticDistributionEngine(
+            IndividualSteps(0, 1), [FailingMetric()], Distribution([C3, E3])
+        )
+
+        # create
+        with self.assertRaises(ValueError):
+            engine.get_next()
+
+        # check
+        self.assertIsNone(src.profiler._current_phase)
+
+    def test_env_var(self):
+        # create
+        # A fresh interpreter, as the environment variable is read on import.
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "from src.note import C3; from src.profiler import class_timings; "
+                    "C3 + 4; print(sorted(class_timings[type(C3)]))"
+                ),
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env={**os.environ, PROFILING_ENV_VAR: "1"},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        # check
+        self.assertIn("'__add__'", output)
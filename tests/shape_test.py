@@ -23,3 +23,31 @@ class ShapeTest(unittest.TestCase):
     def test_addition(self):
         self.assertEqual(Shape((0, 4, 7)) + 11, Shape((0, 4, 7, 11)))
         self.assertEqual(Shape((0, 4, 7)) + Shape((11,)), Shape((0, 4, 7, 11)))
+
+    def test_interning(self):
+        # create
+        Shape.enable_interning()
+        try:
+            shape1 = Shape((0, 4, 7))
+            shape2 = Shape((7, 0, 4))
+            shape3 = Shape((0, 4, 7)) + 11
+            shape4 = Shape((0, 4, 7, 11))
+            shape5 = Shape((-1, 3, 6))
+        finally:
+            Shape.disable_interning()
+        shape6 = Shape((0, 4, 7))
+
+        # check
+        self.assertIs(shape1, shape2)
+        self.assertIs(shape3, shape4)
+        self.assertIsNot(shape1, shape5)
+        self.assertIsNot(shape1, shape6)
+        self.assertEqual(shape1, shape6)
+
+    def test_intervals_from_root(self):
+        # setup
+        shape = Shape((0, 4, 7, 26))
+
+        # check
+        self.assertEqual(shape.intervals_from_root, (0, 4, 7, 26))
+        self.assertIs(shape.intervals_from_root, shape.intervals_from_root)
@@ -1,5 +1,9 @@
 import unittest
+from itertools import pairwise
 
+import numpy as np
+
+from src.my_types import int16, int64
 from src.util import *
 
 
@@ -78,3 +82,115 @@ class UtilTests(unittest.TestCase):
     def test_is_12bit(self):
         self.assertFalse(is_12bit(int16(8000)))
         self.assertTrue(is_12bit(int16(5)))
+
+    def test_get_fitting_rotations_table(self):
+        table = get_fitting_rotations_table(int16(4 + 1))
+        self.assertEqual(len(table), 4096)
+        self.assertEqual(table[0], 0xFFF)
+        self.assertEqual(table[1], (1 << 0) | (1 << 10))
+        self.assertEqual(table[16 + 4], 1 << 2)
+        self.assertEqual(table[8 + 1], 0)
+
+    def test_get_gap_range_64bit_bitmask(self):
+        self.assertEqual(
+            get_gap_range_64bit_bitmask(int64(1 << 0) | int64(1 << 7) | int64(1 << 16)),
+            (7, 9),
+        )
+        self.assertEqual(
+            get_gap_range_64bit_bitmask(int64(1 << 15) | int64(1 << 50)), (35, 35)
+        )
+        self.assertIsNone(get_gap_range_64bit_bitmask(int64(1 << 40)))
+        self.assertIsNone(get_gap_range_64bit_bitmask(int64(0)))
+
+    def test_get_gap_ranges_64bit_bitmasks(self):
+        rng = np.random.default_rng(0)
+        bitmasks = [
+            sum(1 << int(i) for i in rng.choice(64, size, replace=False))
+            for size in rng.integers(0, 6, 200)
+        ]
+
+        min_gaps, max_gaps = get_gap_ranges_64bit_bitmasks(
+            np.array(bitmasks, dtype=int64)
+        )
+        spans = get_spans_64bit_bitmasks(np.array(bitmasks, dtype=int64))
+        popcounts = get_popcounts_64bit_bitmasks(np.array(bitmasks, dtype=int64))
+
+        for bitmask, min_gap, max_gap, span, popcount in zip(
+            bitmasks, min_gaps, max_gaps, spans, popcounts
+        ):
+            indices = get_set_bit_indices(bitmask)
+            gaps = [b - a for a, b in pairwise(indices)]
+            self.assertEqual(min_gap, min(gaps, default=64))
+            self.assertEqual(max_gap, max(gaps, default=0))
+            self.assertEqual(span, indices[-1] - indices[0] if indices else 0)
+            self.assertEqual(span, get_span_64bit_bitmask(int64(bitmask)))
+            self.assertEqual(popcount, len(indices))
+
+    def test_get_12bit_tables(self):
+        # setup
+        tables = get_12bit_tables()
+
+        # check
+        for bitmask in range(4096):
+            indices = [i for i in range(12) if bitmask >> i & 1]
+            self.assertEqual(list(tables.set_bit_indices[bitmask]), indices)
+            self.assertEqual(tables.popcounts[bitmask], len(indices))
+            self.assertEqual(tables.lowest_set_bits[bitmask], min(indices, default=12))
+            self.assertEqual(
+                tables.normal_forms[bitmask], min(tables.rotations_left[bitmask])
+            )
+            for n in range(12):
+                rotated = tables.rotations_left[bitmask][n]
+                self.assertEqual(tables.rotations_right[rotated][n], bitmask)
+                self.assertEqual(
+                    sorted(tables.set_bit_indices[rotated]),
+                    sorted((i + n) % 12 for i in indices),
+                )
+
+    def test_voicing_bitmask_to_combination_bitmask(self):
+        # setup
+        rng = np.random.default_rng(0)
+        voicing_bitmasks = [int(x) for x in rng.integers(0, 1 << 63, 200)]
+        voicing_bitmasks += [0, (1 << 64) - 1, 1 << 63, 1 << 48 | 1 << 47]
+
+        # create
+        combination_bitmasks = voicing_bitmasks_to_combination_bitmasks(
+            np.array(voicing_bitmasks, dtype=int64)
+        )
+
+        # check
+        for voicing_bitmask, combination_bitmask in zip(
+            voicing_bitmasks, combination_bitmasks
+        ):
+            expected = 0
+            for index in get_set_bit_indices(voicing_bitmask):
+                expected |= 1 << (index % 12)
+            self.assertEqual(
+                voicing_bitmask_to_combination_bitmask(voicing_bitmask), expected
+            )
+            self.assertEqual(combination_bitmask, expected)
+
+    def test_note_bitmask_to_pitch_class_bitmask(self):
+        for index in range(64):
+            self.assertEqual(
+                note_bitmask_to_pitch_class_bitmask(1 << index), 1 << (index % 12)
+            )
+
+    def test_get_root_match_table(self):
+        # setup
+        cum_pattern_bitmask = 0b10010001  # major triad
+        combination_bitmasks = np.arange(4096)
+
+        # create
+        table = get_root_match_table(cum_pattern_bitmask)
+        roots_bitmasks = get_root_matches(combination_bitmasks, cum_pattern_bitmask)
+
+        # check
+        for combination_bitmask in range(4096):
+            expected = 0
+            for root in get_set_bit_indices(combination_bitmask):
+                rotated = rotate_12bit_bitmask_left(cum_pattern_bitmask, root)
+                if rotated & combination_bitmask == rotated:
+                    expected |= 1 << root
+            self.assertEqual(table[combination_bitmask], expected)
+            self.assertEqual(roots_bitmasks[combination_bitmask], expected)
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from src.cum_pattern import *
+from src.note import *
+from src.shape import Shape
+from src.voicing import Voicing
+from src.voicing_array import VoicingArray
+
+VOICINGS = [
+    Voicing([C4, E4, G4]),
+    Voicing([B3, D4, G4]),
+    Voicing([C4, F4, C5]),
+    Voicing([D4, Fs4, A4, Cs5]),
+]
+
+
+class VoicingArrayTest(unittest.TestCase):
+    def test_conversion(self):
+        # create
+        voicing_array = VoicingArray.from_voicings(VOICINGS)
+
+        # check
+        self.assertEqual(voicing_array.to_voicings(), VOICINGS)
+        self.assertEqual(voicing_array[1], VOICINGS[1])
+        self.assertEqual(len(voicing_array), 4)
+
+    def test_slicing(self):
+        # setup
+        voicing_array = VoicingArray.from_voicings(VOICINGS)
+
+        # create
+        sliced = voicing_array[1:3]
+        filtered = voicing_array[voicing_array.nr_of_notes == 3]
+
+        # check
+        self.assertTrue(np.shares_memory(sliced.bitmasks, voicing_array.bitmasks))
+        self.assertEqual(sliced.to_voicings(), VOICINGS[1:3])
+        self.assertEqual(filtered.to_voicings(), VOICINGS[:3])
+
+    def test_transposition(self):
+        # setup
+        voicing_array = VoicingArray.from_voicings(VOICINGS)
+
+        # check
+        self.assertEqual(
+            (voicing_array << 3).to_voicings(), [voicing << 3 for voicing in VOICINGS]
+        )
+        self.assertEqual(
+            (voicing_array >> np.array([1, 2, 1, 2])).to_voicings(),
+            [voicing >> i for voicing, i in zip(VOICINGS, [1, 2, 1, 2])],
+        )
+        with self.assertRaises(OverflowError):
+            voicing_array >> 40
+
+    def test_from_shape(self):
+        # setup
+        shape = Shape([0, 4, 7])
+        roots = [C2, Fs3, B3]
+
+        # create
+        voicing_array = VoicingArray.from_shape(
+            np.array([root.value for root in roots]), shape
+        )
+
+        # check
+        self.assertEqual(
+            voicing_array.to_voicings(),
+            [Voicing.from_shape(root, shape) for root in roots],
+        )
+
+    def test_derived(self):
+        # setup
+        voicing_array = VoicingArray.from_voicings(VOICINGS)
+
+        # check
+        self.assertEqual(
+            voicing_array.combinations, [voicing.combination for voicing in VOICINGS]
+        )
+        self.assertEqual(
+            voicing_array.patterns, [voicing.pattern for voicing in VOICINGS]
+        )
+        self.assertEqual(voicing_array.shapes, [voicing.shape for voicing in VOICINGS])
+        self.assertEqual(
+            voicing_array.fits(M7.pattern).tolist(),
+            [voicing.fits(M7.pattern) for voicing in VOICINGS],
+        )
@@ -1,3 +1,5 @@
+import sys
+import threading
 import unittest
 
 from src.combination import Combination
@@ -28,3 +30,65 @@ class VoicingTest(unittest.TestCase):
         self.assertFalse(C4_MAJOR.fits(Combination.from_cum(C, MINOR)))
         self.assertFalse(C4_MAJOR_OCT.fits(Combination.from_cum(C, MINOR)))
         self.assertFalse(C4_MAJOR_OCT_.fits(Combination.from_cum(C, MINOR)))
+
+    def test_derived_properties(self):
+        # setup
+        voicing = Voicing([C3, E3, G3, C4])
+
+        # check
+        self.assertEqual(voicing.shape, Shape((0, 4, 7, 12)))
+        self.assertIs(voicing.shape, voicing.shape)
+        self.assertEqual(voicing.pc_count, {C: 2, E: 1, G: 1})
+        self.assertIs(voicing.pc_count, voicing.pc_count)
+        with self.assertRaises(TypeError):
+            voicing.pc_count[C] = 3  # type: ignore[index]
+        self.assertIs(voicing.combination.pcs, voicing.combination.pcs)
+        self.assertEqual(voicing.combination.pcs, frozenset({C, E, G}))
+        self.assertEqual(voicing.pattern.inner_intervals, (4, 3, 5))
+
+    def test_interning(self):
+        # create
+        Voicing.enable_interning()
+        try:
+            voicing1 = Voicing([C3, E3, G3])
+            voicing2 = Voicing([C3, E3]) + G3
+        finally:
+            Voicing.disable_interning()
+        voicing3 = Voicing([C3, E3, G3])
+
+        # check
+        self.assertIs(voicing1, voicing2)
+        self.assertIsNot(voicing1, voicing3)
+        self.assertEqual(voicing1, voicing3)
+
+    def test_interning_across_threads(self):
+        # setup
+        bitmasks = [(0b1001 << i) | (1 << 40) for i in range(36)] * 20
+        barrier = threading.Barrier(8)
+        results: list[list[Voicing]] = []
+
+        def create() -> None:
+            barrier.wait()
+            results.append(
+                [Voicing.from_64bit_bitmask(bitmask) for bitmask in bitmasks]
+            )
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        switch_interval = sys.getswitchinterval()
+
+        # create
+        Voicing.enable_interning()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+            Voicing.disable_interning()
+
+        # check
+        for result in results[1:]:
+            for voicing1, voicing2 in zip(results[0], result):
+                self.assertIs(voicing1, voicing2)